@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the CAMM parser on a synthetic 1-hour stream.
+
+The stream interleaves gyro (type 2) and accelerometer (type 3) packets at
+IMU_RATE Hz with GPS (type 6) packets at GPS_RATE Hz. A second run injects
+garbage bytes at regular intervals to exercise resynchronization.
+
+Usage:
+    python benchmarks/bench_camm_parser.py [--minutes 60] [--imu-rate 1000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.camm_parser import parse_camm_track, _PAYLOAD_DTYPES
+
+GPS_RATE = 10
+
+
+def build_stream(minutes: float, imu_rate: int, corrupt_every: int = 0) -> bytes:
+    seconds = int(minutes * 60)
+    imu_per_gps = imu_rate // GPS_RATE
+
+    imu_dtype = np.dtype([('reserved', '<u2'), ('type', '<u2'), ('values', '<f4', (3,))])
+    block = np.zeros(imu_per_gps * 2, dtype=imu_dtype)
+    block['type'][0::2] = 2
+    block['type'][1::2] = 3
+    block['values'] = np.random.default_rng(0).normal(size=(len(block), 3))
+    imu_bytes = block.tobytes()
+
+    gps_dtype = np.dtype([('reserved', '<u2'), ('type', '<u2'), ('payload', _PAYLOAD_DTYPES[56])])
+    gps = np.zeros(seconds * GPS_RATE, dtype=gps_dtype)
+    gps['type'] = 6
+    gps['payload']['time_gps_epoch'] = 1.3e9 + np.arange(len(gps)) / GPS_RATE
+    gps['payload']['gps_fix_type'] = 3
+    gps['payload']['lat'] = 48.85 + np.arange(len(gps)) * 1e-6
+    gps['payload']['lon'] = 2.35
+    gps_records = [r.tobytes() for r in gps]
+
+    chunks = []
+    for i, gps_record in enumerate(gps_records):
+        chunks.append(imu_bytes)
+        chunks.append(gps_record)
+        if corrupt_every and i % corrupt_every == corrupt_every - 1:
+            chunks.append(b'\xff\x13\x37\x42\x99\x01\x02')
+    return b''.join(chunks)
+
+
+def bench(label: str, data: bytes):
+    start = time.perf_counter()
+    track = parse_camm_track(data, duration=0.0)
+    elapsed = time.perf_counter() - start
+    imu = {key: len(times) for key, (times, _) in track.imu.items()}
+    print(f"{label:<12} {len(data) / 1e6:8.1f} MB  {elapsed:7.3f} s  "
+          f"{len(data) / 1e6 / elapsed:8.1f} MB/s  gps={len(track)} imu={imu}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CAMM parser benchmark")
+    parser.add_argument("--minutes", type=float, default=60.0, help="Stream length in minutes (default: 60)")
+    parser.add_argument("--imu-rate", type=int, default=1000, help="Gyro/accel rate in Hz (default: 1000)")
+    args = parser.parse_args()
+
+    bench("clean", build_stream(args.minutes, args.imu_rate))
+    bench("corrupt", build_stream(args.minutes, args.imu_rate, corrupt_every=50))
+
+
+if __name__ == "__main__":
+    main()
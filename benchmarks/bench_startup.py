@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for the CLI and the GUI.
+
+Each scenario runs in a fresh interpreter, so module imports are measured
+from scratch:
+  cli-help   python src/main.py --help (argument parsing, all CLI imports)
+  cli-engine imports the engine and builds it for a non-AI job
+  gui        creates the QApplication and the main window (offscreen)
+
+Every run also reports whether torch, ultralytics and PySide6 were imported,
+which non-AI runs should not pay for (PySide6 only in the GUI).
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+REPORT = """
+import json, sys
+print(json.dumps({name: name in sys.modules for name in ('torch', 'ultralytics', 'PySide6')}))
+"""
+
+SCENARIOS = {
+    'cli-help': None,  # runs main.py itself
+    'cli-engine': """
+import sys
+sys.path.insert(0, {src!r})
+from core.engine import ExtractionEngine
+from core.job import Job
+ExtractionEngine([Job(file_path='clip.mp4', settings={{'ai_mode': 'None'}})])
+""",
+    'gui': """
+import sys
+sys.path.insert(0, {src!r})
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+from ui.main_window import MainWindow
+window = MainWindow()
+""",
+}
+
+
+def run_once(name: str):
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    if name == 'cli-help':
+        # main.py exits after --help; report the imports from an atexit hook
+        code = (f"import atexit, runpy, sys\n"
+                f"sys.path.insert(0, {SRC!r})\n"
+                f"sys.argv = ['main.py', '--help']\n"
+                f"atexit.register(lambda: exec({REPORT!r}))\n"
+                f"try:\n    runpy.run_path({os.path.join(SRC, 'main.py')!r}, run_name='__main__')\n"
+                f"except SystemExit:\n    pass\n")
+    else:
+        code = SCENARIOS[name].format(src=SRC) + REPORT
+
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{name} failed:\n{result.stderr}")
+    imported = json.loads(result.stdout.strip().splitlines()[-1])
+    return elapsed, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI/GUI cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per scenario (default: 5)")
+    parser.add_argument("--scenario", choices=list(SCENARIOS), action="append",
+                        help="Only run these scenarios (repeatable)")
+    args = parser.parse_args()
+
+    for name in args.scenario or SCENARIOS:
+        times = []
+        imported = {}
+        for _ in range(args.runs):
+            elapsed, imported = run_once(name)
+            times.append(elapsed)
+        loaded = ", ".join(module for module, yes in imported.items() if yes) or "none"
+        print(f"{name:<11} median {statistics.median(times):6.3f} s  min {min(times):6.3f} s  "
+              f"heavy imports: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
+import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from core.capabilities import AI_PACKAGES, module_available, package_version, probe_device_info
+
 def check_imports():
     print("Verifying environment for 360 Extractor...")
     print("-" * 40)
@@ -40,16 +45,20 @@ def check_imports():
         missing_packages.append(f"PySide6 (Error: {e})")
         print(f"❌ PySide6 error: {e}")
 
-    # Check ultralytics
-    try:
-        import ultralytics
-        print(f"✅ ultralytics found: {ultralytics.__version__}")
-    except ImportError:
-        missing_packages.append("ultralytics")
-        print("❌ ultralytics NOT found")
-    except Exception as e:
-        missing_packages.append(f"ultralytics (Error: {e})")
-        print(f"❌ ultralytics error: {e}")
+    # Check the AI stack without importing it (torch alone takes seconds to load)
+    for package in AI_PACKAGES:
+        version = package_version(package)
+        if module_available(package) and version:
+            print(f"✅ {package} found: {version}")
+        else:
+            missing_packages.append(package)
+            print(f"❌ {package} NOT found")
+
+    device = probe_device_info()
+    if device['is_accelerated']:
+        print(f"✅ AI accelerator: {device['device_name']} ({device['device']})")
+    else:
+        print("⚠️  No GPU detected, AI processing would run on CPU")
 
     print("-" * 40)
     
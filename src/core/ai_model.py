@@ -1,22 +1,26 @@
 import cv2
 import numpy as np
-import torch
-from ultralytics import YOLO
 from utils.logger import logger
 
 class AIService:
     """
     Wrapper for YOLOv8 to handle person detection and segmentation.
+
+    torch and ultralytics are imported on first use, so importing this module
+    is cheap; see core.capabilities for checks that never import them.
     """
     
     @classmethod
     def is_gpu_available(cls) -> bool:
         """Check if GPU acceleration is available (MPS or CUDA)."""
+        import torch
         return torch.backends.mps.is_available() or torch.cuda.is_available()
     
     @classmethod
     def get_device_info(cls) -> dict:
-        """Get detailed device information."""
+        """Get detailed device information (imports torch)."""
+        import torch
+
         info = {
             'device': 'cpu',
             'device_name': 'CPU',
@@ -52,6 +56,7 @@ class AIService:
             logger.info(f"✓ GPU detected: {device_info['device_name']}")
             
         logger.info(f"Loading AI Model: {model_name} on {self.device}...")
+        from ultralytics import YOLO
         self.model = YOLO(model_name)
         # Class 0 is 'person' in COCO dataset
         self.target_class = 0
@@ -2,6 +2,7 @@ import cv2
 import numpy as np
 from PySide6.QtCore import QObject, Signal
 from core.geometry import GeometryProcessor
+from core.keyframe_index import FrameSeeker, KeyframeIndexCache
 from utils.image_utils import ImageUtils
 
 class BlurAnalyzer:
@@ -22,11 +23,11 @@ class BlurAnalyzer:
                 'details': list of (view_name, score)
             }
         """
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
+        seeker = FrameSeeker(video_path, KeyframeIndexCache())
+        if not seeker.open():
             raise IOError(f"Could not open video: {video_path}")
             
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        frame_count = seeker.frame_count
         
         # Pick a frame from the middle, or at least a few seconds in to avoid intro black screens
         # If video is short, just take the first frame
@@ -35,11 +36,13 @@ class BlurAnalyzer:
         else:
             target_frame = 0
             
-        cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
-        ret, frame = cap.read()
-        cap.release()
+        # Keyframe seek + decode forward, exact even on long-GOP footage
+        try:
+            frame = seeker.read(target_frame)
+        finally:
+            seeker.release()
         
-        if not ret or frame is None:
+        if frame is None:
             raise IOError("Could not read frame from video.")
             
         # Extract settings
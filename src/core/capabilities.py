@@ -0,0 +1,75 @@
+"""
+Cheap capability checks that don't import the heavy optional packages.
+
+Importing torch/ultralytics takes seconds and hundreds of MB, so these only
+look the packages up (importlib spec and distribution metadata) and guess the
+accelerator from the platform. AIService.get_device_info() gives the
+authoritative answer once the AI stack is actually loaded.
+"""
+import importlib.util
+import platform
+import shutil
+import subprocess
+import sys
+from importlib import metadata
+from typing import Optional
+
+AI_PACKAGES = ('torch', 'ultralytics')
+
+
+def module_available(name: str) -> bool:
+    """True if the module can be imported, without importing it."""
+    if name in sys.modules:
+        return sys.modules[name] is not None
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def package_version(name: str) -> Optional[str]:
+    """Installed version of a distribution, or None."""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def ai_available() -> bool:
+    """True if the packages needed for AI masking/skipping are installed."""
+    return all(module_available(name) for name in AI_PACKAGES)
+
+
+def probe_device_info() -> dict:
+    """
+    Best guess of the device AIService would use, in the same format as
+    AIService.get_device_info(). If torch is already imported it is asked
+    directly; otherwise Apple Silicon implies MPS and a working nvidia-smi
+    implies CUDA.
+    """
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        from core.ai_model import AIService
+        return AIService.get_device_info()
+
+    info = {
+        'device': 'cpu',
+        'device_name': 'CPU',
+        'is_accelerated': False
+    }
+    if platform.system() == 'Darwin' and platform.machine() == 'arm64':
+        info['device'] = 'mps'
+        info['device_name'] = 'Apple Silicon GPU (MPS)'
+        info['is_accelerated'] = True
+    elif shutil.which('nvidia-smi'):
+        try:
+            result = subprocess.run(['nvidia-smi', '--query-gpu=name', '--format=csv,noheader'],
+                                    capture_output=True, text=True, timeout=5, check=True)
+            names = result.stdout.strip().splitlines()
+        except (OSError, subprocess.SubprocessError):
+            names = []
+        if names:
+            info['device'] = 'cuda'
+            info['device_name'] = names[0].strip()
+            info['is_accelerated'] = True
+    return info
@@ -0,0 +1,101 @@
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from core.preview_cache import PreviewCache
+from utils.image_utils import ImageUtils
+
+# Tile edge in pixels; a 1024px-wide source covers 90 deg at ~1:1
+CONTACT_SHEET_TILE = 256
+CONTACT_SHEET_SOURCE_WIDTH = 1024
+CONTACT_SHEET_PADDING = 4
+
+# Remaps release the GIL, so threads scale with cores
+DEFAULT_TILE_WORKERS = min(8, os.cpu_count() or 1)
+
+Tile = Tuple[str, np.ndarray, float]  # (view name, BGR tile, blur score)
+
+
+def sharpen(image: np.ndarray, strength: float, sigma: float = 2.0) -> np.ndarray:
+    """Unsharp mask, as applied by the processor."""
+    gaussian = cv2.GaussianBlur(image, (0, 0), sigma)
+    return cv2.addWeighted(image, 1.0 + strength, gaussian, -strength, 0)
+
+
+def select_views(views: Sequence[tuple], active_cameras: Optional[Sequence[int]]) -> List[tuple]:
+    """Returns the views the processor would extract (active_cameras holds view indices)."""
+    if active_cameras is None:
+        return list(views)
+    active = set(active_cameras)
+    return [view for i, view in enumerate(views) if i in active]
+
+
+def render_tiles(cache: PreviewCache, frame: np.ndarray, frame_id, views: Sequence[tuple], fov: float,
+                 tile_size: int = CONTACT_SHEET_TILE, sharpen_strength: Optional[float] = None,
+                 workers: int = DEFAULT_TILE_WORKERS,
+                 is_cancelled: Callable[[], bool] = lambda: False) -> Optional[List[Tile]]:
+    """
+    Remaps every view of one decoded frame into a square tile, in parallel.
+
+    Rendered tiles are cached under frame_id, so toggling views or re-rendering
+    with unchanged settings only computes the tiles that are new.
+    Returns the tiles in view order, or None if cancelled.
+    """
+    src_h, src_w = frame.shape[:2]
+
+    def render(view):
+        name, yaw, pitch, roll = view
+        key = (frame_id, tile_size, float(fov), float(yaw), float(pitch), float(roll), sharpen_strength)
+        cached = cache.get_tile(key)
+        if cached is not None:
+            return (name,) + cached
+        if is_cancelled():
+            return None
+
+        map_x, map_y = cache.get_maps(src_h, src_w, tile_size, tile_size, fov, yaw, pitch, roll)
+        tile = cv2.remap(frame, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_WRAP)
+        if sharpen_strength is not None:
+            # Sigma scaled from the processor's full-resolution value
+            tile = sharpen(tile, sharpen_strength, sigma=1.0)
+        score = ImageUtils.calculate_blur_score(tile)
+        cache.put_tile(key, (tile, score))
+        return name, tile, score
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="preview") as executor:
+        tiles = list(executor.map(render, views))
+
+    if any(tile is None for tile in tiles):
+        return None
+    return tiles
+
+
+def compose_contact_sheet(tiles: Sequence[Tile], columns: Optional[int] = None,
+                          padding: int = CONTACT_SHEET_PADDING) -> np.ndarray:
+    """Lays the tiles out in a grid, each labelled with its view name and blur score."""
+    if not tiles:
+        raise ValueError("No tiles to compose")
+
+    tile_h, tile_w = tiles[0][1].shape[:2]
+    if columns is None:
+        columns = math.ceil(math.sqrt(len(tiles)))
+    rows = math.ceil(len(tiles) / columns)
+
+    sheet = np.full((rows * (tile_h + padding) + padding, columns * (tile_w + padding) + padding, 3),
+                    0x1E, dtype=np.uint8)
+
+    for i, (name, tile, score) in enumerate(tiles):
+        y = padding + (i // columns) * (tile_h + padding)
+        x = padding + (i % columns) * (tile_w + padding)
+        cell = sheet[y:y + tile_h, x:x + tile_w]
+        cell[:] = tile
+
+        label = f"{name}  {score:.0f}"
+        cv2.rectangle(cell, (0, tile_h - 22), (tile_w, tile_h), (0, 0, 0), -1)
+        cv2.putText(cell, label, (6, tile_h - 7), cv2.FONT_HERSHEY_SIMPLEX, 0.45,
+                    (240, 240, 240), 1, cv2.LINE_AA)
+
+    return sheet
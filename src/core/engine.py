@@ -0,0 +1,646 @@
+import cv2
+import numpy as np
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from core.geometry import GeometryProcessor
+from core.capabilities import ai_available
+from core.motion_detector import MotionDetector
+from core.telemetry import TelemetryHandler
+from core.telemetry_cache import TelemetryCache, DEFAULT_MAX_BYTES
+from core.gpx_index import GPXIndex
+from core.spatial_index import SpatialIndex
+from core.pose_priors import export_pose_priors
+from core.events import (EventCounters, VIEW_SAVED, VIEW_BLURRY, VIEW_FORCED, VIEW_PERSON,
+                         FRAME_STATIC, FRAME_DUPLICATE)
+from core.progress import ProgressTracker
+from core.profiling import (StageProfiler, NULL_PROFILER, STAGE_MAPS, STAGE_TELEMETRY, STAGE_TELEMETRY_WAIT,
+                            STAGE_GRAB, STAGE_DECODE, STAGE_MOTION, STAGE_REMAP, STAGE_BLUR, STAGE_SHARPEN,
+                            STAGE_AI, STAGE_ENCODE, STAGE_EXIF, STAGE_POSE_PRIORS)
+from core.tracing import CAT_JOB, CAT_FRAME
+from utils.file_manager import FileManager
+from utils.image_utils import ImageUtils
+from utils.logger import logger
+
+# Number of upcoming jobs whose telemetry is extracted while the current job runs
+TELEMETRY_PREFETCH_JOBS = 1
+
+
+def _ignore(*args):
+    pass
+
+
+class ExtractionEngine:
+    """
+    Runs a batch of jobs: decoding, reprojection, filtering and saving.
+
+    Qt-free; progress and lifecycle are reported through plain callbacks,
+    invoked on the thread that calls run():
+      on_progress(ProgressEvent), on_job_started(index), on_job_finished(index),
+      on_error(message), on_profile(StageProfiler), on_finished()
+    ProcessingWorker (core.processor) adapts them to Qt signals.
+
+    Stage timing is off unless a profiler is passed or a job has the
+    'profile_stages' setting; on_profile then gets it before on_finished().
+    A tracer (core.tracing.TraceRecorder) additionally records jobs, frames,
+    stages and queue depths as trace events; the caller closes it.
+    """
+
+    def __init__(self, jobs, on_progress=None, on_job_started=None, on_job_finished=None,
+                 on_error=None, on_finished=None, on_profile=None, profiler=None, tracer=None):
+        self.jobs = jobs
+        self.is_running = True
+        self.on_progress = on_progress or _ignore
+        self.on_job_started = on_job_started or _ignore
+        self.on_job_finished = on_job_finished or _ignore
+        self.on_error = on_error or _ignore
+        self.on_finished = on_finished or _ignore
+        self.on_profile = on_profile or _ignore
+
+        if profiler is None and any(job.settings.get('profile_stages', False) for job in self.jobs):
+            profiler = StageProfiler()
+        self.profiler = profiler or NULL_PROFILER
+        self.tracer = tracer
+        # Where stage timings go: the profiler (which forwards them to the tracer) or the tracer alone
+        self.stages = self.profiler
+        if tracer is not None:
+            if self.profiler.enabled:
+                self.profiler.tracer = tracer
+            else:
+                self.stages = tracer
+        
+        # Initialize AI Service if needed
+        self.ai_service = None
+        needs_ai = any(job.settings.get('ai_mode', 'None') != 'None' for job in self.jobs)
+        
+        if needs_ai and not ai_available():
+            logger.error("AI mode needs torch and ultralytics (pip install ultralytics); "
+                         "processing without AI masking/skipping.")
+        elif needs_ai:
+             # Initialize YOLO model; torch/ultralytics are only imported here
+             # Note: Using 'yolov8n-seg.pt' (nano) for performance.
+             from core.ai_model import AIService
+             self.ai_service = AIService('yolov8n-seg.pt')
+
+        self.motion_detector = MotionDetector()
+
+        # Parsed telemetry is cached across runs, keyed by file identity
+        self.telemetry_cache = None
+        if any(job.needs_telemetry for job in self.jobs):
+            cache_mb = self.jobs[0].settings.get('telemetry_cache_mb', DEFAULT_MAX_BYTES // (1024 * 1024))
+            self.telemetry_cache = TelemetryCache(max_bytes=int(cache_mb) * 1024 * 1024)
+
+        # Shared GPX log(s) for the batch, parsed once
+        self.gpx_index = None
+        gpx_logs = self.jobs[0].settings.get('gpx_logs') if self.jobs else None
+        if gpx_logs and self.telemetry_cache is not None:
+            self.gpx_index = GPXIndex.from_files(
+                gpx_logs, time_offset=float(self.jobs[0].settings.get('gpx_time_offset', 0.0))
+            )
+
+        # Telemetry is extracted in the background (job index -> Future[TelemetryHandler])
+        self.telemetry_executor = None
+        self.telemetry_futures = {}
+
+        # Batch-wide index of extracted viewpoints, created in run()
+        self.spatial_index = None
+
+        # Extraction events of the batch and of each job (job index -> EventCounters)
+        self.counters = EventCounters()
+        self.job_counters = {}
+        if self.telemetry_cache is not None:
+            self.telemetry_executor = ThreadPoolExecutor(
+                max_workers=1 + TELEMETRY_PREFETCH_JOBS, thread_name_prefix="telemetry"
+            )
+
+    def stop(self):
+        self.is_running = False
+
+    def run(self):
+        total_jobs = len(self.jobs)
+        self.profiler.start()
+
+        dedup_jobs = [job for job in self.jobs if job.spatial_dedup]
+        if dedup_jobs:
+            self.spatial_index = SpatialIndex(
+                radius_m=float(dedup_jobs[0].settings.get('spatial_dedup_radius', 2.0)),
+                heading_tolerance_deg=float(dedup_jobs[0].settings.get('spatial_dedup_heading', 30.0))
+            )
+        
+        for i, job in enumerate(self.jobs):
+            if not self.is_running:
+                break
+            
+            self.on_job_started(i)
+            job_span = nullcontext()
+            if self.tracer is not None:
+                job_span = self.tracer.span(os.path.basename(job.file_path), CAT_JOB, {'index': i})
+            try:
+                with job_span:
+                    self.process_video(job, i, total_jobs)
+                self.on_job_finished(i)
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                self.on_error(f"Error processing {os.path.basename(job.file_path)}: {str(e)}")
+            finally:
+                self._discard_telemetry(i)
+        
+        if self.telemetry_executor is not None:
+            self.telemetry_executor.shutdown(wait=False, cancel_futures=True)
+        if self.spatial_index is not None:
+            logger.info(f"Spatial deduplication: {self.counters.count(FRAME_DUPLICATE)} frames suppressed, "
+                        f"{len(self.spatial_index)} viewpoints kept across the batch.")
+        if total_jobs > 1:
+            logger.info(f"Batch: {self.counters.summary()}")
+        self.profiler.stop()
+        if self.profiler.enabled:
+            self.on_profile(self.profiler)
+        self.on_finished()
+
+    def _discard_telemetry(self, job_index):
+        """Drops a finished, failed or stopped job's telemetry future, cancelling it if still queued."""
+        future = self.telemetry_futures.pop(job_index, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    def _extract_telemetry(self, file_path):
+        """Runs on the telemetry executor. Returns a populated TelemetryHandler."""
+        handler = TelemetryHandler(cache=self.telemetry_cache, gpx_index=self.gpx_index)
+        logger.info(f"Extracting telemetry for {os.path.basename(file_path)}...")
+        with self.stages.stage(STAGE_TELEMETRY):
+            handler.extract_metadata(file_path)
+        return handler
+
+    def _telemetry_future(self, job_index):
+        """
+        Returns the telemetry future for a job, submitting it if needed.
+        Returns None if the job doesn't need telemetry.
+        """
+        if self.telemetry_executor is None or not self.jobs[job_index].needs_telemetry:
+            return None
+        future = self.telemetry_futures.get(job_index)
+        if future is None:
+            future = self.telemetry_executor.submit(self._extract_telemetry, self.jobs[job_index].file_path)
+            self.telemetry_futures[job_index] = future
+        return future
+
+    def _resolve_telemetry(self, future, filename):
+        """Waits for a telemetry future. Falls back to an empty handler on failure."""
+        try:
+            with self.stages.stage(STAGE_TELEMETRY_WAIT):
+                return future.result()
+        except Exception as e:
+            logger.error(f"Telemetry extraction failed for {filename}: {e}")
+            return TelemetryHandler()
+
+    def _flush_pending_exif(self, telemetry_handler, pending_exif):
+        """Embeds GPS into images saved before the telemetry track was available."""
+        for image_path, timestamp in pending_exif:
+            gps = telemetry_handler.get_gps_at_time(timestamp)
+            if gps:
+                with self.stages.stage(STAGE_EXIF):
+                    telemetry_handler.embed_exif(image_path, *gps)
+        pending_exif.clear()
+
+    @staticmethod
+    def _distance_target_frames(telemetry_handler, step_m, fps, total_frames):
+        """
+        Returns the sorted frame indices where the ground distance crosses each
+        step_m meters, or None if there is no GPS track to sample by.
+        """
+        if not telemetry_handler.track.has_gps or fps <= 0:
+            return None
+
+        end = total_frames / fps if total_frames > 1 else None
+        times = telemetry_handler.track.distance_step_times(step_m, 0.0, end)
+        frames = np.unique(np.round(times * fps).astype(np.int64))
+        if total_frames > 1:
+            frames = frames[frames < total_frames]
+        return frames.tolist()
+
+    def _trace_frame(self, start, frame_idx, pending_exif):
+        """Records an extracted frame's span and the queue depths after it."""
+        self.tracer.complete('frame', start, cat=CAT_FRAME, args={'frame': frame_idx})
+        self.tracer.counter('queues', {
+            'pending_exif': len(pending_exif),
+            'telemetry_jobs': sum(1 for future in list(self.telemetry_futures.values()) if not future.done()),
+        })
+
+    @staticmethod
+    def _file_size(path):
+        """Size of a written output for the profile; 0 if there is none."""
+        try:
+            return os.path.getsize(path) if path else 0
+        except OSError:
+            return 0
+
+    def generate_filename(self, pattern, context):
+        """
+        Generates a filename based on the provided pattern and context variables.
+        Context: {filename}, {frame}, {camera}, {ext}, {image_name}
+        """
+        result = pattern
+        for key, value in context.items():
+            result = result.replace(f"{{{key}}}", str(value))
+        return result
+
+    def process_video(self, job, job_index, total_jobs):
+        file_path = job.file_path
+        filename = os.path.basename(file_path)
+        name_no_ext = os.path.splitext(filename)[0]
+
+        # Telemetry Setup: extraction runs in the background while maps are built
+        # and decoding starts. Images saved before the track arrives are queued
+        # and get their GPS EXIF once it does.
+        telemetry_future = self._telemetry_future(job_index)
+        embed_gps = job.export_telemetry
+        for next_index in range(job_index + 1, min(job_index + 1 + TELEMETRY_PREFETCH_JOBS, len(self.jobs))):
+            self._telemetry_future(next_index)
+        telemetry_handler = None
+        current_gps = None
+        current_time = 0.0
+        pending_exif = []
+        # (image_name, frame_time, view_name) per saved image, for pose priors
+        pose_records = [] if job.pose_priors != 'none' else None
+
+        # Determine Output Directory
+        custom_dir = job.output_dir
+        # If custom_dir is provided, use it as base. Otherwise use file's directory.
+        if custom_dir and os.path.isdir(custom_dir):
+            base_output_dir = custom_dir
+        else:
+            base_output_dir = os.path.dirname(file_path)
+
+        # Create a specific subfolder for this video to keep things organized
+        output_dir = os.path.join(base_output_dir, f"{name_no_ext}_processed")
+        
+        try:
+            FileManager.ensure_directory(output_dir)
+        except OSError as e:
+            # If we can't create the directory (e.g. permission error), raise it
+            raise IOError(f"Cannot create or access output directory {output_dir}: {e}")
+
+        # Determine Output Format & Params
+        fmt = job.output_format.lower()
+        if fmt not in ['jpg', 'png', 'tiff']:
+            fmt = 'jpg'
+        
+        ext = f".{fmt}"
+        if fmt == 'tiff':
+            ext = '.tif'
+        
+        save_params = []
+        if fmt == 'jpg':
+            quality = job.settings.get('quality', 95)
+            save_params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+        elif fmt == 'png':
+            save_params = [cv2.IMWRITE_PNG_COMPRESSION, 3]
+        elif fmt == 'tiff':
+            save_params = [cv2.IMWRITE_TIFF_COMPRESSION, 1] # 1 = NONE
+
+        cap = cv2.VideoCapture(file_path)
+        if not cap.isOpened():
+            raise IOError(f"Could not open video: {file_path}")
+
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        total_frames_video = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total_frames_video <= 0: total_frames_video = 1 # Prevent division by zero
+        
+        # Calculate extraction interval
+        interval_value = float(job.settings.get('interval_value', 1.0))
+        interval_unit = job.settings.get('interval_unit', 'Seconds')
+        
+        if interval_unit == 'Frames':
+            interval = int(max(1, interval_value))
+        else: # Seconds (also the fallback for Meters without GPS)
+            interval = int(max(1, fps * interval_value))
+        
+        # Geometry Settings
+        out_res = job.resolution
+        fov = job.settings.get('fov', 90)
+        camera_count = job.settings.get('camera_count', 6)
+        pitch_offset = job.settings.get('pitch_offset', 0)
+        layout_mode = job.settings.get('layout_mode', 'adaptive')
+        
+        # AI Mode per job
+        ai_mode_ui = job.settings.get('ai_mode', 'None')
+        ai_mode_internal = 'none'
+        if ai_mode_ui == 'Skip Frame':
+            ai_mode_internal = 'skip_frame'
+        elif ai_mode_ui == 'Generate Mask':
+            ai_mode_internal = 'generate_mask'
+
+        # Blur Filter Settings
+        blur_enabled = job.settings.get('blur_filter_enabled', False)
+        smart_blur_enabled = job.settings.get('smart_blur_enabled', False)
+        blur_threshold = job.settings.get('blur_threshold', 100.0)
+        
+        # Adaptive Blur State
+        blur_history = deque(maxlen=10)
+        consecutive_blur_skips = 0
+
+        # Sharpening Settings
+        sharpen_enabled = job.settings.get('sharpening_enabled', False)
+        sharpen_strength = job.settings.get('sharpening_strength', 0.5)
+
+        # Adaptive Settings
+        adaptive_mode = job.adaptive_mode
+        adaptive_threshold = job.adaptive_threshold
+        last_extracted_frame = None
+        
+        # Generate views based on camera count
+        views = GeometryProcessor.generate_views(camera_count, pitch_offset=pitch_offset, layout_mode=layout_mode)
+        
+        maps = {}
+        src_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        src_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        
+        tracker = ProgressTracker(job_index, total_jobs, filename, total_frames_video, self.on_progress)
+        tracker.start()
+        
+        active_cams = job.active_cameras
+        stages = self.stages
+        tracer = self.tracer
+
+        for i, (name, y, p, r) in enumerate(views):
+            if active_cams is not None and i not in active_cams:
+                continue
+
+            with stages.stage(STAGE_MAPS):
+                maps[name] = GeometryProcessor.create_rectilinear_map(
+                    src_h, src_w, out_res, out_res, fov, y, p, r
+                )
+
+        # Distance-based sampling and deduplication need the track before decoding starts
+        target_frames = None
+        target_pos = 0
+        dedup_track = None
+        counters = EventCounters()
+        self.job_counters[job_index] = counters
+        use_dedup = job.spatial_dedup and self.spatial_index is not None
+        if (interval_unit == 'Meters' or use_dedup) and telemetry_future is not None:
+            telemetry_handler = self._resolve_telemetry(telemetry_future, filename)
+        if use_dedup:
+            if telemetry_handler is not None and telemetry_handler.track.has_gps and fps > 0:
+                dedup_track = telemetry_handler.track
+            else:
+                logger.warning(f"No GPS track for {filename}, spatial deduplication disabled for this video.")
+        if interval_unit == 'Meters':
+            target_frames = self._distance_target_frames(telemetry_handler, interval_value, fps, total_frames_video)
+            if target_frames is None:
+                logger.warning(f"No GPS track for {filename}, falling back to one frame every {interval_value}s.")
+            else:
+                logger.info(f"Sampling {len(target_frames)} frames every {interval_value} m for {filename}.")
+
+        frame_idx = 0
+        
+        while self.is_running:
+            if target_frames is not None:
+                if target_pos >= len(target_frames):
+                    break
+                is_target = frame_idx == target_frames[target_pos]
+            else:
+                is_target = frame_idx % interval == 0
+
+            # Skip planned frames close to an already extracted viewpoint (this or earlier videos)
+            viewpoint = None
+            if is_target and dedup_track is not None:
+                frame_time = frame_idx / fps
+                lat, lon, _ = dedup_track.position_at(frame_time)
+                viewpoint = (lat, lon, dedup_track.course_at(frame_time))
+                if self.spatial_index.is_duplicate(*viewpoint):
+                    counters.record(FRAME_DUPLICATE)
+                    is_target = False
+                    if target_frames is not None:
+                        target_pos += 1
+
+            if not is_target:
+                # Sparse path: advance without decoding/converting the frame
+                with stages.stage(STAGE_GRAB):
+                    grabbed = cap.grab()
+                if not grabbed:
+                    break
+                frame_idx += 1
+                tracker.update(frame_idx, counters.count(VIEW_SAVED))
+                continue
+
+            if tracer is not None:
+                frame_start = tracer.clock()
+            with stages.stage(STAGE_DECODE):
+                ret, frame = cap.read()
+            if not ret:
+                break
+            if target_frames is not None:
+                target_pos += 1
+            saved_before = counters.count(VIEW_SAVED)
+            
+            # Update GPS for current time
+            if telemetry_future is not None:
+                current_time = frame_idx / fps if fps > 0 else 0
+                if telemetry_handler is None and telemetry_future.done():
+                    telemetry_handler = self._resolve_telemetry(telemetry_future, filename)
+                    self._flush_pending_exif(telemetry_handler, pending_exif)
+                if telemetry_handler is not None:
+                    current_gps = telemetry_handler.get_gps_at_time(current_time)
+
+            tracker.update(frame_idx, counters.count(VIEW_SAVED))
+
+            # Adaptive Check
+            if adaptive_mode:
+                if last_extracted_frame is not None:
+                    with stages.stage(STAGE_MOTION):
+                        motion_score = self.motion_detector.calculate_motion_score(last_extracted_frame, frame)
+                    if motion_score <= adaptive_threshold:
+                        # Skip extraction
+                        counters.record(FRAME_STATIC)
+                        if tracer is not None:
+                            self._trace_frame(frame_start, frame_idx, pending_exif)
+                        frame_idx += 1
+                        continue
+                
+                last_extracted_frame = frame.copy()
+
+            for name, _, _, _ in views:
+                if name not in maps:
+                    continue
+
+                map_x, map_y = maps[name]
+                # 1. Reproject
+                with stages.stage(STAGE_REMAP):
+                    rect_img = cv2.remap(frame, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_WRAP)
+                
+                # 2. Blur Detection
+                if blur_enabled:
+                    with stages.stage(STAGE_BLUR):
+                        score = ImageUtils.calculate_blur_score(rect_img)
+                    is_blurry = False
+                    
+                    if smart_blur_enabled:
+                        # 1. Check Minimum Floor (Safety net against black/garbage frames)
+                        if score < blur_threshold:
+                            is_blurry = True
+                        
+                        # 2. Adaptive Check
+                        elif len(blur_history) > 0:
+                            avg_score = sum(blur_history) / len(blur_history)
+                            if score < avg_score * 0.6:
+                                is_blurry = True
+                                
+                        # 3. Safety Override (Force accept if too many consecutive skips)
+                        if is_blurry:
+                            consecutive_blur_skips += 1
+                            if consecutive_blur_skips > 5:
+                                counters.record(VIEW_FORCED, name)
+                                logger.debug("Force accepting view due to consecutive skips: %s - Frame %d - %s",
+                                             filename, frame_idx, name)
+                                is_blurry = False
+                                consecutive_blur_skips = 0
+                        
+                        # 4. Update History (if accepted, either naturally or forced)
+                        if not is_blurry:
+                            consecutive_blur_skips = 0
+                            blur_history.append(score)
+                    else:
+                        # Standard Mode
+                        if score < blur_threshold:
+                            is_blurry = True
+
+                    if is_blurry:
+                        counters.record(VIEW_BLURRY, name)
+                        logger.debug("Skipped blurry view: %s - Frame %d - %s (Score: %.1f)",
+                                     filename, frame_idx, name, score)
+                        continue
+
+                # 3. Sharpening (Post-Reprojection Recovery)
+                if sharpen_enabled:
+                    with stages.stage(STAGE_SHARPEN):
+                        gaussian = cv2.GaussianBlur(rect_img, (0, 0), 2.0)
+                        rect_img = cv2.addWeighted(rect_img, 1.0 + sharpen_strength, gaussian, -sharpen_strength, 0)
+
+                # 4. AI Processing
+                final_img = rect_img
+                mask_or_skip = None
+                
+                if self.ai_service and ai_mode_internal != 'none':
+                    with stages.stage(STAGE_AI):
+                        final_img, result_extra = self.ai_service.process_image(rect_img, mode=ai_mode_internal)
+                    
+                    if ai_mode_internal == 'skip_frame' and result_extra is True:
+                        # Person detected, skip this view
+                        counters.record(VIEW_PERSON, name)
+                        continue
+                    elif ai_mode_internal == 'generate_mask':
+                        mask_or_skip = result_extra
+                
+                
+                # 5. Save
+                if final_img is not None:
+                    # Naming Logic
+                    naming_mode = job.settings.get('naming_mode', 'realityscan')
+                    
+                    # Context variables for naming
+                    ctx = {
+                        'filename': name_no_ext,
+                        'frame': f"{frame_idx:06d}",
+                        'camera': name,
+                        'ext': ext
+                    }
+                    
+                    save_name = ""
+                    mask_name = ""
+
+                    if naming_mode == 'realityscan':
+                         # Standard RealityScan: [orig_name]_frame[X]_[cam].jpg
+                         save_name = f"{name_no_ext}_frame{frame_idx:06d}_{name}{ext}"
+                         # Mask: [image_name].mask.png
+                         mask_name = f"{save_name}.mask.png"
+                         
+                    elif naming_mode == 'simple':
+                        # Simple Suffix: [orig_name]_frame[X]_[cam].jpg
+                        save_name = f"{name_no_ext}_frame{frame_idx:06d}_{name}{ext}"
+                        # Mask: [orig_name]_frame[X]_[cam]_mask.png
+                        mask_name = f"{name_no_ext}_frame{frame_idx:06d}_{name}_mask.png"
+                        
+                    elif naming_mode == 'custom':
+                        img_pattern = job.settings.get('image_pattern', '{filename}_frame{frame}_{camera}')
+                        mask_pattern = job.settings.get('mask_pattern', '{filename}_frame{frame}_{camera}_mask')
+                        
+                        # Generate Image Name
+                        # Note: pattern likely doesn't include extension, so we add it if missing or just append
+                        # Ideally, pattern is the "stem". We enforce {ext} if user put it, or append standard ext
+                        if '{ext}' in img_pattern:
+                            save_name = self.generate_filename(img_pattern, ctx)
+                        else:
+                            save_name = self.generate_filename(img_pattern, ctx) + ext
+                            
+                        # Update context with the generated image name (excluding ext mostly, but let's see usage)
+                        # Ideally {image_name} is the full filename of the image
+                        ctx['image_name'] = save_name
+                        
+                        if '{ext}' in mask_pattern:
+                            mask_name = self.generate_filename(mask_pattern, ctx)
+                        else:
+                            mask_name = self.generate_filename(mask_pattern, ctx) + ".png" # Masks always png
+
+                    full_save_path = os.path.join(output_dir, save_name)
+                    with stages.stage(STAGE_ENCODE):
+                        FileManager.save_image(full_save_path, final_img, save_params)
+                    counters.record(VIEW_SAVED, name)
+                    
+                    if embed_gps and telemetry_handler is not None:
+                        if current_gps:
+                            with stages.stage(STAGE_EXIF):
+                                telemetry_handler.embed_exif(full_save_path, *current_gps)
+                    elif embed_gps and telemetry_future is not None:
+                        pending_exif.append((full_save_path, current_time))
+
+                    if pose_records is not None:
+                        pose_records.append((save_name, frame_idx / fps if fps > 0 else 0.0, name))
+
+                    mask_path = None
+                    if mask_or_skip is not None and isinstance(mask_or_skip, np.ndarray):
+                        mask_path = os.path.join(output_dir, mask_name)
+                        with stages.stage(STAGE_ENCODE):
+                            FileManager.save_mask(mask_path, mask_or_skip)
+
+                    if self.profiler.enabled:
+                        self.profiler.add_bytes(STAGE_ENCODE, self._file_size(full_save_path) + self._file_size(mask_path))
+        
+            # Only frames that produced images count as extracted viewpoints
+            if viewpoint is not None and counters.count(VIEW_SAVED) > saved_before:
+                self.spatial_index.add(*viewpoint)
+
+            if tracer is not None:
+                self._trace_frame(frame_start, frame_idx, pending_exif)
+            frame_idx += 1
+
+            if counters.summary_due():
+                logger.info(f"{filename} at frame {frame_idx}/{total_frames_video}: {counters.summary()}")
+            
+        cap.release()
+
+        if telemetry_future is not None:
+            if telemetry_handler is None and (self.is_running or telemetry_future.done()):
+                if pending_exif:
+                    logger.info(f"Waiting for telemetry to tag {len(pending_exif)} images of {filename}...")
+                telemetry_handler = self._resolve_telemetry(telemetry_future, filename)
+            if telemetry_handler is not None:
+                self._flush_pending_exif(telemetry_handler, pending_exif)
+            else:
+                telemetry_future.cancel()
+
+        # Pose priors for all saved images in one pass
+        if pose_records and telemetry_handler is not None:
+            try:
+                with stages.stage(STAGE_POSE_PRIORS):
+                    export_pose_priors(job.pose_priors, output_dir, telemetry_handler.track,
+                                       pose_records, views, out_res, fov)
+            except Exception as e:
+                logger.error(f"Failed to write pose priors for {filename}: {e}")
+
+        tracker.finish(frame_idx, counters.count(VIEW_SAVED))
+        self.counters.merge(counters)
+        logger.info(f"Finished {filename}: {counters.summary()}")
\ No newline at end of file
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+# Per-view outcomes
+VIEW_SAVED = 'saved'
+VIEW_BLURRY = 'blurry'
+VIEW_FORCED = 'forced_accept'  # blurry, but accepted after too many consecutive skips
+VIEW_PERSON = 'person'         # AI skip mode found a person
+
+# Per-frame outcomes
+FRAME_STATIC = 'static'        # adaptive mode: not enough motion since the last extracted frame
+FRAME_DUPLICATE = 'duplicate'  # spatial deduplication: viewpoint already extracted
+
+EVENT_LABELS = {
+    VIEW_SAVED: "views saved",
+    VIEW_BLURRY: "blurry views skipped",
+    VIEW_FORCED: "blurry views force-accepted",
+    VIEW_PERSON: "views skipped (person)",
+    FRAME_STATIC: "static frames skipped",
+    FRAME_DUPLICATE: "frames suppressed as duplicates",
+}
+
+# Seconds between progress summaries of a running job
+SUMMARY_INTERVAL = 30.0
+
+
+class EventCounters:
+    """
+    Counts extraction events per event type and per view, instead of logging
+    a line for each. One instance per job; merge() them for batch totals.
+    """
+
+    def __init__(self, summary_interval: float = SUMMARY_INTERVAL):
+        self.totals = Counter()
+        self.per_view = Counter()  # (event, view name) -> count
+        self.summary_interval = summary_interval
+        self._last_summary = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, event: str, view: Optional[str] = None, count: int = 1):
+        with self._lock:
+            self.totals[event] += count
+            if view is not None:
+                self.per_view[(event, view)] += count
+
+    def count(self, event: str, view: Optional[str] = None) -> int:
+        if view is None:
+            return self.totals[event]
+        return self.per_view[(event, view)]
+
+    def by_view(self, event: str) -> Dict[str, int]:
+        return {view: n for (name, view), n in self.per_view.items() if name == event}
+
+    def merge(self, other: 'EventCounters'):
+        with self._lock:
+            self.totals.update(other.totals)
+            self.per_view.update(other.per_view)
+
+    def summary_due(self, now: Optional[float] = None) -> bool:
+        """True once every summary_interval seconds; the caller then logs summary()."""
+        now = time.monotonic() if now is None else now
+        if now - self._last_summary < self.summary_interval:
+            return False
+        self._last_summary = now
+        return True
+
+    def summary(self, per_view_event: Optional[str] = VIEW_BLURRY) -> str:
+        """
+        e.g. '120 views saved, 34 blurry views skipped (View_0: 20, View_3: 14)'.
+        Only non-zero counts are listed; per_view_event also gets a per-view breakdown.
+        """
+        parts = []
+        for event, label in EVENT_LABELS.items():
+            n = self.totals[event]
+            if not n:
+                continue
+            part = f"{n} {label}"
+            if event == per_view_event:
+                views = sorted(self.by_view(event).items(), key=lambda item: -item[1])
+                if views:
+                    part += " (" + ", ".join(f"{view}: {n}" for view, n in views) + ")"
+            parts.append(part)
+        return ", ".join(parts) if parts else "nothing extracted"
@@ -0,0 +1,114 @@
+import hashlib
+import logging
+import os
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import numpy as np
+
+from utils.gpx_parser import parse_gpx_track
+from utils.telemetry_track import TelemetryTrack
+
+logger = logging.getLogger(__name__)
+
+
+class GPXIndex:
+    """
+    Time index over one or more GPX logs shared by a batch of videos.
+
+    Every log is parsed once and merged into a single track sorted by absolute
+    UNIX time. A video's GPS is then the slice covering its recording window
+    (container creation_time + duration), found by binary search.
+
+    time_offset (seconds) is added to video times before matching, to correct
+    a camera clock that is off from the logger's (or a camera writing local
+    time as UTC).
+    """
+
+    def __init__(self, tracks: List[TelemetryTrack], time_offset: float = 0.0, identity: str = ""):
+        tracks = [t for t in tracks if t.has_gps and t.start_time is not None]
+        if tracks:
+            epochs = np.concatenate([t.timestamps + t.start_time for t in tracks])
+            order = np.argsort(epochs, kind='stable')
+            self.epochs = epochs[order]
+            self.lat = np.concatenate([t.lat for t in tracks])[order]
+            self.lon = np.concatenate([t.lon for t in tracks])[order]
+            self.alt = np.concatenate([t.alt for t in tracks])[order]
+        else:
+            self.epochs = self.lat = self.lon = self.alt = np.empty(0)
+
+        self.time_offset = time_offset
+        self.identity = identity
+
+    @classmethod
+    def from_files(cls, gpx_paths: List[str], time_offset: float = 0.0) -> 'GPXIndex':
+        """Parses each GPX log once and builds the index."""
+        tracks = []
+        parts = [str(time_offset)]
+        for path in gpx_paths:
+            track = parse_gpx_track(path)
+            if not track.has_gps:
+                logger.warning(f"Shared GPX log has no timed points: {path}")
+            tracks.append(track)
+            try:
+                st = os.stat(path)
+                parts += [os.path.abspath(path), str(st.st_size), str(st.st_mtime_ns)]
+            except OSError:
+                parts.append(os.path.abspath(path))
+
+        identity = hashlib.sha1("\0".join(parts).encode('utf-8')).hexdigest()
+        index = cls(tracks, time_offset=time_offset, identity=identity)
+        logger.info(f"Indexed {len(index)} points from {len(gpx_paths)} shared GPX log(s).")
+        return index
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    def track_for(self, start_epoch: float, duration: float) -> TelemetryTrack:
+        """
+        Returns the part of the log covering [start_epoch, start_epoch + duration],
+        with timestamps relative to the video start. The samples just outside the
+        window are kept so interpolation at the edges is exact.
+
+        Returns an empty track if the window doesn't overlap the log.
+        """
+        if len(self.epochs) == 0:
+            return TelemetryTrack()
+
+        start = start_epoch + self.time_offset
+        end = start + max(duration, 0.0)
+        if end < self.epochs[0] or start > self.epochs[-1]:
+            return TelemetryTrack()
+
+        lo = max(int(np.searchsorted(self.epochs, start, side='right')) - 1, 0)
+        hi = min(int(np.searchsorted(self.epochs, end, side='left')) + 1, len(self.epochs))
+
+        return TelemetryTrack(
+            self.epochs[lo:hi] - start,
+            self.lat[lo:hi],
+            self.lon[lo:hi],
+            self.alt[lo:hi],
+            start_time=start
+        )
+
+
+def parse_creation_time(probe_data: dict) -> Optional[float]:
+    """
+    Returns the container creation_time from ffprobe JSON as a UNIX time, or None.
+    Falls back to the first stream carrying the tag.
+    """
+    candidates = [probe_data.get('format', {}).get('tags', {})]
+    candidates += [s.get('tags', {}) for s in probe_data.get('streams', [])]
+
+    for tags in candidates:
+        value = tags.get('creation_time')
+        if not value:
+            continue
+        try:
+            dt = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+        except ValueError:
+            continue
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    return None
@@ -0,0 +1,201 @@
+import json
+import logging
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import cv2
+
+from core.geometry import GeometryProcessor
+
+logger = logging.getLogger(__name__)
+
+# ffprobe runs in a subprocess and mostly waits on disk, so threads beyond the core count still help
+DEFAULT_PROBE_WORKERS = min(16, 2 * (os.cpu_count() or 1))
+
+# Equirectangular frames are 2:1; allow for sizes like 5760x2880 vs 3840x1920 rounding
+EQUIRECT_ASPECT = 2.0
+EQUIRECT_TOLERANCE = 0.02
+
+TELEMETRY_TAGS = {'gpmd': 'GPMF', 'camm': 'CAMM'}
+
+
+def _parse_rate(rate: str) -> float:
+    """Parses an ffprobe frame rate such as '30000/1001'."""
+    num, _, den = (rate or '').partition('/')
+    try:
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _to_float(value, default=0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass
+class VideoInfo:
+    """What the ingest probe learned about one input file."""
+    path: str
+    width: int = 0
+    height: int = 0
+    fps: float = 0.0
+    duration: float = 0.0
+    frame_count: int = 0
+    codec: str = ''
+    telemetry: List[str] = field(default_factory=list)  # e.g. ['GPMF'], ['SRT']
+    error: Optional[str] = None
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def is_equirectangular(self) -> bool:
+        return self.height > 0 and abs(self.width / self.height - EQUIRECT_ASPECT) <= EQUIRECT_TOLERANCE
+
+    @property
+    def problem(self) -> Optional[str]:
+        """Why the file can't be processed, or None if it can."""
+        if self.error:
+            return self.error
+        if self.width <= 0 or self.height <= 0:
+            return "no video stream"
+        if not self.is_equirectangular:
+            return f"not equirectangular ({self.width}x{self.height}, expected 2:1)"
+        return None
+
+    def estimate_images(self, settings: Dict) -> int:
+        """Number of images the processor would write with these settings (before blur/AI/dedup skips)."""
+        interval_value = _to_float(settings.get('interval_value', 1.0), 1.0)
+        if settings.get('interval_unit', 'Seconds') == 'Frames':
+            step = int(max(1, interval_value))
+        else:
+            # Meters is unknown until the track is read; estimate like the seconds fallback
+            step = int(max(1, self.fps * interval_value))
+        frame_count = self.frame_count or int(self.duration * self.fps)
+        frames = -(-frame_count // step) if frame_count > 0 else 0
+
+        views = GeometryProcessor.generate_views(settings.get('camera_count', 6),
+                                                 layout_mode=settings.get('layout_mode', 'adaptive'))
+        active = settings.get('active_cameras')
+        view_count = len(views) if active is None else sum(1 for i in range(len(views)) if i in active)
+        return frames * view_count
+
+    def describe(self) -> str:
+        """One-line summary, e.g. '5760x2880, 29.97 fps, 3:12, GPMF'."""
+        minutes, seconds = divmod(int(round(self.duration)), 60)
+        parts = [f"{self.width}x{self.height}", f"{self.fps:.2f} fps", f"{minutes}:{seconds:02d}"]
+        if self.telemetry:
+            parts.append("/".join(self.telemetry))
+        return ", ".join(parts)
+
+
+def _probe_ffprobe(video_path: str) -> Optional[VideoInfo]:
+    """Reads the stream headers with ffprobe. Returns None if ffprobe isn't installed."""
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-print_format', 'json',
+        '-show_entries',
+        'stream=codec_type,codec_name,codec_tag_string,width,height,avg_frame_rate,r_frame_rate,'
+        'nb_frames,duration:stream_disposition=attached_pic:format=duration',
+        video_path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    except FileNotFoundError:
+        return None
+    except subprocess.CalledProcessError as e:
+        lines = (e.stderr or '').strip().splitlines()
+        return VideoInfo(video_path, error=f"unreadable ({lines[-1] if lines else 'ffprobe failed'})")
+    except OSError as e:
+        return VideoInfo(video_path, error=f"unreadable ({e})")
+
+    try:
+        data = json.loads(result.stdout or '{}')
+    except json.JSONDecodeError:
+        return VideoInfo(video_path, error="unreadable (invalid ffprobe output)")
+
+    info = VideoInfo(video_path, duration=_to_float(data.get('format', {}).get('duration')))
+    has_subtitles = False
+    for stream in data.get('streams', []):
+        codec_type = stream.get('codec_type', '')
+        if codec_type == 'video' and not info.width and not stream.get('disposition', {}).get('attached_pic'):
+            info.width = int(stream.get('width') or 0)
+            info.height = int(stream.get('height') or 0)
+            info.codec = stream.get('codec_name', '')
+            info.fps = _parse_rate(stream.get('avg_frame_rate')) or _parse_rate(stream.get('r_frame_rate'))
+            info.frame_count = int(_to_float(stream.get('nb_frames')))
+            if not info.duration:
+                info.duration = _to_float(stream.get('duration'))
+        elif codec_type == 'data':
+            tag = stream.get('codec_tag_string', '')
+            for key, name in TELEMETRY_TAGS.items():
+                if key in tag and name not in info.telemetry:
+                    info.telemetry.append(name)
+        elif codec_type == 'subtitle':
+            has_subtitles = True
+
+    # Same precedence as TelemetryHandler: subtitles (DJI SRT) only without GPMF/CAMM
+    if has_subtitles and not info.telemetry:
+        info.telemetry.append('SRT')
+    return info
+
+
+def _probe_opencv(video_path: str) -> VideoInfo:
+    """Fallback without ffprobe: container metadata through OpenCV (no telemetry detection)."""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return VideoInfo(video_path, error="unreadable (could not open video)")
+        info = VideoInfo(
+            video_path,
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=cap.get(cv2.CAP_PROP_FPS) or 0.0,
+            frame_count=max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT))),
+        )
+    finally:
+        cap.release()
+    if info.fps > 0:
+        info.duration = info.frame_count / info.fps
+    return info
+
+
+def probe_video(video_path: str) -> VideoInfo:
+    """Probes one file without decoding it. Never raises; failures are reported in VideoInfo.error."""
+    if not os.path.isfile(video_path):
+        return VideoInfo(video_path, error="file not found")
+    try:
+        info = _probe_ffprobe(video_path)
+        if info is None:
+            info = _probe_opencv(video_path)
+    except Exception as e:
+        info = VideoInfo(video_path, error=f"probe failed ({e})")
+    return info
+
+
+def probe_videos(paths: Iterable[str], workers: int = DEFAULT_PROBE_WORKERS,
+                 is_cancelled: Callable[[], bool] = lambda: False) -> Iterator[VideoInfo]:
+    """
+    Probes files concurrently and yields their VideoInfo in input order.
+    Stops early (dropping queued probes) once is_cancelled() returns True.
+    """
+    paths = list(paths)
+    if not paths:
+        return
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(paths))), thread_name_prefix="ingest")
+    try:
+        futures = [executor.submit(probe_video, path) for path in paths]
+        for future in futures:
+            if is_cancelled():
+                return
+            yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -7,6 +7,7 @@ class Job:
     file_path: str
     status: str = "Pending"  # Pending, Processing, Done, Error
     settings: Dict[str, Any] = field(default_factory=dict)
+    info: Optional[Any] = None  # core.ingest.VideoInfo, when the file was probed on ingest
 
     @property
     def active_cameras(self) -> Optional[List[int]]:
@@ -44,6 +45,25 @@ class Job:
     def export_telemetry(self) -> bool:
         return self.settings.get('export_telemetry', False)
 
+    @property
+    def interval_unit(self) -> str:
+        return self.settings.get('interval_unit', 'Seconds')
+
+    @property
+    def needs_telemetry(self) -> bool:
+        """True if the job reads the GPS track (EXIF export, distance sampling, deduplication or pose priors)."""
+        return (self.export_telemetry or self.interval_unit == 'Meters'
+                or self.spatial_dedup or self.pose_priors != 'none')
+
+    @property
+    def pose_priors(self) -> str:
+        """Pose prior output format: 'none', 'colmap' or 'realityscan'."""
+        return self.settings.get('pose_priors', 'none') or 'none'
+
+    @property
+    def spatial_dedup(self) -> bool:
+        return self.settings.get('spatial_dedup_enabled', False)
+
     def summary(self) -> str:
         """Returns a short summary of the job settings."""
         # e.g., "High (-20°), 6 cams"
@@ -56,4 +76,5 @@ class Job:
         layout = self.settings.get('layout_mode', 'adaptive')
         layout_info = " (Ring)" if layout == 'ring' else ""
         adaptive = " [Adaptive]" if self.adaptive_mode else ""
-        return f"{pitch_name} ({pitch_val}°), {cams} cams{layout_info}{adaptive}"
\ No newline at end of file
+        estimate = f", ~{self.info.estimate_images(self.settings):,} imgs" if self.info is not None else ""
+        return f"{pitch_name} ({pitch_val}°), {cams} cams{layout_info}{adaptive}{estimate}"
\ No newline at end of file
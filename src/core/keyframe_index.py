@@ -0,0 +1,253 @@
+import hashlib
+import logging
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when the index format or its construction changes
+KEYFRAME_INDEX_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 256
+
+# Without an index, reads this many frames ahead are decoded forward instead of seeking
+MAX_BLIND_FORWARD = 30
+
+
+class KeyframeIndex:
+    """
+    Presentation-ordered packet times of a video's first video stream and the
+    frame numbers of its keyframes. Frame n is the n-th packet in pts order,
+    which is how OpenCV numbers frames.
+    """
+
+    def __init__(self, pts, keyframes):
+        self.pts = np.asarray(pts, dtype=np.float64)
+        self.keyframes = np.asarray(keyframes, dtype=np.int64)
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.pts)
+
+    def keyframe_for(self, frame_index: int) -> int:
+        """Returns the nearest keyframe at or before frame_index (0 if there is none)."""
+        pos = np.searchsorted(self.keyframes, frame_index, side='right') - 1
+        return int(self.keyframes[pos]) if pos >= 0 else 0
+
+    def time_of(self, frame_index: int) -> float:
+        """Presentation time of a frame in seconds, relative to the first frame."""
+        frame_index = min(max(frame_index, 0), self.frame_count - 1)
+        return float(self.pts[frame_index] - self.pts[0])
+
+    @classmethod
+    def from_packets(cls, lines) -> 'KeyframeIndex':
+        """Builds the index from ffprobe 'pts_time,flags' CSV lines, skipping packets without pts."""
+        times = []
+        key_flags = []
+        for line in lines:
+            pts_time, _, flags = line.strip().partition(',')
+            try:
+                times.append(float(pts_time))
+            except ValueError:
+                continue
+            key_flags.append('K' in flags)
+
+        times = np.asarray(times, dtype=np.float64)
+        order = np.argsort(times, kind='stable')
+        keyframes = np.flatnonzero(np.asarray(key_flags, dtype=bool)[order]) if len(times) else np.empty(0, np.int64)
+        return cls(times[order], keyframes)
+
+    @classmethod
+    def probe(cls, video_path: str) -> Optional['KeyframeIndex']:
+        """
+        Reads the packet table with ffprobe. Only the container is demuxed,
+        nothing is decoded. Returns None if ffprobe fails or finds no packets.
+        """
+        cmd = [
+            'ffprobe',
+            '-v', 'error',
+            '-select_streams', 'v:0',
+            '-show_entries', 'packet=pts_time,flags',
+            '-of', 'csv=p=0',
+            video_path
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.debug(f"Could not index keyframes of {os.path.basename(video_path)}: {e}")
+            return None
+
+        index = cls.from_packets(result.stdout.splitlines())
+        return index if index.frame_count else None
+
+
+class KeyframeIndexCache:
+    """
+    On-disk cache of keyframe indexes, one .npz per video keyed by its absolute
+    path, size, mtime and KEYFRAME_INDEX_VERSION. Keeps at most max_entries,
+    evicting the least recently used.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if cache_dir is None:
+            cache_dir = Path.home() / ".application360" / "keyframe_index"
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+
+    def key_for(self, video_path: str) -> Optional[str]:
+        try:
+            abs_path = os.path.abspath(video_path)
+            st = os.stat(abs_path)
+        except OSError:
+            return None
+        parts = [abs_path, str(st.st_size), str(st.st_mtime_ns), str(KEYFRAME_INDEX_VERSION)]
+        return hashlib.sha1("\0".join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, video_path: str) -> Optional[KeyframeIndex]:
+        """Returns the cached index, probing and storing it on a miss."""
+        key = self.key_for(video_path)
+        if key is None:
+            return None
+
+        path = self.cache_dir / f"{key}.npz"
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                index = KeyframeIndex(data['pts'], data['keyframes'])
+            os.utime(path)
+            return index
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Discarding unreadable keyframe index {path.name}: {e}")
+
+        index = KeyframeIndex.probe(video_path)
+        if index is not None:
+            self._store(path, index)
+        return index
+
+    def _store(self, path: Path, index: KeyframeIndex):
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, pts=index.pts, keyframes=index.keyframes)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write keyframe index: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        entries = []
+        for entry in self.cache_dir.glob("*.npz"):
+            try:
+                entries.append((entry.stat().st_mtime, entry))
+            except OSError:
+                continue  # evicted concurrently
+        entries.sort()
+        for _, stale in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+class FrameSeeker:
+    """
+    Random access to the frames of one video.
+
+    A read seeks to the keyframe at or before the target and decodes forward
+    with grab(), instead of relying on CAP_PROP_POS_FRAMES landing on the
+    target. The capture stays open, so a read further into the current GOP
+    (e.g. scrubbing forward, prefetching neighbours) only decodes the frames
+    in between. The keyframe index is loaded on the first read past frame 0;
+    without one, the seeker falls back to CAP_PROP_POS_FRAMES.
+    """
+
+    def __init__(self, video_path: str, index_cache: Optional[KeyframeIndexCache] = None):
+        self.video_path = video_path
+        self.index_cache = index_cache
+        self.index = None
+        self._index_loaded = False
+        self.cap = None
+        self.position = 0  # frame number the next grab() returns
+        self.frame_count = 0
+        self.fps = 0.0
+        self._lock = threading.RLock()
+
+    def open(self) -> bool:
+        """Opens the capture if needed. Returns False if the video can't be opened."""
+        with self._lock:
+            if self.cap is not None:
+                return True
+            cap = cv2.VideoCapture(self.video_path)
+            if not cap.isOpened():
+                cap.release()
+                return False
+            self.cap = cap
+            self.position = 0
+            if self.index is None:
+                self.frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            self.fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+            return True
+
+    def _load_index(self):
+        if self._index_loaded:
+            return
+        self._index_loaded = True
+        if self.index_cache is not None:
+            self.index = self.index_cache.get(self.video_path)
+        else:
+            self.index = KeyframeIndex.probe(self.video_path)
+        if self.index is not None:
+            self.frame_count = self.index.frame_count
+
+    def read(self, frame_index: int) -> Optional[np.ndarray]:
+        """Decodes frame frame_index. Returns None past the end or on failure."""
+        with self._lock:
+            if not self.open():
+                return None
+            if frame_index > 0:
+                self._load_index()
+
+            if self.index is not None:
+                keyframe = self.index.keyframe_for(frame_index)
+                must_seek = frame_index < self.position or keyframe > self.position
+            else:
+                keyframe = frame_index
+                must_seek = frame_index < self.position or frame_index - self.position > MAX_BLIND_FORWARD
+
+            if must_seek:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+                self.position = keyframe
+
+            while self.position < frame_index:
+                if not self.cap.grab():
+                    self._close()
+                    return None
+                self.position += 1
+
+            ret, frame = self.cap.read()
+            if not ret:
+                # Position is unknown after a failed read; reopen next time
+                self._close()
+                return None
+            self.position += 1
+            return frame
+
+    def _close(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def release(self):
+        with self._lock:
+            self._close()
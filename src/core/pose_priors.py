@@ -0,0 +1,348 @@
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.geometry import GeometryProcessor
+from utils.telemetry_track import TelemetryTrack, EARTH_RADIUS_M
+
+logger = logging.getLogger(__name__)
+
+POSE_PRIOR_FORMATS = ('colmap', 'realityscan')
+
+# Equirectangular rig frame (X right, Y down, Z forward, as in create_rectilinear_map)
+# to a level, north-facing ENU frame: forward -> north, right -> east, down -> -up.
+RIG_TO_ENU = np.array([
+    [1.0, 0.0, 0.0],
+    [0.0, 0.0, 1.0],
+    [0.0, -1.0, 0.0],
+])
+
+# IMU axes expressed in the rig frame. Identity assumes the IMU is aligned with the
+# equirectangular projection, which holds for the stitched output of most 360 cameras.
+IMU_TO_RIG = np.eye(3)
+
+
+def quat_multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Hamilton product of (..., 4) quaternion arrays in (w, x, y, z) order."""
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack([
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ], axis=-1)
+
+
+def quat_to_matrix(q: np.ndarray) -> np.ndarray:
+    """Converts (..., 4) unit quaternions (w, x, y, z) to (..., 3, 3) rotation matrices."""
+    q = q / np.linalg.norm(q, axis=-1, keepdims=True)
+    w, x, y, z = np.moveaxis(q, -1, 0)
+    return np.stack([
+        np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)], axis=-1),
+        np.stack([2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)], axis=-1),
+        np.stack([2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)], axis=-1),
+    ], axis=-2)
+
+
+def matrix_to_quat(m: np.ndarray) -> np.ndarray:
+    """Converts (..., 3, 3) rotation matrices to (..., 4) quaternions (w, x, y, z), w >= 0."""
+    m = np.asarray(m, dtype=np.float64)
+    m00, m01, m02 = m[..., 0, 0], m[..., 0, 1], m[..., 0, 2]
+    m10, m11, m12 = m[..., 1, 0], m[..., 1, 1], m[..., 1, 2]
+    m20, m21, m22 = m[..., 2, 0], m[..., 2, 1], m[..., 2, 2]
+
+    # Shepperd's method: evaluate all four branches, keep the numerically largest
+    s0 = 2 * np.sqrt(np.maximum(1 + m00 + m11 + m22, 1e-12))
+    s1 = 2 * np.sqrt(np.maximum(1 + m00 - m11 - m22, 1e-12))
+    s2 = 2 * np.sqrt(np.maximum(1 - m00 + m11 - m22, 1e-12))
+    s3 = 2 * np.sqrt(np.maximum(1 - m00 - m11 + m22, 1e-12))
+    candidates = np.stack([
+        np.stack([s0 / 4, (m21 - m12) / s0, (m02 - m20) / s0, (m10 - m01) / s0], axis=-1),
+        np.stack([(m21 - m12) / s1, s1 / 4, (m01 + m10) / s1, (m02 + m20) / s1], axis=-1),
+        np.stack([(m02 - m20) / s2, (m01 + m10) / s2, s2 / 4, (m12 + m21) / s2], axis=-1),
+        np.stack([(m10 - m01) / s3, (m02 + m20) / s3, (m12 + m21) / s3, s3 / 4], axis=-1),
+    ], axis=-2)
+    branch = np.argmax(np.stack([m00 + m11 + m22, m00, m11, m22], axis=-1), axis=-1)
+    q = np.take_along_axis(candidates, branch[..., None, None], axis=-2)[..., 0, :]
+    q = np.where(q[..., :1] < 0, -q, q)
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+def integrate_gyro(times: np.ndarray, rates: np.ndarray) -> np.ndarray:
+    """
+    Integrates angular rates (rad/s, (N, 3)) into orientations relative to the first
+    sample, as (N, 4) quaternions.
+
+    The cumulative quaternion product is computed with a log-depth parallel prefix
+    scan, so the whole stream is integrated in O(log N) vectorized steps.
+    """
+    n = len(times)
+    if n == 0:
+        return np.empty((0, 4))
+
+    dt = np.diff(times, prepend=times[0])
+    angle_vec = rates * dt[:, None]
+    angle = np.linalg.norm(angle_vec, axis=1)
+    half = angle / 2
+    # sin(half)/angle, with the small-angle limit 1/2
+    scale = np.where(angle > 1e-12, np.sin(half) / np.where(angle > 1e-12, angle, 1.0), 0.5)
+    scan = np.concatenate([np.cos(half)[:, None], angle_vec * scale[:, None]], axis=1)
+
+    step = 1
+    while step < n:
+        scan[step:] = quat_multiply(scan[:-step], scan[step:])
+        step *= 2
+    return scan
+
+
+def sample_quats(times: np.ndarray, quats: np.ndarray, at: np.ndarray) -> np.ndarray:
+    """Normalized linear interpolation of (N, 4) quaternions at the given times (clamped)."""
+    if len(times) == 1:
+        return np.repeat(quats[:1], len(at), axis=0)
+
+    at = np.clip(at, times[0], times[-1])
+    idx = np.clip(np.searchsorted(times, at, side='right'), 1, len(times) - 1)
+    t0, t1 = times[idx - 1], times[idx]
+    span = t1 - t0
+    frac = np.divide(at - t0, span, out=np.zeros_like(at), where=span > 0)[:, None]
+    q0, q1 = quats[idx - 1], quats[idx]
+    # Take the short way around
+    q1 = np.where((np.sum(q0 * q1, axis=1) < 0)[:, None], -q1, q1)
+    q = q0 * (1 - frac) + q1 * frac
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def relative_orientations(track: TelemetryTrack, at: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Rig orientation relative to the start of the clip at the given times, as (N, 3, 3)
+    matrices in the rig frame. Uses CORI when present, else integrated GYRO.
+    Returns None without IMU data.
+    """
+    to_rig = IMU_TO_RIG
+    if 'CORI' in track.imu and len(track.imu['CORI'][0]) > 0:
+        times, values = track.imu['CORI']
+        quats = values[:, :4].astype(np.float64)
+        quats = quats / np.linalg.norm(quats, axis=1, keepdims=True)
+        # Make it relative to the first sample
+        first_inv = quats[0] * np.array([1.0, -1.0, -1.0, -1.0])
+        quats = quat_multiply(first_inv, quats)
+    elif 'GYRO' in track.imu and len(track.imu['GYRO'][0]) > 1:
+        times, values = track.imu['GYRO']
+        quats = integrate_gyro(times, values[:, :3].astype(np.float64))
+    else:
+        return None
+
+    rot = quat_to_matrix(sample_quats(np.asarray(times, dtype=np.float64), quats, at))
+    # Change of basis from IMU axes to rig axes
+    return to_rig @ rot @ to_rig.T
+
+
+def _yaw_matrix(heading_deg: np.ndarray) -> np.ndarray:
+    """Rotations about ENU up turning north toward east by heading (clockwise from north)."""
+    a = -np.radians(heading_deg)
+    c, s = np.cos(a), np.sin(a)
+    m = np.zeros(np.shape(a) + (3, 3))
+    m[..., 0, 0] = c
+    m[..., 0, 1] = -s
+    m[..., 1, 0] = s
+    m[..., 1, 1] = c
+    m[..., 2, 2] = 1.0
+    return m
+
+
+def _fill_headings(courses: np.ndarray) -> np.ndarray:
+    """Holds the last known course over stationary stretches (first known one at the start)."""
+    valid = ~np.isnan(courses)
+    if not valid.any():
+        return np.zeros_like(courses)
+    idx = np.where(valid, np.arange(len(courses)), 0)
+    np.maximum.accumulate(idx, out=idx)
+    filled = courses[idx]
+    first = np.flatnonzero(valid)[0]
+    filled[:first] = courses[first]
+    return filled
+
+
+def rig_to_world(track: TelemetryTrack, at: np.ndarray) -> np.ndarray:
+    """
+    World-from-rig rotations (N, 3, 3) in ENU at the given times.
+
+    The IMU gives the rig's orientation relative to the start of the clip; its
+    unknown initial heading is aligned to the GPS course over ground (circular
+    mean over moving frames). Without IMU data the rig is assumed level and
+    facing the direction of travel.
+    """
+    courses = track.courses_at(at)
+    relative = relative_orientations(track, at)
+
+    if relative is None:
+        return _yaw_matrix(_fill_headings(courses)) @ RIG_TO_ENU
+
+    level = RIG_TO_ENU @ relative
+    forward = level[:, :, 2]
+    rig_headings = np.degrees(np.arctan2(forward[:, 0], forward[:, 1]))
+    moving = ~np.isnan(courses)
+    if moving.any():
+        diff = np.radians(courses[moving] - rig_headings[moving])
+        offset = np.degrees(np.arctan2(np.sin(diff).mean(), np.cos(diff).mean()))
+    else:
+        logger.warning("No GPS course available, pose priors assume the clip starts facing north.")
+        offset = 0.0
+    return _yaw_matrix(np.full(len(at), offset)) @ level
+
+
+def enu_positions(track: TelemetryTrack, at: np.ndarray,
+                  origin: Optional[Tuple[float, float, float]] = None) -> Tuple[np.ndarray, Tuple[float, float, float]]:
+    """
+    Local east/north/up positions (meters) at the given times, relative to origin
+    (lat, lon, alt), which defaults to the first position.
+    """
+    lat, lon, alt = track.interpolate(at)
+    if origin is None:
+        origin = (float(lat[0]), float(lon[0]), float(alt[0]))
+    lat0, lon0, alt0 = origin
+    east = np.radians(lon - lon0) * EARTH_RADIUS_M * np.cos(np.radians(lat0))
+    north = np.radians(lat - lat0) * EARTH_RADIUS_M
+    return np.column_stack([east, north, alt - alt0]), origin
+
+
+def compute_pose_priors(track: TelemetryTrack, records: List[Tuple[str, float, str]],
+                        view_rotations: Dict[str, np.ndarray]):
+    """
+    One vectorized pass over all images of a job.
+
+    Args:
+        track: Telemetry track with GPS (and optionally IMU).
+        records: (image_name, frame_time, view_name) per saved image.
+        view_rotations: view name -> camera-to-rig rotation (get_rotation_matrix).
+
+    Returns:
+        (names, R_world_from_camera (N, 3, 3), camera centers (N, 3), origin)
+    """
+    names = [r[0] for r in records]
+    times = np.array([r[1] for r in records], dtype=np.float64)
+
+    # Rig poses are evaluated once per distinct frame
+    frame_times, inverse = np.unique(times, return_inverse=True)
+    rig_rot = rig_to_world(track, frame_times)[inverse]
+    centers, origin = enu_positions(track, frame_times)
+
+    views = np.stack([view_rotations[r[2]] for r in records])
+    return names, rig_rot @ views, centers[inverse], origin
+
+
+def write_colmap(output_dir: str, names: List[str], rotations: np.ndarray, centers: np.ndarray,
+                 origin: Tuple[float, float, float], width: int, height: int, fov_deg: float):
+    """
+    Writes a COLMAP text model (cameras.txt, images.txt, empty points3D.txt) into
+    output_dir/colmap. Poses are world-to-camera in local ENU meters around origin.
+    """
+    model_dir = os.path.join(output_dir, "colmap")
+    os.makedirs(model_dir, exist_ok=True)
+
+    f = (0.5 * width) / np.tan(0.5 * np.radians(fov_deg))
+    with open(os.path.join(model_dir, "cameras.txt"), 'w') as fp:
+        fp.write("# Camera list with one line of data per camera:\n")
+        fp.write("#   CAMERA_ID, MODEL, WIDTH, HEIGHT, PARAMS[]\n")
+        fp.write(f"1 PINHOLE {width} {height} {f:.6f} {f:.6f} {width / 2:.6f} {height / 2:.6f}\n")
+
+    r_cw = np.swapaxes(rotations, -1, -2)
+    t_cw = -np.einsum('nij,nj->ni', r_cw, centers)
+    q_cw = matrix_to_quat(r_cw)
+
+    lines = [
+        "# Image list with two lines of data per image:\n",
+        "#   IMAGE_ID, QW, QX, QY, QZ, TX, TY, TZ, CAMERA_ID, NAME\n",
+        "#   POINTS2D[] as (X, Y, POINT3D_ID)\n",
+        f"# Pose priors in local ENU meters, origin lat={origin[0]:.8f} lon={origin[1]:.8f} alt={origin[2]:.3f}\n",
+    ]
+    for i, (name, q, t) in enumerate(zip(names, q_cw.tolist(), t_cw.tolist()), start=1):
+        lines.append(f"{i} {q[0]:.9f} {q[1]:.9f} {q[2]:.9f} {q[3]:.9f} {t[0]:.6f} {t[1]:.6f} {t[2]:.6f} 1 {name}\n\n")
+    with open(os.path.join(model_dir, "images.txt"), 'w') as fp:
+        fp.writelines(lines)
+
+    with open(os.path.join(model_dir, "points3D.txt"), 'w') as fp:
+        fp.write("# 3D point list (empty: pose priors only)\n")
+
+
+# Positions are local ENU meters around the job's first GPS fix, not geographic
+# coordinates, so they are declared relative and the origin is noted in a comment
+XMP_TEMPLATE = """<x:xmpmeta xmlns:x="adobe:ns:meta/">
+  <!-- Pose prior in local ENU meters, origin lat={origin[0]:.8f} lon={origin[1]:.8f} alt={origin[2]:.3f} -->
+  <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+    <rdf:Description xmlns:xcr="http://www.capturingreality.com/ns/xcr/1.1#"
+       xcr:Version="3" xcr:PosePrior="initial" xcr:Coordinates="relative"
+       xcr:DistortionModel="brown3" xcr:FocalLength35mm="{focal35:.6f}"
+       xcr:Skew="0" xcr:AspectRatio="1" xcr:PrincipalPointU="0" xcr:PrincipalPointV="0"
+       xcr:CalibrationPrior="exact" xcr:CalibrationGroup="1" xcr:DistortionGroup="1"
+       xcr:InTexturing="1" xcr:InMeshing="1">
+      <xcr:Rotation>{rotation}</xcr:Rotation>
+      <xcr:Position>{position}</xcr:Position>
+      <xcr:DistortionCoeficients>0 0 0 0 0 0</xcr:DistortionCoeficients>
+    </rdf:Description>
+  </rdf:RDF>
+</x:xmpmeta>
+"""
+
+
+def write_realityscan_xmp(output_dir: str, names: List[str], rotations: np.ndarray, centers: np.ndarray,
+                          origin: Tuple[float, float, float], width: int, fov_deg: float):
+    """
+    Writes one RealityScan/RealityCapture XMP sidecar per image (<image stem>.xmp),
+    with the world-to-camera rotation (row-major) and the camera position in
+    local ENU meters around origin (relative coordinates).
+    """
+    f = (0.5 * width) / np.tan(0.5 * np.radians(fov_deg))
+    focal35 = f * 36.0 / width
+    r_cw = np.swapaxes(rotations, -1, -2).reshape(len(names), 9)
+
+    for name, rot, pos in zip(names, r_cw.tolist(), centers.tolist()):
+        xmp_path = os.path.join(output_dir, os.path.splitext(name)[0] + ".xmp")
+        with open(xmp_path, 'w') as fp:
+            fp.write(XMP_TEMPLATE.format(
+                origin=origin,
+                focal35=focal35,
+                rotation=" ".join(f"{v:.9f}" for v in rot),
+                position=" ".join(f"{v:.6f}" for v in pos),
+            ))
+
+
+def export_pose_priors(fmt: str, output_dir: str, track: TelemetryTrack,
+                       records: List[Tuple[str, float, str]], views, resolution: int, fov_deg: float) -> bool:
+    """
+    Computes and writes pose priors for every image saved in a job.
+
+    Args:
+        fmt: 'colmap' or 'realityscan'.
+        output_dir: Folder holding the extracted images.
+        track: Telemetry track of the video.
+        records: (image_name, frame_time, view_name) per saved image.
+        views: (name, yaw, pitch, roll) tuples from GeometryProcessor.generate_views.
+        resolution: Output image width/height.
+        fov_deg: Horizontal field of view of the views.
+
+    Returns:
+        True if priors were written.
+    """
+    if not records:
+        return False
+    if not track.has_gps:
+        logger.warning("No GPS track, pose priors not written.")
+        return False
+
+    view_rotations = {name: GeometryProcessor.get_rotation_matrix(y, p, r) for name, y, p, r in views}
+    names, rotations, centers, origin = compute_pose_priors(track, records, view_rotations)
+
+    if fmt == 'colmap':
+        write_colmap(output_dir, names, rotations, centers, origin, resolution, resolution, fov_deg)
+    elif fmt == 'realityscan':
+        write_realityscan_xmp(output_dir, names, rotations, centers, origin, resolution, fov_deg)
+    else:
+        logger.error(f"Unknown pose prior format: {fmt}")
+        return False
+
+    logger.info(f"Wrote {fmt} pose priors for {len(names)} images.")
+    return True
@@ -0,0 +1,233 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.geometry import GeometryProcessor
+from core.keyframe_index import FrameSeeker, KeyframeIndexCache
+
+logger = logging.getLogger(__name__)
+
+# Source frames are downscaled to this width; enough for a 512px rectilinear preview
+PREVIEW_SOURCE_WIDTH = 2048
+
+# Progressive refinement: (output size, source width) per pass, coarse first
+PREVIEW_STAGES = ((192, 768), (512, PREVIEW_SOURCE_WIDTH))
+
+DEFAULT_MAX_FRAMES = 24
+DEFAULT_MAX_MAPS = 32
+DEFAULT_MAX_TILES = 64
+
+
+class PreviewCache:
+    """
+    In-memory LRU caches backing the preview: decoded, downscaled source frames
+    per (video, frame index), rectilinear remap tables per view geometry and
+    rendered contact-sheet tiles.
+
+    With both warm, a settings change (FOV, pitch, sharpening) costs a single
+    remap instead of reopening and decoding the video. Frame entries are keyed
+    on the file's mtime so a replaced file is decoded again. Frames are read
+    through a FrameSeeker kept open for the most recently previewed video.
+
+    Thread-safe: preview workers run on a thread pool. Decoding and map
+    generation happen outside the lock, so two workers missing on the same key
+    may both compute it; the last one wins.
+    """
+
+    def __init__(self, max_frames: int = DEFAULT_MAX_FRAMES, max_maps: int = DEFAULT_MAX_MAPS,
+                 max_tiles: int = DEFAULT_MAX_TILES, index_cache: Optional[KeyframeIndexCache] = None):
+        self.index_cache = index_cache if index_cache is not None else KeyframeIndexCache()
+        self.seeker = None
+        self.max_frames = max_frames
+        self.max_maps = max_maps
+        self.max_tiles = max_tiles
+        self.frames = OrderedDict()
+        self.maps = OrderedDict()
+        self.tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _lookup(store: OrderedDict, key):
+        value = store.get(key)
+        if value is not None:
+            store.move_to_end(key)
+        return value
+
+    @staticmethod
+    def _insert(store: OrderedDict, key, value, capacity: int):
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > capacity:
+            store.popitem(last=False)
+
+    @staticmethod
+    def frame_key(video_path: str, frame_index: int, max_width: int = PREVIEW_SOURCE_WIDTH):
+        """Identifies a decoded frame: (absolute path, mtime, frame index, width)."""
+        abs_path = os.path.abspath(video_path)
+        try:
+            mtime = os.stat(abs_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        return (abs_path, mtime, int(frame_index), int(max_width))
+
+    def seeker_for(self, video_path: str) -> FrameSeeker:
+        """Returns the open FrameSeeker of the video, replacing the previous video's."""
+        with self._lock:
+            if self.seeker is None or self.seeker.video_path != video_path:
+                if self.seeker is not None:
+                    self.seeker.release()
+                self.seeker = FrameSeeker(video_path, self.index_cache)
+            return self.seeker
+
+    @staticmethod
+    def downscale(frame: np.ndarray, max_width: Optional[int]) -> np.ndarray:
+        """Resizes a frame to at most max_width, keeping its aspect ratio."""
+        h, w = frame.shape[:2]
+        if max_width is None or w <= max_width:
+            return frame
+        return cv2.resize(frame, (max_width, int(h * (max_width / w))), interpolation=cv2.INTER_AREA)
+
+    @staticmethod
+    def decode_frame(video_path: str, frame_index: int = 0, max_width: Optional[int] = PREVIEW_SOURCE_WIDTH,
+                     seeker: Optional[FrameSeeker] = None) -> Optional[np.ndarray]:
+        """
+        Decodes one frame and downscales it to at most max_width (None keeps
+        the decoded size). Returns None on failure.
+        """
+        if seeker is None:
+            seeker = FrameSeeker(video_path)
+            try:
+                frame = seeker.read(frame_index)
+            finally:
+                seeker.release()
+        else:
+            frame = seeker.read(frame_index)
+
+        if frame is None:
+            return None
+        return PreviewCache.downscale(frame, max_width)
+
+    def peek_frame(self, video_path: str, frame_index: int = 0,
+                   max_width: int = PREVIEW_SOURCE_WIDTH) -> Optional[np.ndarray]:
+        """Returns the cached frame, or None without decoding."""
+        key = self.frame_key(video_path, frame_index, max_width)
+        with self._lock:
+            return self._lookup(self.frames, key)
+
+    def iter_frames(self, video_path: str, frame_index: int,
+                    widths: Iterable[int]) -> Iterator[Optional[np.ndarray]]:
+        """
+        Yields the frame downscaled to each of widths, in the given order.
+        Misses are resized straight from one decoded frame (or from the cached
+        PREVIEW_SOURCE_WIDTH frame when only smaller widths are missing), so
+        with ascending widths a coarse frame is ready before the larger ones
+        are built. Yields None and stops if the frame can't be decoded.
+        The yielded arrays are shared with the cache and must not be modified.
+        """
+        decoded = None
+        for width in widths:
+            key = self.frame_key(video_path, frame_index, width)
+            with self._lock:
+                frame = self._lookup(self.frames, key)
+            if frame is None:
+                source = decoded
+                if source is None and width < PREVIEW_SOURCE_WIDTH:
+                    source = self.peek_frame(video_path, frame_index, PREVIEW_SOURCE_WIDTH)
+                if source is None:
+                    decoded = source = self.decode_frame(video_path, frame_index, None,
+                                                         self.seeker_for(video_path))
+                    if decoded is None:
+                        yield None
+                        return
+                frame = self.downscale(source, width)
+                frame.flags.writeable = False
+                with self._lock:
+                    self._insert(self.frames, key, frame, self.max_frames)
+            yield frame
+
+    def get_frame(self, video_path: str, frame_index: int = 0, max_width: int = PREVIEW_SOURCE_WIDTH) -> Optional[np.ndarray]:
+        """
+        Returns the downscaled source frame, decoding it on a miss. Widths
+        below PREVIEW_SOURCE_WIDTH are resized from the cached full preview
+        source frame when there is one.
+        The returned array is shared with the cache and must not be modified.
+        """
+        return next(self.iter_frames(video_path, frame_index, (max_width,)))
+
+    def put_frame(self, video_path: str, frame_index: int, frame: np.ndarray, max_width: int = PREVIEW_SOURCE_WIDTH):
+        """Stores an already decoded (and downscaled) frame."""
+        key = self.frame_key(video_path, frame_index, max_width)
+        frame.flags.writeable = False
+        with self._lock:
+            self._insert(self.frames, key, frame, self.max_frames)
+
+    @staticmethod
+    def _map_key(src_h, src_w, dest_h, dest_w, fov, yaw, pitch, roll):
+        return (int(src_h), int(src_w), int(dest_h), int(dest_w), float(fov), float(yaw), float(pitch), float(roll))
+
+    def has_maps(self, src_h: int, src_w: int, dest_h: int, dest_w: int,
+                 fov: float, yaw: float, pitch: float, roll: float) -> bool:
+        """True if the maps for the view are cached."""
+        with self._lock:
+            return self._map_key(src_h, src_w, dest_h, dest_w, fov, yaw, pitch, roll) in self.maps
+
+    def prefetch(self, video_path: str, frame_indices, max_width: int = PREVIEW_SOURCE_WIDTH,
+                 is_cancelled=lambda: False):
+        """Decodes frames into the cache ahead of use, stopping once is_cancelled() is true."""
+        for frame_index in frame_indices:
+            if is_cancelled():
+                return
+            self.get_frame(video_path, frame_index, max_width)
+
+    def get_maps(self, src_h: int, src_w: int, dest_h: int, dest_w: int,
+                 fov: float, yaw: float, pitch: float, roll: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (map_x, map_y) for the view, generating them on a miss."""
+        key = self._map_key(src_h, src_w, dest_h, dest_w, fov, yaw, pitch, roll)
+        with self._lock:
+            maps = self._lookup(self.maps, key)
+        if maps is not None:
+            return maps
+
+        maps = GeometryProcessor.create_rectilinear_map(
+            src_h=src_h, src_w=src_w,
+            dest_h=dest_h, dest_w=dest_w,
+            fov_deg=fov,
+            yaw_deg=yaw,
+            pitch_deg=pitch,
+            roll_deg=roll
+        )
+        with self._lock:
+            self._insert(self.maps, key, maps, self.max_maps)
+        return maps
+
+    def get_tile(self, key):
+        """Returns a cached (tile, blur score) pair, or None. key starts with the frame_key of its source."""
+        with self._lock:
+            return self._lookup(self.tiles, key)
+
+    def put_tile(self, key, value):
+        value[0].flags.writeable = False
+        with self._lock:
+            self._insert(self.tiles, key, value, self.max_tiles)
+
+    def invalidate(self, video_path: Optional[str] = None):
+        """Drops cached frames of one video, or everything when video_path is None."""
+        with self._lock:
+            if self.seeker is not None and (video_path is None or self.seeker.video_path == video_path):
+                self.seeker.release()
+                self.seeker = None
+            if video_path is None:
+                self.frames.clear()
+                self.maps.clear()
+                self.tiles.clear()
+                return
+            abs_path = os.path.abspath(video_path)
+            for key in [k for k in self.frames if k[0] == abs_path]:
+                del self.frames[key]
+            for key in [k for k in self.tiles if k[0][0] == abs_path]:
+                del self.tiles[key]
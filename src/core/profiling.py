@@ -0,0 +1,175 @@
+import json
+import threading
+import time
+from array import array
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import Dict, Optional
+
+# Foreground stages of process_video, in pipeline order
+STAGE_MAPS = 'maps'                      # remap table generation per view
+STAGE_TELEMETRY_WAIT = 'telemetry_wait'  # blocked on the background telemetry extraction
+STAGE_GRAB = 'grab'                      # frames that are not extracted (grab() only)
+STAGE_DECODE = 'decode'                  # frames that are extracted (read())
+STAGE_MOTION = 'motion'                  # adaptive mode motion score
+STAGE_REMAP = 'remap'
+STAGE_BLUR = 'blur'
+STAGE_SHARPEN = 'sharpen'
+STAGE_AI = 'ai'
+STAGE_ENCODE = 'encode'                  # image/mask encoding and write (cv2.imwrite)
+STAGE_EXIF = 'exif'                      # GPS EXIF embedding
+STAGE_POSE_PRIORS = 'pose_priors'
+
+# Runs on the telemetry executor, overlapping the foreground stages
+STAGE_TELEMETRY = 'telemetry'
+
+STAGE_ORDER = (STAGE_MAPS, STAGE_TELEMETRY_WAIT, STAGE_GRAB, STAGE_DECODE, STAGE_MOTION, STAGE_REMAP,
+               STAGE_BLUR, STAGE_SHARPEN, STAGE_AI, STAGE_ENCODE, STAGE_EXIF, STAGE_POSE_PRIORS,
+               STAGE_TELEMETRY)
+BACKGROUND_STAGES = (STAGE_TELEMETRY,)
+
+
+def _percentile(ordered, percent: int) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not ordered:
+        return 0.0
+    rank = -(-percent * len(ordered) // 100)  # ceil without float rounding
+    return ordered[max(1, rank) - 1]
+
+
+class StageTimer:
+    """Times one call of a stage and hands it to profiler.add(stage, seconds, start)."""
+    __slots__ = ('profiler', 'stage', 'start')
+
+    def __init__(self, profiler, stage):
+        self.profiler = profiler
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = self.profiler.clock()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.stage, self.profiler.clock() - self.start, self.start)
+        return False
+
+
+class StageProfiler:
+    """
+    Wall-clock time, call count and bytes written per pipeline stage.
+
+    Every timed call keeps its duration (8 bytes) so report() can give exact
+    p50/p95; a long batch with a few million views stays in the tens of MB.
+    Thread-safe, so background stages can record into the same profiler.
+    Use NULL_PROFILER when profiling is off: its stage() returns a shared
+    no-op context and nothing is recorded. Timings are also forwarded to
+    tracer (a core.tracing.TraceRecorder) if one is set.
+    """
+    enabled = True
+
+    def __init__(self, clock=time.perf_counter, tracer=None):
+        self.clock = clock
+        self.tracer = tracer
+        self.samples = defaultdict(lambda: array('d'))
+        self.bytes = defaultdict(int)
+        self._lock = threading.Lock()
+        self._started = None
+        self._stopped = None
+
+    def start(self):
+        self._started = self.clock()
+        self._stopped = None
+
+    def stop(self):
+        self._stopped = self.clock()
+
+    @property
+    def wall_time(self) -> float:
+        if self._started is None:
+            return 0.0
+        end = self._stopped if self._stopped is not None else self.clock()
+        return end - self._started
+
+    def stage(self, name: str):
+        """Context manager timing one call of a stage."""
+        return StageTimer(self, name)
+
+    def add(self, name: str, seconds: float, start: Optional[float] = None):
+        with self._lock:
+            self.samples[name].append(seconds)
+        if self.tracer is not None and start is not None:
+            self.tracer.add(name, seconds, start)
+
+    def add_bytes(self, name: str, count: int):
+        with self._lock:
+            self.bytes[name] += count
+
+    def report(self) -> Dict:
+        """JSON-serializable summary; times in seconds."""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self.samples.items()}
+            written = dict(self.bytes)
+        names = [name for name in STAGE_ORDER if name in samples or name in written]
+        names += sorted(name for name in set(samples) | set(written) if name not in names)
+
+        stages = {}
+        for name in names:
+            ordered = samples.get(name, [])
+            total = sum(ordered)
+            stages[name] = {
+                'count': len(ordered),
+                'total': total,
+                'mean': total / len(ordered) if ordered else 0.0,
+                'p50': _percentile(ordered, 50),
+                'p95': _percentile(ordered, 95),
+                'max': ordered[-1] if ordered else 0.0,
+                'bytes': written.get(name, 0),
+                'background': name in BACKGROUND_STAGES,
+            }
+        return {'wall_time': self.wall_time, 'stages': stages}
+
+    def format_table(self, report: Optional[Dict] = None) -> str:
+        """Plain-text table of report(), one row per stage."""
+        report = report or self.report()
+        wall = report['wall_time']
+        lines = [f"{'stage':<15}{'count':>9}{'total s':>10}{'share':>8}{'mean ms':>10}"
+                 f"{'p50 ms':>10}{'p95 ms':>10}{'MB':>10}"]
+        for name, s in report['stages'].items():
+            share = f"{s['total'] * 100 / wall:.1f}%" if wall > 0 and not s['background'] else "-"
+            label = name + ("*" if s['background'] else "")
+            megabytes = f"{s['bytes'] / 1e6:.1f}" if s['bytes'] else "-"
+            lines.append(f"{label:<15}{s['count']:>9}{s['total']:>10.2f}{share:>8}{s['mean'] * 1e3:>10.2f}"
+                         f"{s['p50'] * 1e3:>10.2f}{s['p95'] * 1e3:>10.2f}{megabytes:>10}")
+        footer = f"wall time {wall:.2f} s"
+        if any(s['background'] for s in report['stages'].values()):
+            footer += " (* runs in the background, overlapping the other stages)"
+        lines.append(footer)
+        return "\n".join(lines)
+
+    def write_json(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+
+class _NullProfiler:
+    """Stands in for StageProfiler when profiling is off."""
+    enabled = False
+    _timer = nullcontext()
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def stage(self, name: str):
+        return self._timer
+
+    def add(self, name: str, seconds: float, start: Optional[float] = None):
+        pass
+
+    def add_bytes(self, name: str, count: int):
+        pass
+
+
+NULL_PROFILER = _NullProfiler()
@@ -0,0 +1,179 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from utils.logger import logger
+
+# At most this many progress events per second reach the consumers
+PROGRESS_RATE = 10.0
+
+# Weight of the newest throughput sample in the smoothed rate (0-1, higher reacts faster)
+RATE_SMOOTHING = 0.2
+
+STAGE_MAPS = 'maps'
+STAGE_EXTRACTING = 'extracting'
+STAGE_DONE = 'done'
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "--m --s"
+    seconds = int(seconds)
+    return f"{seconds // 60}m {seconds % 60:02d}s"
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """Snapshot of the running job, emitted at most PROGRESS_RATE times per second."""
+    job_index: int
+    total_jobs: int
+    filename: str
+    stage: str
+    frames_done: int = 0
+    frames_total: int = 0
+    views_written: int = 0
+    fps: float = 0.0                # smoothed decode throughput, frames per second
+    views_per_second: float = 0.0   # smoothed output throughput
+    eta: Optional[float] = None     # seconds left in this job, None until a rate is known
+
+    @property
+    def percent(self) -> int:
+        """Progress of the current job, 0-100."""
+        if self.stage == STAGE_DONE:
+            return 100
+        if self.frames_total <= 0:
+            return 0
+        return min(100, int(self.frames_done * 100 / self.frames_total))
+
+    @property
+    def overall_percent(self) -> float:
+        """Progress of the whole batch, 0-100."""
+        if self.total_jobs <= 0:
+            return 0.0
+        return (self.job_index * 100 + self.percent) / self.total_jobs
+
+    def describe(self) -> str:
+        if self.stage == STAGE_MAPS:
+            return f"Generating maps for {self.filename}..."
+        if self.stage == STAGE_DONE:
+            return f"Finished {self.filename}"
+        return (f"Processing {self.filename} - Frame {self.frames_done}/{self.frames_total} - "
+                f"{self.fps:.1f} fps - ETA: {format_eta(self.eta)}")
+
+
+class ProgressTracker:
+    """
+    Turns per-frame updates of one job into rate-limited ProgressEvents.
+    update() is cheap enough to call on every decoded or skipped frame: it
+    only builds an event when the last one is at least 1/rate seconds old.
+    The rates are exponentially smoothed so the ETA doesn't jump around.
+    """
+
+    def __init__(self, job_index: int, total_jobs: int, filename: str, frames_total: int,
+                 emit: Callable[[ProgressEvent], None], rate: float = PROGRESS_RATE,
+                 smoothing: float = RATE_SMOOTHING, clock: Callable[[], float] = time.monotonic):
+        self.job_index = job_index
+        self.total_jobs = total_jobs
+        self.filename = filename
+        self.frames_total = frames_total
+        self.emit = emit
+        self.min_interval = 1.0 / rate if rate > 0 else 0.0
+        self.smoothing = smoothing
+        self.clock = clock
+
+        self.fps = None
+        self.views_per_second = None
+        self._last_emit = None
+        self._last_sample = (clock(), 0, 0)  # (time, frames, views) at the last rate sample
+
+    def start(self, stage: str = STAGE_MAPS):
+        """Emits a stage change (e.g. map generation) right away."""
+        self._send(stage, 0, 0)
+        self._last_sample = (self.clock(), 0, 0)
+
+    def update(self, frames_done: int, views_written: int):
+        now = self.clock()
+        if self._last_emit is not None and now - self._last_emit < self.min_interval:
+            return
+        self._sample(now, frames_done, views_written)
+        self._send(STAGE_EXTRACTING, frames_done, views_written, now)
+
+    def finish(self, frames_done: int, views_written: int):
+        self._send(STAGE_DONE, frames_done, views_written)
+
+    def _sample(self, now, frames_done, views_written):
+        last_time, last_frames, last_views = self._last_sample
+        elapsed = now - last_time
+        if elapsed <= 0:
+            return
+        fps = (frames_done - last_frames) / elapsed
+        vps = (views_written - last_views) / elapsed
+        if self.fps is None:
+            self.fps, self.views_per_second = fps, vps
+        else:
+            a = self.smoothing
+            self.fps = a * fps + (1 - a) * self.fps
+            self.views_per_second = a * vps + (1 - a) * self.views_per_second
+        self._last_sample = (now, frames_done, views_written)
+
+    def _send(self, stage, frames_done, views_written, now=None):
+        self._last_emit = self.clock() if now is None else now
+        eta = None
+        if stage == STAGE_DONE:
+            eta = 0.0
+        elif stage == STAGE_EXTRACTING and self.fps:
+            eta = max(0.0, self.frames_total - frames_done) / self.fps
+        self.emit(ProgressEvent(
+            job_index=self.job_index,
+            total_jobs=self.total_jobs,
+            filename=self.filename,
+            stage=stage,
+            frames_done=frames_done,
+            frames_total=self.frames_total,
+            views_written=views_written,
+            fps=self.fps or 0.0,
+            views_per_second=self.views_per_second or 0.0,
+            eta=eta,
+        ))
+
+
+class CliProgress:
+    """
+    Command line consumer of ProgressEvents: drives a tqdm bar over the whole
+    batch, or logs a line every log_interval seconds without tqdm.
+    """
+
+    def __init__(self, bar=None, log_interval: float = 5.0):
+        self.bar = bar
+        self.log_interval = log_interval
+        self._last_log = 0.0
+
+    def __call__(self, event: ProgressEvent):
+        if self.bar is not None:
+            self.bar.set_description(f"Processing {event.filename}", refresh=False)
+            self.bar.set_postfix_str(f"{event.views_written} views, {event.fps:.1f} fps, "
+                                     f"ETA {format_eta(event.eta)}", refresh=False)
+            self.bar.n = round(event.overall_percent, 1)
+            self.bar.refresh()
+            return
+
+        now = time.monotonic()
+        if event.stage == STAGE_EXTRACTING and now - self._last_log < self.log_interval:
+            return
+        self._last_log = now
+        logger.info(f"[{event.overall_percent:.0f}%] {event.describe()}")
+
+    def write(self, message: str):
+        """Prints a message without breaking the bar."""
+        if self.bar is not None:
+            self.bar.write(message)
+        else:
+            logger.error(message)
+
+    def close(self):
+        """Completes and removes the bar; safe to call more than once."""
+        if self.bar is not None:
+            self.bar.n = 100
+            self.bar.refresh()
+            self.bar.close()
+            self.bar = None
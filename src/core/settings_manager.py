@@ -24,6 +24,12 @@ class SettingsManager:
         "adaptive_mode": False,
         "adaptive_threshold": 0.5,
         "export_telemetry": False,
+        "telemetry_cache_mb": 512,
+        "pose_priors": "none",
+        "profile_stages": False,
+        "spatial_dedup_enabled": False,
+        "spatial_dedup_radius": 2.0,
+        "spatial_dedup_heading": 30.0,
         "naming_mode": "realityscan",
         "image_pattern": "{filename}_frame{frame}_{camera}",
         "mask_pattern": "{filename}_frame{frame}_{camera}_mask"
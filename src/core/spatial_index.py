@@ -0,0 +1,74 @@
+import math
+from collections import defaultdict
+from typing import Optional
+
+from utils.telemetry_track import EARTH_RADIUS_M
+
+
+class SpatialIndex:
+    """
+    Grid hash over extracted viewpoints (GPS position + heading), shared across
+    the jobs of a batch.
+
+    Positions are projected to local east/north meters around the first point
+    and bucketed into square cells of radius_m, so a lookup only inspects the
+    3x3 neighbouring cells. A viewpoint is a duplicate if an indexed one lies
+    within radius_m and its heading differs by at most heading_tolerance_deg.
+    Viewpoints without a heading (stationary camera) match on position only.
+    """
+
+    def __init__(self, radius_m: float = 2.0, heading_tolerance_deg: float = 30.0):
+        self.radius_m = radius_m
+        self.heading_tolerance_deg = heading_tolerance_deg
+        self.cells = defaultdict(list)
+        self.count = 0
+        self._origin = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _to_xy(self, lat: float, lon: float):
+        if self._origin is None:
+            self._origin = (lat, lon, math.cos(math.radians(lat)))
+        lat0, lon0, cos_lat0 = self._origin
+        x = math.radians(lon - lon0) * EARTH_RADIUS_M * cos_lat0
+        y = math.radians(lat - lat0) * EARTH_RADIUS_M
+        return x, y
+
+    def _cell(self, x: float, y: float):
+        return (int(math.floor(x / self.radius_m)), int(math.floor(y / self.radius_m)))
+
+    def _heading_matches(self, a: Optional[float], b: Optional[float]) -> bool:
+        if a is None or b is None:
+            return True
+        diff = abs(a - b) % 360.0
+        return min(diff, 360.0 - diff) <= self.heading_tolerance_deg
+
+    def is_duplicate(self, lat: float, lon: float, heading: Optional[float] = None) -> bool:
+        """True if an indexed viewpoint lies within the radius and heading tolerance."""
+        x, y = self._to_xy(lat, lon)
+        cx, cy = self._cell(x, y)
+        radius_sq = self.radius_m * self.radius_m
+
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for px, py, p_heading in self.cells.get((cx + dx, cy + dy), ()):
+                    if (px - x) ** 2 + (py - y) ** 2 <= radius_sq and self._heading_matches(heading, p_heading):
+                        return True
+        return False
+
+    def add(self, lat: float, lon: float, heading: Optional[float] = None):
+        """Indexes an extracted viewpoint."""
+        x, y = self._to_xy(lat, lon)
+        self.cells[self._cell(x, y)].append((x, y, heading))
+        self.count += 1
+
+    def check_and_add(self, lat: float, lon: float, heading: Optional[float] = None) -> bool:
+        """
+        Returns True if the viewpoint is a duplicate (and should be skipped);
+        otherwise indexes it and returns False.
+        """
+        if self.is_duplicate(lat, lon, heading):
+            return True
+        self.add(lat, lon, heading)
+        return False
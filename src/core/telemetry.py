@@ -1,28 +1,63 @@
 import subprocess
 import json
 import logging
-import bisect
+import io
 from typing import Optional, Tuple, Any, List, Dict
 import piexif
 from PIL import Image
 from utils.gpmf_parser import GPMFParser
-from utils.srt_parser import parse_srt_data
-from utils.camm_parser import parse_camm_data
-from utils.gpx_parser import parse_gpx_data
+from utils.srt_parser import parse_srt_track
+from utils.camm_parser import parse_camm_track
+from utils.gpx_parser import parse_gpx_track
+from utils.telemetry_track import TelemetryTrack
+from core.telemetry_cache import TelemetryCache
+from core.gpx_index import GPXIndex, parse_creation_time
 import os
 
 logger = logging.getLogger(__name__)
 
 class TelemetryHandler:
-    def __init__(self):
+    def __init__(self, cache: Optional[TelemetryCache] = None, gpx_index: Optional[GPXIndex] = None):
         self.metadata = {}
         self.has_gps = False
-        self.gps_samples: List[Dict[str, float]] = []
+        self.track = TelemetryTrack()
+        self.cache = cache
+        # Shared GPX log(s) for the whole batch, matched by recording time
+        self.gpx_index = gpx_index
+        # Set when extraction hit an error, so a partial result isn't cached
+        self._extraction_failed = False
+
+    @property
+    def gps_samples(self) -> List[Dict[str, float]]:
+        """GPS samples in the legacy list-of-dicts format."""
+        return self.track.to_samples()
 
     def extract_metadata(self, video_path: str) -> bool:
         """
         Extracts metadata from the video file using ffmpeg.
         Checks for GPMF or CAMM streams, OR a sidecar .gpx file.
+        Priority: sidecar .gpx > shared GPX log > embedded telemetry.
+        Results are served from / stored to the telemetry cache when one is set.
+        """
+        cache_extra = self.gpx_index.identity if self.gpx_index is not None else ""
+        if self.cache is not None:
+            cached = self.cache.load(video_path, cache_extra)
+            if cached is not None:
+                self.has_gps, self.track = cached
+                logger.info(f"Loaded cached telemetry for {os.path.basename(video_path)} ({len(self.track)} GPS samples).")
+                return self.has_gps
+
+        self._extraction_failed = False
+        found = self._extract_from_source(video_path)
+
+        if self.cache is not None and not self._extraction_failed:
+            self.cache.store(video_path, self.has_gps, self.track, cache_extra)
+
+        return found
+
+    def _extract_from_source(self, video_path: str) -> bool:
+        """
+        Runs the actual extraction (sidecar GPX, then ffprobe/ffmpeg).
         """
         # 1. First Check for Sidecar GPX (Priority for Qoocam workflow)
         base_name = os.path.splitext(video_path)[0]
@@ -57,6 +92,11 @@ class TelemetryHandler:
             except (ValueError, TypeError):
                 duration = 0.0
 
+            # 2. Shared GPX log matched by the recording window
+            if self.gpx_index is not None and self._extract_shared_gpx(data, duration):
+                self.has_gps = True
+                return True
+
             subtitle_stream_index = None
 
             for stream in data.get('streams', []):
@@ -71,7 +111,7 @@ class TelemetryHandler:
                         
                         stream_index = stream.get('index')
                         if 'gpmd' in codec_tag_string:
-                            self._extract_gpmf_data(video_path, stream_index)
+                            self._extract_gpmf_data(video_path, stream_index, duration)
                         elif 'camm' in codec_tag_string:
                             self._extract_camm_data(video_path, stream_index, duration)
                         
@@ -93,9 +133,11 @@ class TelemetryHandler:
             
         except subprocess.CalledProcessError as e:
             logger.error(f"FFprobe error: {e}")
+            self._extraction_failed = True
             return False
         except Exception as e:
             logger.error(f"Error extracting metadata: {e}")
+            self._extraction_failed = True
             return False
 
     def _extract_camm_data(self, video_path: str, stream_index: int, duration: float):
@@ -114,19 +156,21 @@ class TelemetryHandler:
             result = subprocess.run(cmd, capture_output=True, check=True)
             raw_data = result.stdout
             
-            self.gps_samples = parse_camm_data(raw_data, duration)
-            if self.gps_samples:
+            self.track = parse_camm_track(raw_data, duration)
+            if self.track.has_gps:
                 self.has_gps = True
-                logger.info(f"Extracted {len(self.gps_samples)} CAMM GPS samples.")
+                logger.info(f"Extracted {len(self.track)} CAMM GPS samples.")
             else:
                 logger.warning("CAMM stream found but no GPS samples extracted.")
                 
         except subprocess.CalledProcessError as e:
             logger.error(f"FFmpeg extraction failed for CAMM: {e}")
+            self._extraction_failed = True
         except Exception as e:
             logger.error(f"Error parsing CAMM data: {e}")
+            self._extraction_failed = True
 
-    def _extract_gpmf_data(self, video_path: str, stream_index: int):
+    def _extract_gpmf_data(self, video_path: str, stream_index: int, duration: float = 0.0):
         """
         Extracts and parses GPMF data from the video.
         """
@@ -144,13 +188,16 @@ class TelemetryHandler:
             raw_data = result.stdout
             
             parser = GPMFParser()
-            self.gps_samples = parser.parse(raw_data)
-            logger.info(f"Extracted {len(self.gps_samples)} GPS samples.")
+            self.track = parser.parse_track(raw_data, duration)
+            imu_info = ", ".join(f"{key}: {len(times)}" for key, (times, _) in self.track.imu.items())
+            logger.info(f"Extracted {len(self.track)} GPS samples." + (f" IMU samples ({imu_info})." if imu_info else ""))
             
         except subprocess.CalledProcessError as e:
             logger.error(f"FFmpeg extraction failed: {e}")
+            self._extraction_failed = True
         except Exception as e:
             logger.error(f"Error parsing GPMF data: {e}")
+            self._extraction_failed = True
 
     def _extract_srt_data(self, video_path: str, stream_index: int):
         """
@@ -165,75 +212,69 @@ class TelemetryHandler:
                 '-f', 'srt',
                 '-'
             ]
-            result = subprocess.run(cmd, capture_output=True, check=True)
-            raw_data = result.stdout
+            # Stream the subtitle track line by line instead of buffering it
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+                lines = io.TextIOWrapper(proc.stdout, encoding='utf-8', errors='ignore')
+                self.track = parse_srt_track(lines)
+            if proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd)
             
-            self.gps_samples = parse_srt_data(raw_data)
-            
-            if self.gps_samples:
+            if self.track.has_gps:
                 self.has_gps = True
-                logger.info(f"Extracted {len(self.gps_samples)} GPS samples from subtitles.")
+                logger.info(f"Extracted {len(self.track)} GPS samples from subtitles.")
             else:
                 logger.warning("Subtitle stream found, but no GPS data extracted.")
                 
         except subprocess.CalledProcessError as e:
             logger.error(f"FFmpeg subtitle extraction failed: {e}")
+            self._extraction_failed = True
         except Exception as e:
             logger.error(f"Error parsing SRT data: {e}")
+            self._extraction_failed = True
 
     def _extract_gpx_data(self, gpx_path: str) -> bool:
         """
         Reads and parses a local GPX file.
         """
         try:
-            with open(gpx_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            samples = parse_gpx_data(content)
-            if samples:
-                self.gps_samples = samples
-                logger.info(f"Loaded {len(samples)} samples from GPX sidecar.")
+            track = parse_gpx_track(gpx_path)
+            if track.has_gps:
+                self.track = track
+                logger.info(f"Loaded {len(track)} samples from GPX sidecar.")
                 return True
             return False
         except Exception as e:
             logger.error(f"Failed to load GPX sidecar: {e}")
+            self._extraction_failed = True
             return False
 
+    def _extract_shared_gpx(self, probe_data: dict, duration: float) -> bool:
+        """
+        Slices the shared GPX index to this video's window (creation_time + duration).
+        """
+        creation_time = parse_creation_time(probe_data)
+        if creation_time is None:
+            logger.warning("No creation_time in container, can't match against the shared GPX log.")
+            return False
+
+        track = self.gpx_index.track_for(creation_time, duration)
+        if not track.has_gps:
+            logger.info("Recording time is outside the shared GPX log.")
+            return False
+
+        self.track = track
+        logger.info(f"Matched {len(track)} samples from the shared GPX log.")
+        return True
+
     def get_gps_at_time(self, timestamp: float) -> Optional[Tuple[float, float, float]]:
         """
         Returns (lat, lon, alt) for a given video timestamp (in seconds).
         Interpolates between samples.
         """
-        if not self.has_gps or not self.gps_samples:
+        if not self.has_gps:
             return None
-            
-        times = [s['timestamp'] for s in self.gps_samples]
-        
-        # Find insertion point
-        idx = bisect.bisect_left(times, timestamp)
-        
-        if idx == 0:
-            return (self.gps_samples[0]['lat'], self.gps_samples[0]['lon'], self.gps_samples[0]['alt'])
-        if idx >= len(self.gps_samples):
-            return (self.gps_samples[-1]['lat'], self.gps_samples[-1]['lon'], self.gps_samples[-1]['alt'])
-            
-        # Interpolate
-        t1 = times[idx-1]
-        t2 = times[idx]
-        
-        if t2 == t1:
-            return (self.gps_samples[idx]['lat'], self.gps_samples[idx]['lon'], self.gps_samples[idx]['alt'])
-            
-        ratio = (timestamp - t1) / (t2 - t1)
-        
-        p1 = self.gps_samples[idx-1]
-        p2 = self.gps_samples[idx]
-        
-        lat = p1['lat'] + (p2['lat'] - p1['lat']) * ratio
-        lon = p1['lon'] + (p2['lon'] - p1['lon']) * ratio
-        alt = p1['alt'] + (p2['alt'] - p1['alt']) * ratio
-        
-        return (lat, lon, alt)
+
+        return self.track.position_at(timestamp)
 
     def embed_exif(self, image_path: str, lat: float, lon: float, alt: float = 0.0) -> bool:
         """
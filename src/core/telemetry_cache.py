@@ -0,0 +1,176 @@
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from utils.telemetry_track import TelemetryTrack
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a parser change alters the extracted track, so stale entries are ignored
+TELEMETRY_PARSER_VERSION = 1
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_IMU_TIMES = 'imu_t_'
+_IMU_VALUES = 'imu_v_'
+
+
+class TelemetryCache:
+    """
+    On-disk cache of parsed telemetry tracks, one .npz file per input video.
+
+    Entries are keyed by the video's absolute path, size and mtime, the identity of
+    a sidecar .gpx file (if any) and TELEMETRY_PARSER_VERSION, so editing or
+    replacing either file invalidates the entry. Videos without telemetry are cached
+    too, so re-runs skip ffprobe/ffmpeg entirely.
+
+    The cache directory is kept under max_bytes by evicting the least recently
+    used entries (file mtime is refreshed on every hit).
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        if cache_dir is None:
+            cache_dir = Path.home() / ".application360" / "telemetry_cache"
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def key_for(self, video_path: str, extra: str = "") -> Optional[str]:
+        """
+        Returns the cache key for a video, or None if it can't be stat'ed.
+        extra identifies other inputs the result depends on (e.g. a shared GPX log).
+        """
+        try:
+            abs_path = os.path.abspath(video_path)
+            st = os.stat(abs_path)
+        except OSError:
+            return None
+
+        parts = [abs_path, str(st.st_size), str(st.st_mtime_ns), str(TELEMETRY_PARSER_VERSION), extra]
+
+        gpx_path = f"{os.path.splitext(abs_path)[0]}.gpx"
+        try:
+            gpx_st = os.stat(gpx_path)
+            parts += [str(gpx_st.st_size), str(gpx_st.st_mtime_ns)]
+        except OSError:
+            parts.append("nogpx")
+
+        return hashlib.sha1("\0".join(parts).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def load(self, video_path: str, extra: str = "") -> Optional[Tuple[bool, TelemetryTrack]]:
+        """
+        Returns (has_gps, track) for a cached video, or None on a miss.
+        """
+        key = self.key_for(video_path, extra)
+        if key is None:
+            return None
+
+        path = self._entry_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                start_time = float(data['start_time'])
+                imu = {}
+                for name in data.files:
+                    if name.startswith(_IMU_TIMES):
+                        imu_key = name[len(_IMU_TIMES):]
+                        imu[imu_key] = (data[name], data[_IMU_VALUES + imu_key])
+                track = TelemetryTrack(
+                    data['timestamps'], data['lat'], data['lon'], data['alt'],
+                    imu=imu, start_time=None if np.isnan(start_time) else start_time
+                )
+                has_gps = bool(data['has_gps'])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable telemetry cache entry {path.name}: {e}")
+            self._remove(path)
+            return None
+
+        # Refresh the entry's LRU position
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        logger.debug(f"Telemetry cache hit for {os.path.basename(video_path)}")
+        return has_gps, track
+
+    def store(self, video_path: str, has_gps: bool, track: TelemetryTrack, extra: str = ""):
+        """Writes the parsed result for a video and trims the cache to max_bytes."""
+        key = self.key_for(video_path, extra)
+        if key is None:
+            return
+
+        arrays = {
+            'has_gps': np.array(has_gps),
+            'start_time': np.array(np.nan if track.start_time is None else track.start_time),
+            'timestamps': track.timestamps,
+            'lat': track.lat,
+            'lon': track.lon,
+            'alt': track.alt,
+        }
+        for imu_key, (times, values) in track.imu.items():
+            arrays[_IMU_TIMES + imu_key] = np.asarray(times)
+            arrays[_IMU_VALUES + imu_key] = np.asarray(values)
+
+        path = self._entry_path(key)
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **arrays)
+            # Atomic, so concurrent readers never see a partial entry
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write telemetry cache entry: {e}")
+            self._remove(tmp_path)
+            return
+
+        self._evict()
+
+    def clear(self):
+        """Removes every cache entry."""
+        for entry in self._entries():
+            self._remove(entry.path)
+
+    def _entries(self):
+        try:
+            return [e for e in os.scandir(self.cache_dir) if e.name.endswith('.npz')]
+        except OSError:
+            return []
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for entry in self._entries():
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            logger.debug(f"Evicted telemetry cache entry {os.path.basename(path)}")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
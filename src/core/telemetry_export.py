@@ -0,0 +1,145 @@
+import csv
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from core.gpx_index import GPXIndex
+from core.telemetry import TelemetryHandler
+from core.telemetry_cache import TelemetryCache
+from utils.telemetry_track import TelemetryTrack
+
+# Parquet output is optional
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('csv', 'geojson', 'parquet')
+
+CSV_COLUMNS = ['clip', 'timestamp', 'utc', 'lat', 'lon', 'alt']
+
+
+def _extract_one(video_path: str, cache: Optional[TelemetryCache], gpx_index: Optional[GPXIndex]) -> TelemetryTrack:
+    handler = TelemetryHandler(cache=cache, gpx_index=gpx_index)
+    handler.extract_metadata(video_path)
+    return handler.track
+
+
+def extract_tracks(video_paths: List[str], workers: int = 8,
+                   cache: Optional[TelemetryCache] = None,
+                   gpx_index: Optional[GPXIndex] = None,
+                   on_done: Optional[Callable[[str, TelemetryTrack], None]] = None) -> List[Tuple[str, TelemetryTrack]]:
+    """
+    Extracts the telemetry track of every video in parallel, without decoding frames.
+    Extraction is ffprobe/ffmpeg bound, so threads are enough.
+
+    Returns (video_path, track) pairs in input order. Clips whose extraction
+    fails get an empty track.
+    """
+    tracks = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="telemetry") as executor:
+        futures = {executor.submit(_extract_one, path, cache, gpx_index): path for path in video_paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                track = future.result()
+            except Exception as e:
+                logger.error(f"Telemetry extraction failed for {os.path.basename(path)}: {e}")
+                track = TelemetryTrack()
+            tracks[path] = track
+            if on_done:
+                on_done(path, track)
+
+    return [(path, tracks[path]) for path in video_paths]
+
+
+def _utc(track: TelemetryTrack) -> np.ndarray:
+    if track.start_time is None:
+        return np.full(len(track), np.nan)
+    return track.timestamps + track.start_time
+
+
+def write_csv(path: str, tracks: List[Tuple[str, TelemetryTrack]]):
+    """One row per sample. utc is empty when the source has no absolute time."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        for video_path, track in tracks:
+            clip = os.path.basename(video_path)
+            utc = ['' if np.isnan(u) else f"{u:.3f}" for u in _utc(track).tolist()]
+            writer.writerows(
+                (clip, f"{t:.3f}", u, f"{la:.8f}", f"{lo:.8f}", f"{al:.3f}")
+                for t, u, la, lo, al in zip(track.timestamps.tolist(), utc, track.lat.tolist(),
+                                            track.lon.tolist(), track.alt.tolist())
+            )
+
+
+def write_geojson(path: str, tracks: List[Tuple[str, TelemetryTrack]]):
+    """One LineString feature per clip (Point for single-sample tracks). Clips without GPS are omitted."""
+    features = []
+    for video_path, track in tracks:
+        if not track.has_gps:
+            continue
+        coords = np.column_stack([track.lon, track.lat, track.alt]).tolist()
+        geometry = {'type': 'Point', 'coordinates': coords[0]} if len(coords) == 1 else \
+                   {'type': 'LineString', 'coordinates': coords}
+        features.append({
+            'type': 'Feature',
+            'geometry': geometry,
+            'properties': {
+                'clip': os.path.basename(video_path),
+                'path': video_path,
+                'samples': len(track),
+                'start_time': track.start_time,
+                'duration': float(track.timestamps[-1] - track.timestamps[0]),
+                'timestamps': track.timestamps.tolist(),
+            }
+        })
+
+    with open(path, 'w') as f:
+        json.dump({'type': 'FeatureCollection', 'features': features}, f)
+
+
+def write_parquet(path: str, tracks: List[Tuple[str, TelemetryTrack]]):
+    """Same columns as the CSV output. Requires pyarrow."""
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow).")
+
+    lengths = [len(track) for _, track in tracks]
+    clips = np.repeat([os.path.basename(p) for p, _ in tracks], lengths) if tracks else np.empty(0, dtype=str)
+
+    def column(getter):
+        return np.concatenate([getter(track) for _, track in tracks]) if tracks else np.empty(0)
+
+    table = pa.table({
+        'clip': pa.array(clips.tolist(), type=pa.string()),
+        'timestamp': column(lambda t: t.timestamps),
+        'utc': pa.array(column(_utc), from_pandas=True),
+        'lat': column(lambda t: t.lat),
+        'lon': column(lambda t: t.lon),
+        'alt': column(lambda t: t.alt),
+    })
+    pq.write_table(table, path)
+
+
+WRITERS = {
+    'csv': write_csv,
+    'geojson': write_geojson,
+    'parquet': write_parquet,
+}
+
+
+def format_from_path(path: str) -> Optional[str]:
+    """Guesses the export format from the output file extension."""
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    if ext == 'json':
+        return 'geojson'
+    return ext if ext in EXPORT_FORMATS else None
@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = 80
+
+# Thumbnails are tiny; this only bounds a cache left over from years of use
+DEFAULT_MAX_ENTRIES = 5000
+
+# Eviction trims this fraction below max_entries, so a full cache is rescanned
+# once every few hundred stores instead of on each one
+EVICT_SLACK = 0.1
+
+
+class ThumbnailCache:
+    """
+    On-disk cache of square video thumbnails, one JPEG per video keyed by its
+    absolute path, size, mtime and the thumbnail size. Reopening a queue shows
+    cached thumbnails without opening the videos.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if cache_dir is None:
+            cache_dir = Path.home() / ".application360" / "thumbnails"
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        # Entries on disk: counted by the first eviction scan, then kept up to date by store()
+        self._count = None
+        self._count_lock = threading.Lock()
+
+    def key_for(self, video_path: str, size: int = THUMBNAIL_SIZE) -> Optional[str]:
+        try:
+            abs_path = os.path.abspath(video_path)
+            st = os.stat(abs_path)
+        except OSError:
+            return None
+        parts = [abs_path, str(st.st_size), str(st.st_mtime_ns), str(size)]
+        return hashlib.sha1("\0".join(parts).encode('utf-8')).hexdigest()
+
+    def load(self, video_path: str, size: int = THUMBNAIL_SIZE) -> Optional[np.ndarray]:
+        """Returns the cached BGR thumbnail, or None on a miss."""
+        key = self.key_for(video_path, size)
+        if key is None:
+            return None
+        path = self.cache_dir / f"{key}.jpg"
+        if not path.exists():
+            return None
+        image = cv2.imread(str(path))
+        if image is None:
+            logger.warning(f"Discarding unreadable thumbnail {path.name}")
+            path.unlink(missing_ok=True)
+            return None
+        # Refresh the mtime so eviction drops the least recently used entries
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return image
+
+    def store(self, video_path: str, image: np.ndarray, size: int = THUMBNAIL_SIZE):
+        key = self.key_for(video_path, size)
+        if key is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.cache_dir / f"{key}.jpg"
+            added = not path.exists()
+            # imencode + replace, so readers never see a partial file
+            ok, data = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+            if not ok:
+                return
+            tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data.tobytes())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write thumbnail cache entry: {e}")
+            return
+        if added:
+            self._evict()
+
+    def _evict(self):
+        with self._count_lock:
+            if self._count is not None:
+                self._count += 1
+                if self._count <= self.max_entries:
+                    return
+
+            entries = []
+            for path in self.cache_dir.glob("*.jpg"):
+                try:
+                    entries.append((path.stat().st_mtime, path))
+                except OSError:
+                    continue  # removed by another thread or process
+            self._count = len(entries)
+            if self._count <= self.max_entries:
+                return
+
+            keep = self.max_entries - int(self.max_entries * EVICT_SLACK)
+            entries.sort()
+            for _, stale in entries[:len(entries) - keep]:
+                stale.unlink(missing_ok=True)
+            self._count = keep
+
+    @staticmethod
+    def generate(video_path: str, size: int = THUMBNAIL_SIZE) -> Optional[np.ndarray]:
+        """Decodes the first frame and returns a center-cropped square BGR thumbnail."""
+        cap = cv2.VideoCapture(video_path)
+        try:
+            if not cap.isOpened():
+                return None
+            ret, frame = cap.read()
+        finally:
+            cap.release()
+        if not ret or frame is None:
+            return None
+
+        # Crop to square from center
+        h, w = frame.shape[:2]
+        if w > h:
+            x = (w - h) // 2
+            frame = frame[:, x:x + h]
+        else:
+            y = (h - w) // 2
+            frame = frame[y:y + w, :]
+        return cv2.resize(frame, (size, size), interpolation=cv2.INTER_AREA)
+
+    def get(self, video_path: str, size: int = THUMBNAIL_SIZE) -> Optional[np.ndarray]:
+        """Returns the thumbnail, generating and caching it on a miss."""
+        image = self.load(video_path, size)
+        if image is not None:
+            return image
+        image = self.generate(video_path, size)
+        if image is not None:
+            self.store(video_path, image, size)
+        return image
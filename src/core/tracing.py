@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from core.profiling import StageTimer
+
+# Buffered events are written out once this many are pending, so memory stays flat on long batches
+FLUSH_EVENTS = 20000
+
+CAT_STAGE = 'stage'
+CAT_JOB = 'job'
+CAT_FRAME = 'frame'
+CAT_TRACE = 'trace'
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = self.tracer.clock()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.start, cat=self.cat, args=self.args)
+        return False
+
+
+class TraceRecorder:
+    """
+    Records pipeline activity as Chrome trace events, viewable in
+    chrome://tracing or ui.perfetto.dev.
+
+    Stages, jobs and frames become complete ("X") events on the thread that
+    ran them, queue depths become counter ("C") tracks, and every thread gets
+    its name as metadata the first time it records something. Timestamps are
+    the system-wide monotonic clock in microseconds, so traces written by
+    several processes on one machine line up.
+
+    Recording appends a tuple under a lock; events are serialized and written
+    in batches of flush_events (the flush shows up as its own span), and
+    close() completes the JSON file.
+    """
+
+    def __init__(self, path: str, flush_events: int = FLUSH_EVENTS, clock=time.perf_counter,
+                 process_name: str = "360Extractor"):
+        self.path = path
+        self.flush_events = flush_events
+        self.clock = clock
+        self.pid = os.getpid()
+        self._events = []
+        self._threads = set()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._first = True
+        self._file = open(path, 'w')
+        self._file.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        self._events.append(('M', 'process_name', self.pid, 0, {'name': process_name}))
+
+    # Stage sink interface shared with StageProfiler (see core.profiling)
+
+    def stage(self, name: str):
+        return StageTimer(self, name)
+
+    def add(self, name: str, seconds: float, start: Optional[float] = None):
+        if start is None:
+            start = self.clock() - seconds
+        self.complete(name, start, seconds, cat=CAT_STAGE)
+
+    # Events
+
+    def span(self, name: str, cat: str, args: Optional[Dict] = None):
+        """Context manager recording a complete event around its block."""
+        return _Span(self, name, cat, args)
+
+    def complete(self, name: str, start: float, duration: Optional[float] = None,
+                 cat: str = CAT_STAGE, args: Optional[Dict] = None):
+        """Records a span that began at start (clock seconds) and lasted duration (default: until now)."""
+        if duration is None:
+            duration = self.clock() - start
+        self._record(('X', name, cat, start, duration, args))
+
+    def counter(self, name: str, values: Dict[str, float]):
+        """Records the current value(s) of a counter track, e.g. queue depths."""
+        self._record(('C', name, self.clock(), values))
+
+    def _record(self, event):
+        tid = threading.get_ident()
+        with self._lock:
+            if tid not in self._threads:
+                self._threads.add(tid)
+                self._events.append(('M', 'thread_name', self.pid, tid,
+                                     {'name': threading.current_thread().name}))
+            self._events.append((tid,) + event)
+            full = len(self._events) >= self.flush_events
+        if full:
+            self.flush()
+
+    def _to_json(self, event) -> Dict:
+        if event[0] == 'M':
+            _, name, pid, tid, args = event
+            return {'ph': 'M', 'name': name, 'pid': pid, 'tid': tid, 'args': args}
+        tid, phase = event[0], event[1]
+        if phase == 'X':
+            _, _, name, cat, start, duration, args = event
+            data = {'ph': 'X', 'name': name, 'cat': cat, 'ts': round(start * 1e6, 1),
+                    'dur': round(duration * 1e6, 1), 'pid': self.pid, 'tid': tid}
+            if args:
+                data['args'] = args
+            return data
+        _, _, name, ts, values = event
+        return {'ph': 'C', 'name': name, 'ts': round(ts * 1e6, 1), 'pid': self.pid, 'tid': tid,
+                'args': values}
+
+    def flush(self):
+        """Writes the buffered events to the file."""
+        with self._write_lock:
+            start = self.clock()
+            with self._lock:
+                events, self._events = self._events, []
+            if not events or self._file is None:
+                return
+            lines = [json.dumps(self._to_json(event)) for event in events]
+            self._file.write(("" if self._first else ",\n") + ",\n".join(lines))
+            self._first = False
+        if len(events) >= self.flush_events:
+            self.complete('trace_flush', start, cat=CAT_TRACE, args={'events': len(events)})
+
+    def close(self):
+        """Writes the remaining events and completes the file. Further events are dropped."""
+        if self._file is None:
+            return
+        self.flush()
+        with self._write_lock:
+            self._file.write("\n]}\n")
+            self._file.close()
+            self._file = None
@@ -4,13 +4,16 @@ import sys
 import os
 import argparse
 import json
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QCoreApplication
 
-from ui.main_window import MainWindow
+# PySide6 is only imported for the GUI; CLI runs use the Qt-free engine
 from core.settings_manager import SettingsManager
 from core.job import Job
-from core.processor import ProcessingWorker
+from core.engine import ExtractionEngine
+from core.ingest import probe_videos
+from core.progress import CliProgress
+from core.profiling import StageProfiler
+from core.tracing import TraceRecorder
+from utils.file_manager import FileManager
 from utils.logger import logger
 
 # Try importing tqdm for progress bar
@@ -26,6 +29,7 @@ def parse_arguments():
     parser.add_argument("--input", "-i", type=str, help="Path to input video file or directory (CLI mode)")
     parser.add_argument("--output", "-o", type=str, help="Path to output directory (CLI mode)")
     parser.add_argument("--interval", type=float, help="Extraction interval in seconds (default: 1.0)")
+    parser.add_argument("--interval-unit", type=str, choices=['seconds', 'frames', 'meters'], help="Unit of --interval; 'meters' samples by GPS ground distance (default: seconds)")
     parser.add_argument("--format", type=str, choices=['jpg', 'png'], help="Output image format (default: jpg)")
     parser.add_argument("--ai", action="store_true", help="Enable AI masking (Legacy alias for --ai-mask)")
     parser.add_argument("--ai-mask", action="store_true", help="Enable AI masking (Generate Mask)")
@@ -38,6 +42,14 @@ def parse_arguments():
     parser.add_argument("--adaptive", action="store_true", help="Enable adaptive interval (motion-based)")
     parser.add_argument("--motion-threshold", type=float, help="Motion threshold for adaptive interval (default: 0.5)")
     parser.add_argument("--export-telemetry", action="store_true", help="Export GPS/IMU metadata (if available)")
+    parser.add_argument("--pose-priors", type=str, choices=['none', 'colmap', 'realityscan'], help="Write camera pose priors from GPS/IMU for every extracted view (default: none)")
+    parser.add_argument("--gpx", type=str, action="append", help="Shared GPX log for the whole batch, matched by recording time (repeatable, implies --export-telemetry)")
+    parser.add_argument("--gpx-offset", type=float, help="Seconds added to video creation times before matching GPX logs (default: 0)")
+    parser.add_argument("--dedup-radius", type=float, help="Skip frames within this many meters of an already extracted viewpoint, across the whole batch (enables spatial deduplication)")
+    parser.add_argument("--dedup-heading", type=float, help="Heading tolerance in degrees for spatial deduplication (default: 30)")
+    parser.add_argument("--skip-probe", action="store_true", help="Queue every found file without probing it first (by default unreadable and non-2:1 files are skipped)")
+    parser.add_argument("--trace", type=str, metavar="TRACE", help="Record jobs, frames, stages and queue depths per thread to a Chrome/Perfetto trace JSON file")
+    parser.add_argument("--profile", type=str, nargs="?", const="", metavar="REPORT", help="Time each pipeline stage, print a summary table and write a JSON report (default: profile.json in the output directory)")
     
     # Naming Control
     parser.add_argument("--naming-mode", type=str, choices=['realityscan', 'simple', 'custom'], help="Naming convention for output files")
@@ -46,6 +58,81 @@ def parse_arguments():
     
     return parser.parse_args()
 
+def parse_telemetry_arguments(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py telemetry",
+        description="Export GPS tracks of all inputs without decoding any video frames"
+    )
+    parser.add_argument("--input", "-i", type=str, required=True, help="Path to input video file or directory")
+    parser.add_argument("--output", "-o", type=str, required=True, help="Output file (.csv, .geojson or .parquet)")
+    parser.add_argument("--format", type=str, choices=['csv', 'geojson', 'parquet'], help="Output format (default: from the output extension, else csv)")
+    parser.add_argument("--workers", type=int, default=min(8, os.cpu_count() or 1), help="Parallel extractions (default: min(8, CPU count))")
+    parser.add_argument("--gpx", type=str, action="append", help="Shared GPX log for the whole batch, matched by recording time (repeatable)")
+    parser.add_argument("--gpx-offset", type=float, default=0.0, help="Seconds added to video creation times before matching GPX logs (default: 0)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the parsed-telemetry cache")
+    return parser.parse_args(argv)
+
+def run_telemetry_export(args):
+    from core.telemetry_cache import TelemetryCache
+    from core.gpx_index import GPXIndex
+    from core.telemetry_export import extract_tracks, format_from_path, WRITERS, PYARROW_AVAILABLE
+
+    if not os.path.exists(args.input):
+        logger.error(f"Error: Input path not found: {args.input}")
+        sys.exit(1)
+
+    fmt = args.format or format_from_path(args.output) or 'csv'
+    if fmt == 'parquet' and not PYARROW_AVAILABLE:
+        logger.error("Error: Parquet export requires pyarrow (pip install pyarrow).")
+        sys.exit(1)
+
+    files = FileManager.find_videos(args.input)
+    if not files:
+        logger.error("No video files found.")
+        sys.exit(1)
+
+    gpx_index = None
+    if args.gpx:
+        for gpx_path in args.gpx:
+            if not os.path.isfile(gpx_path):
+                logger.error(f"Error: GPX log not found: {gpx_path}")
+                sys.exit(1)
+        gpx_index = GPXIndex.from_files(args.gpx, time_offset=args.gpx_offset)
+
+    cache = None if args.no_cache else TelemetryCache(
+        max_bytes=int(SettingsManager().get('telemetry_cache_mb', 512)) * 1024 * 1024
+    )
+
+    logger.info(f"Extracting telemetry from {len(files)} file(s) with {args.workers} workers...")
+    if TQDM_AVAILABLE:
+        pbar = tqdm(total=len(files), unit="clip")
+        on_done = lambda path, track: pbar.update(1)
+    else:
+        pbar = None
+        on_done = lambda path, track: logger.info(f"{os.path.basename(path)}: {len(track)} GPS samples")
+
+    try:
+        tracks = extract_tracks(files, workers=args.workers, cache=cache, gpx_index=gpx_index, on_done=on_done)
+    except KeyboardInterrupt:
+        logger.info("\nProcess interrupted by user.")
+        sys.exit(1)
+    finally:
+        if pbar is not None:
+            pbar.close()
+
+    output_dir = os.path.dirname(os.path.abspath(args.output))
+    if not FileManager.ensure_directory(output_dir):
+        sys.exit(1)
+
+    try:
+        WRITERS[fmt](args.output, tracks)
+    except (OSError, RuntimeError) as e:
+        logger.error(f"Error writing {args.output}: {e}")
+        sys.exit(1)
+
+    with_gps = sum(1 for _, track in tracks if track.has_gps)
+    logger.info(f"Wrote {sum(len(t) for _, t in tracks)} samples from {with_gps}/{len(tracks)} clip(s) with GPS to {args.output}")
+
 def load_config(config_path):
     """Load configuration from a JSON file."""
     if not os.path.exists(config_path):
@@ -113,14 +200,7 @@ def run_cli(args):
             sys.exit(1)
             
     # Prepare jobs
-    files_to_process = []
-    if os.path.isdir(input_path):
-        for root, dirs, files in os.walk(input_path):
-            for f in files:
-                if f.lower().endswith(('.mp4', '.avi', '.mov', '.mkv')):
-                    files_to_process.append(os.path.join(root, f))
-    else:
-        files_to_process.append(input_path)
+    files_to_process = FileManager.find_videos(input_path)
         
     if not files_to_process:
         logger.error("No video files found.")
@@ -150,6 +230,8 @@ def run_cli(args):
     # Let's adjust get_arg logic to handle defaults manually.
     
     interval = args.interval if args.interval is not None else config.get('interval', 1.0)
+    interval_unit = args.interval_unit or config.get('interval_unit', 'seconds')
+    interval_unit = interval_unit.capitalize()
     fmt = args.format if args.format is not None else config.get('format', 'jpg')
     cam_count = args.camera_count if args.camera_count is not None else config.get('camera_count', 6)
     quality = args.quality if args.quality is not None else config.get('quality', 95)
@@ -180,6 +262,25 @@ def run_cli(args):
     if not export_telemetry:
         export_telemetry = config.get('export_telemetry', False)
 
+    # Shared GPX logs
+    gpx_logs = args.gpx or config.get('gpx_logs') or []
+    if isinstance(gpx_logs, str):
+        gpx_logs = [gpx_logs]
+    for gpx_path in gpx_logs:
+        if not os.path.isfile(gpx_path):
+            logger.error(f"Error: GPX log not found: {gpx_path}")
+            sys.exit(1)
+    if gpx_logs:
+        export_telemetry = True
+    gpx_time_offset = args.gpx_offset if args.gpx_offset is not None else config.get('gpx_time_offset', 0.0)
+
+    pose_priors = args.pose_priors or config.get('pose_priors', 'none')
+
+    # Spatial deduplication
+    dedup_radius = args.dedup_radius if args.dedup_radius is not None else config.get('spatial_dedup_radius', 2.0)
+    dedup_heading = args.dedup_heading if args.dedup_heading is not None else config.get('spatial_dedup_heading', 30.0)
+    dedup_enabled = args.dedup_radius is not None or config.get('spatial_dedup_enabled', False)
+
     # Naming Configuration
     naming_mode = args.naming_mode or config.get('naming_mode', 'realityscan')
     image_pattern = args.image_pattern or config.get('image_pattern')
@@ -191,7 +292,7 @@ def run_cli(args):
 
     settings = {
         'interval_value': interval,
-        'interval_unit': 'Seconds',
+        'interval_unit': interval_unit,
         'output_format': fmt,
         'camera_count': cam_count,
         'quality': quality,
@@ -209,67 +310,105 @@ def run_cli(args):
         'adaptive_mode': adaptive,
         'adaptive_threshold': motion_threshold,
         'export_telemetry': export_telemetry,
+        'pose_priors': pose_priors,
+        'gpx_logs': gpx_logs,
+        'gpx_time_offset': gpx_time_offset,
+        'spatial_dedup_enabled': dedup_enabled,
+        'spatial_dedup_radius': dedup_radius,
+        'spatial_dedup_heading': dedup_heading,
         'naming_mode': naming_mode,
         'image_pattern': image_pattern,
         'mask_pattern': mask_pattern
     }
 
-    jobs = [Job(file_path=f, settings=settings) for f in files_to_process]
-    
-    # Initialize Core Application for Signal/Slot support
-    core_app = QCoreApplication(sys.argv)
-
-    worker = ProcessingWorker(jobs)
+    if args.skip_probe:
+        jobs = [Job(file_path=f, settings=settings) for f in files_to_process]
+    else:
+        # Probe concurrently so corrupt or non-equirectangular files fail now, not mid-batch
+        jobs = []
+        for info in probe_videos(files_to_process):
+            problem = info.problem
+            if problem:
+                logger.warning(f"Skipping {info.filename}: {problem}")
+                continue
+            jobs.append(Job(file_path=info.path, settings=settings, info=info))
+        if not jobs:
+            logger.error("None of the found files can be processed.")
+            sys.exit(1)
+        total_images = sum(job.info.estimate_images(settings) for job in jobs)
+        logger.info(f"{len(jobs)} video(s) ready, ~{total_images:,} images to extract.")
     
-    # Progress Bar Handling
+    # Progress: a tqdm bar over the whole batch, or periodic log lines without tqdm
+    bar = None
     if TQDM_AVAILABLE:
-        current_job_idx = [0] # Use a list to make it mutable in closures
-        pbar = tqdm(total=100, unit="%", bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt}% [{elapsed}<{remaining}]')
-        
-        def update_progress(val, msg):
-            # Calculate global percentage: (current_job * 100 + current_val) / total_jobs
-            overall_pct = (current_job_idx[0] * 100 + val) / len(jobs)
-            pbar.set_description(msg.split(" - ")[0]) # Show current file in description
-            pbar.n = round(overall_pct, 1)
-            pbar.refresh()
-            
-        def on_job_started(idx):
-            current_job_idx[0] = idx
-            
-        def on_finished():
-            pbar.n = 100
-            pbar.refresh()
-            pbar.close()
-            logger.info("All jobs finished.")
-            
-        def on_error(err):
-            pbar.write(f"ERROR: {err}") # Write above bar
-            
-        worker.progress_updated.connect(update_progress)
-        worker.job_started.connect(on_job_started)
-        worker.error_occurred.connect(on_error)
-        worker.finished.connect(on_finished)
-        
-    else:
-        # Fallback to logging
-        worker.progress_updated.connect(lambda val, msg: logger.info(f"[{val}%] {msg}"))
-        worker.error_occurred.connect(lambda err: logger.error(f"ERROR: {err}"))
-        worker.finished.connect(lambda: logger.info("All jobs finished."))
+        bar = tqdm(total=100, unit="%", bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt}% [{elapsed}<{remaining}{postfix}]')
+    progress = CliProgress(bar)
+
+    # Stage profiling: --profile [REPORT] or "profile_stages" in the config
+    profile_path = args.profile
+    if profile_path is None and config.get('profile_stages', False):
+        profile_path = ""
+    profiler = None
+    if profile_path is not None:
+        profiler = StageProfiler()
+        profile_path = profile_path or os.path.join(output_path, "profile.json")
+
+    # Trace events: --trace TRACE or "trace" in the config
+    trace_path = args.trace or config.get('trace')
+    tracer = None
+    if trace_path:
+        try:
+            tracer = TraceRecorder(trace_path)
+        except OSError as e:
+            logger.error(f"Error creating trace file {trace_path}: {e}")
+            sys.exit(1)
+
+    def on_profile(profiler):
+        progress.close()
+        logger.info(f"Stage profile:\n{profiler.format_table()}")
+        try:
+            profiler.write_json(profile_path)
+            logger.info(f"Wrote profile report to {profile_path}")
+        except OSError as e:
+            logger.error(f"Error writing profile report {profile_path}: {e}")
+
+    def on_finished():
+        progress.close()
+        logger.info("All jobs finished.")
+
+    worker = ExtractionEngine(
+        jobs,
+        on_progress=progress,
+        on_error=lambda err: progress.write(f"ERROR: {err}"),
+        on_profile=on_profile,
+        on_finished=on_finished,
+        profiler=profiler,
+        tracer=tracer,
+    )
     
     # Run processing synchronously
     try:
         worker.run()
     except KeyboardInterrupt:
-        if TQDM_AVAILABLE: pbar.close()
+        progress.close()
         logger.info("\nProcess interrupted by user.")
         worker.stop()
         sys.exit(1)
     except Exception as e:
-        if TQDM_AVAILABLE: pbar.close()
+        progress.close()
         logger.error(f"An unexpected error occurred: {e}")
         sys.exit(1)
+    finally:
+        if tracer is not None:
+            tracer.close()
+            logger.info(f"Wrote trace to {trace_path}")
 
 def main():
+    # Subcommand: telemetry-only export (no frame decoding)
+    if len(sys.argv) > 1 and sys.argv[1] == 'telemetry':
+        run_telemetry_export(parse_telemetry_arguments(sys.argv[2:]))
+        return
+
     args = parse_arguments()
     
     # Check if CLI required arguments are present (input is strictly required via CLI or Config)
@@ -279,6 +418,9 @@ def main():
         run_cli(args)
     else:
         # GUI Mode
+        from PySide6.QtWidgets import QApplication
+        from ui.main_window import MainWindow
+
         app = QApplication(sys.argv)
         
         # Initialize settings
@@ -0,0 +1,50 @@
+import logging
+import time
+
+from PySide6.QtCore import QObject, Signal
+
+from core.ingest import DEFAULT_PROBE_WORKERS, probe_videos
+
+logger = logging.getLogger(__name__)
+
+
+class IngestWorker(QObject):
+    """
+    Probes dropped files off the GUI thread. Accepted files are reported in
+    batches (at most every batch_interval seconds) so the queue grows with
+    one model insert per batch rather than one per file.
+    """
+    accepted = Signal(list)       # [VideoInfo]
+    rejected = Signal(str, str)   # path, reason
+    finished = Signal(int, int)   # accepted count, rejected count
+
+    def __init__(self, paths, workers=DEFAULT_PROBE_WORKERS, batch_interval=0.1):
+        super().__init__()
+        self.paths = list(paths)
+        self.workers = workers
+        self.batch_interval = batch_interval
+        self._cancelled = False
+
+    def stop(self):
+        self._cancelled = True
+
+    def run(self):
+        batch = []
+        accepted = rejected = 0
+        last_emit = time.monotonic()
+        for info in probe_videos(self.paths, self.workers, lambda: self._cancelled):
+            problem = info.problem
+            if problem:
+                logger.warning(f"Skipping {info.filename}: {problem}")
+                self.rejected.emit(info.path, problem)
+                rejected += 1
+                continue
+            batch.append(info)
+            accepted += 1
+            if time.monotonic() - last_emit >= self.batch_interval:
+                self.accepted.emit(batch)
+                batch = []
+                last_emit = time.monotonic()
+        if batch:
+            self.accepted.emit(batch)
+        self.finished.emit(accepted, rejected)
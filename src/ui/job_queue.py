@@ -0,0 +1,363 @@
+"""
+Virtualized job queue: a list model over the jobs and a delegate painting
+each row as a video card. Only visible rows are painted, and status/progress
+changes repaint only the affected row.
+"""
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize, QEvent, Signal
+from PySide6.QtGui import QPixmap, QColor, QPainter, QPainterPath, QFont, QPen
+
+from ui.icons import get_icon, get_pixmap
+from ui.thumbnail_loader import ThumbnailLoader, PRIORITY_VISIBLE
+
+JobRole = Qt.UserRole + 1
+ProgressRole = Qt.UserRole + 2
+ThumbnailRole = Qt.UserRole + 3
+
+STATUS_COLORS = {
+    "Pending": "#52525B",
+    "Processing": "#3B82F6",
+    "Done": "#22C55E",
+    "Error": "#EF4444"
+}
+
+
+class JobQueueModel(QAbstractListModel):
+    """
+    List model over the batch's jobs. The jobs list is shared with the caller
+    (and handed to the ProcessingWorker); mutate it only through the model.
+    """
+    thumbnail_released = Signal(str)  # video path no row shows any more
+
+    def __init__(self, jobs=None, parent=None):
+        super().__init__(parent)
+        self.jobs = jobs if jobs is not None else []
+        self.progress = {}       # id(job) -> percent, for the job being processed
+        self._rows = {}          # id(job) -> row
+        self._by_path = {}       # video path -> jobs
+        self._requested = set()  # paths already asked for with visible priority
+        self._loader = ThumbnailLoader.instance()
+        self._loader.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self._reindex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.jobs)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.jobs):
+            return None
+        job = self.jobs[index.row()]
+        if role == Qt.DisplayRole:
+            return job.filename
+        if role == Qt.ToolTipRole:
+            return f"{job.file_path}\n{job.info.describe()}" if job.info is not None else job.file_path
+        if role == JobRole:
+            return job
+        if role == ProgressRole:
+            return self.progress.get(id(job), 0)
+        if role == ThumbnailRole:
+            return self._loader.thumbnail(job.file_path)
+        return None
+
+    def _reindex(self):
+        self._rows = {id(job): row for row, job in enumerate(self.jobs)}
+        self._by_path = {}
+        for job in self.jobs:
+            self._by_path.setdefault(job.file_path, []).append(job)
+
+    def row_of(self, job):
+        return self._rows.get(id(job), -1)
+
+    def job_at(self, row):
+        return self.jobs[row]
+
+    # -- Structure ------------------------------------------------------------
+
+    def add_jobs(self, jobs):
+        """Appends jobs in one insert and queues their thumbnails in the background."""
+        if not jobs:
+            return
+        first = len(self.jobs)
+        self.beginInsertRows(QModelIndex(), first, first + len(jobs) - 1)
+        for row, job in enumerate(jobs, first):
+            self.jobs.append(job)
+            self._rows[id(job)] = row
+            self._by_path.setdefault(job.file_path, []).append(job)
+        self.endInsertRows()
+
+        for job in jobs:
+            self._loader.request(job.file_path)
+
+    def remove_rows(self, rows):
+        """Removes the given rows, merging adjacent ones into single removals."""
+        rows = sorted((r for r in set(rows) if 0 <= r < len(self.jobs)), reverse=True)
+        runs = []
+        for row in rows:
+            if runs and runs[-1][0] == row + 1:
+                runs[-1][0] = row
+            else:
+                runs.append([row, row])
+
+        released = []
+        for first, last in runs:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            removed = self.jobs[first:last + 1]
+            del self.jobs[first:last + 1]
+            for job in removed:
+                self.progress.pop(id(job), None)
+            self.endRemoveRows()
+            released.extend(removed)
+        self._reindex()
+        self._release(released)
+
+    def clear(self):
+        self.beginResetModel()
+        released = list(self.jobs)
+        self.jobs.clear()
+        self.progress.clear()
+        self.endResetModel()
+        self._reindex()
+        self._release(released)
+
+    def _release(self, jobs):
+        # Drop the thumbnails of files no remaining row shows (after _reindex)
+        for path in {job.file_path for job in jobs} - self._by_path.keys():
+            self._loader.release(path)
+            self._requested.discard(path)
+            self.thumbnail_released.emit(path)
+
+    # -- Row updates ----------------------------------------------------------
+
+    def _row_changed(self, row, roles=()):
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index, list(roles))
+
+    def set_status(self, row, status):
+        if not 0 <= row < len(self.jobs):
+            return
+        job = self.jobs[row]
+        job.status = status
+        if status != "Processing":
+            self.progress.pop(id(job), None)
+        self._row_changed(row)
+
+    def set_progress(self, row, value):
+        if not 0 <= row < len(self.jobs):
+            return
+        job = self.jobs[row]
+        if self.progress.get(id(job)) == value:
+            return
+        self.progress[id(job)] = value
+        self._row_changed(row, (ProgressRole,))
+
+    def reset_status(self, status="Pending"):
+        for job in self.jobs:
+            job.status = status
+        self.progress.clear()
+        if self.jobs:
+            self.dataChanged.emit(self.index(0), self.index(len(self.jobs) - 1), [])
+
+    def refresh_job(self, job):
+        """Repaints a job's row after its settings changed."""
+        row = self.row_of(job)
+        if row >= 0:
+            self._row_changed(row)
+
+    # -- Thumbnails -----------------------------------------------------------
+
+    def request_thumbnail(self, row):
+        """Called when a row without a thumbnail is painted: load it before off-screen rows."""
+        path = self.jobs[row].file_path
+        if path not in self._requested:
+            self._requested.add(path)
+            self._loader.request(path, PRIORITY_VISIBLE)
+
+    def _on_thumbnail_ready(self, video_path, image):
+        if image.isNull():
+            return
+        # The loader may evict it later; a repaint then asks for it again
+        self._requested.discard(video_path)
+        for job in self._by_path.get(video_path, ()):
+            self._row_changed(self._rows[id(job)], (ThumbnailRole,))
+
+
+class JobCardDelegate(QStyledItemDelegate):
+    """Paints a job row as a video card: thumbnail, name, status, settings summary and progress."""
+    remove_requested = Signal(int)
+
+    CARD_HEIGHT = 90
+    SPACING = 8
+    MARGIN = 10
+    THUMB = 70
+    REMOVE = 24
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._thumbnails = {}  # video path -> rounded pixmap
+        self._placeholder = get_pixmap("video", color="#52525B", size=32)
+        self._remove_icon = get_icon("x", color="#52525B", size=16)
+        self._remove_hover_icon = get_icon("x", color="#EF4444", size=16)
+        self._hover_remove_row = -1
+
+    def sizeHint(self, option, index):
+        return QSize(250, self.CARD_HEIGHT + self.SPACING)
+
+    def _card_rect(self, option):
+        return QRect(option.rect.x(), option.rect.y(), option.rect.width() - 4, self.CARD_HEIGHT)
+
+    def _remove_rect(self, option):
+        card = self._card_rect(option)
+        return QRect(card.right() - self.MARGIN - self.REMOVE, card.top() + self.MARGIN, self.REMOVE, self.REMOVE)
+
+    def _rounded_thumbnail(self, path, image):
+        pixmap = self._thumbnails.get(path)
+        if pixmap is None:
+            source = QPixmap.fromImage(image).scaled(self.THUMB, self.THUMB, Qt.KeepAspectRatioByExpanding,
+                                                     Qt.SmoothTransformation)
+            pixmap = QPixmap(source.size())
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            clip = QPainterPath()
+            clip.addRoundedRect(0, 0, source.width(), source.height(), 8, 8)
+            painter.setClipPath(clip)
+            painter.drawPixmap(0, 0, source)
+            painter.end()
+            self._thumbnails[path] = pixmap
+        return pixmap
+
+    def release_thumbnail(self, path):
+        self._thumbnails.pop(path, None)
+
+    def clear_thumbnails(self):
+        self._thumbnails.clear()
+
+    def paint(self, painter, option, index):
+        job = index.data(JobRole)
+        if job is None:
+            return
+
+        selected = bool(option.state & QStyle.State_Selected)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Card background
+        card = self._card_rect(option)
+        if selected:
+            background, border, border_width = "#1E1E22", "#3B82F6", 2
+        elif hovered:
+            background, border, border_width = "#1A1A1D", "#3B82F6", 1
+        else:
+            background, border, border_width = "#161618", "#27272A", 1
+        painter.setPen(QPen(QColor(border), border_width))
+        painter.setBrush(QColor(background))
+        painter.drawRoundedRect(QRectF(card).adjusted(0.5, 0.5, -0.5, -0.5), 12, 12)
+
+        # Thumbnail
+        thumb_rect = QRect(card.left() + self.MARGIN, card.top() + self.MARGIN, self.THUMB, self.THUMB)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#252529"))
+        painter.drawRoundedRect(QRectF(thumb_rect), 8, 8)
+        image = index.data(ThumbnailRole)
+        if image is not None:
+            pixmap = self._rounded_thumbnail(job.file_path, image)
+            painter.drawPixmap(thumb_rect.topLeft(), pixmap, QRect(0, 0, self.THUMB, self.THUMB))
+        else:
+            index.model().request_thumbnail(index.row())
+            placeholder = self._placeholder
+            painter.drawPixmap(thumb_rect.center().x() - placeholder.width() // 2 + 1,
+                               thumb_rect.center().y() - placeholder.height() // 2 + 1, placeholder)
+
+        # Text column
+        text_left = thumb_rect.right() + 12
+        text_width = self._remove_rect(option).left() - 8 - text_left
+        top = card.top() + self.MARGIN
+
+        font = QFont(option.font)
+        font.setPixelSize(13)
+        font.setWeight(QFont.Medium)
+        painter.setFont(font)
+        painter.setPen(QColor("#FFFFFF"))
+        name = painter.fontMetrics().elidedText(job.filename, Qt.ElideMiddle, text_width)
+        painter.drawText(QRect(text_left, top, text_width, 18), Qt.AlignLeft | Qt.AlignVCenter, name)
+
+        font.setPixelSize(8)
+        font.setWeight(QFont.Normal)
+        painter.setFont(font)
+        painter.setPen(QColor(STATUS_COLORS.get(job.status, "#52525B")))
+        painter.drawText(QRect(text_left, top + 22, 10, 16), Qt.AlignLeft | Qt.AlignVCenter, "●")
+
+        font.setPixelSize(11)
+        painter.setFont(font)
+        painter.setPen(QColor("#A1A1AA"))
+        painter.drawText(QRect(text_left + 14, top + 22, text_width - 14, 16), Qt.AlignLeft | Qt.AlignVCenter,
+                         job.status)
+
+        font.setPixelSize(10)
+        painter.setFont(font)
+        painter.setPen(QColor("#52525B"))
+        summary = painter.fontMetrics().elidedText(job.summary(), Qt.ElideRight, text_width)
+        painter.drawText(QRect(text_left, top + 42, text_width, 14), Qt.AlignLeft | Qt.AlignVCenter, summary)
+
+        # Progress bar while processing
+        if job.status == "Processing":
+            bar = QRectF(text_left, top + 62, text_width, 4)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#27272A"))
+            painter.drawRoundedRect(bar, 2, 2)
+            value = max(0, min(100, index.data(ProgressRole) or 0))
+            if value:
+                painter.setBrush(QColor("#3B82F6"))
+                painter.drawRoundedRect(QRectF(bar.left(), bar.top(), bar.width() * value / 100, bar.height()), 2, 2)
+
+        # Remove button
+        icon = self._remove_hover_icon if hovered and index.row() == self._hover_remove_row else self._remove_icon
+        icon.paint(painter, self._remove_rect(option).adjusted(4, 4, -4, -4))
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseMove:
+            row = index.row() if self._remove_rect(option).contains(event.position().toPoint()) else -1
+            if row != self._hover_remove_row:
+                self._hover_remove_row = row
+                if option.widget is not None:
+                    option.widget.viewport().update(option.rect)
+            return False
+
+        # Clicking the x removes the row instead of selecting it
+        if event.type() in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease) and \
+                event.button() == Qt.LeftButton and self._remove_rect(option).contains(event.position().toPoint()):
+            if event.type() == QEvent.MouseButtonRelease:
+                self.remove_requested.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class JobQueueView(QListView):
+    """List view for the job queue: uniform rows, extended (Ctrl/Shift) selection."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setMouseTracking(True)
+        self.setFrameShape(QListView.NoFrame)
+        self.setStyleSheet("QListView { background: transparent; border: none; outline: none; }")
+        self.delegate = JobCardDelegate(self)
+        self.setItemDelegate(self.delegate)
+
+    def setModel(self, model):
+        old = self.model()
+        if isinstance(old, JobQueueModel):
+            old.thumbnail_released.disconnect(self.delegate.release_thumbnail)
+            old.modelReset.disconnect(self.delegate.clear_thumbnails)
+        self.delegate.clear_thumbnails()
+        super().setModel(model)
+        if isinstance(model, JobQueueModel):
+            model.thumbnail_released.connect(self.delegate.release_thumbnail)
+            model.modelReset.connect(self.delegate.clear_thumbnails)
@@ -1,28 +1,150 @@
 """
 Log Panel Widget for displaying application logs in the UI.
+
+Records are buffered by the handler (from any thread) and flushed to the
+panel in batches on a timer, into a fixed-size ring buffer shown by a list
+view that only paints visible rows. Consecutive repeats of an info/debug
+message (same level and text up to numbers) are collapsed into one row with a
+count.
 """
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QTextEdit, QPushButton, QHBoxLayout, QLabel
+    QWidget, QVBoxLayout, QListView, QPushButton, QHBoxLayout, QLabel, QAbstractItemView
 )
-from PySide6.QtCore import Qt, Signal, Slot, QObject
-from PySide6.QtGui import QTextCursor, QColor
+from PySide6.QtCore import Qt, QTimer, QAbstractListModel, QModelIndex
+from PySide6.QtGui import QColor
+from collections import deque
 import logging
+import re
+import threading
 from datetime import datetime
 
+# Flush interval and how many rows the panel keeps
+LOG_FLUSH_MS = 100
+LOG_MAX_ENTRIES = 2000
+
+# Records buffered between flushes; beyond this the oldest are dropped (and counted)
+LOG_BUFFER_SIZE = 10000
+
+# Repeats at these levels are collapsed into the previous row; warnings and errors always get their own
+COLLAPSE_LEVELS = {"DEBUG", "INFO"}
+
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
 
-class LogHandler(logging.Handler, QObject):
+class LogHandler(logging.Handler):
     """
-    Custom logging handler that emits signals for UI updates.
+    Logging handler that buffers formatted records for the panel to collect.
+    emit() only appends to a bounded deque, so logging from worker threads
+    never waits on the GUI.
     """
-    log_signal = Signal(str, str)  # message, level
-    
-    def __init__(self):
-        logging.Handler.__init__(self)
-        QObject.__init__(self)
-        
+
+    def __init__(self, capacity=LOG_BUFFER_SIZE):
+        super().__init__()
+        self._records = deque(maxlen=capacity)
+        self._buffer_lock = threading.Lock()
+        self.dropped = 0
+
     def emit(self, record):
-        msg = self.format(record)
-        self.log_signal.emit(msg, record.levelname)
+        try:
+            msg = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._buffer_lock:
+            if len(self._records) == self._records.maxlen:
+                self.dropped += 1
+            self._records.append((record.created, record.levelname, msg))
+
+    def take(self):
+        """Returns and clears the buffered (created, level, message) records and the number dropped."""
+        with self._buffer_lock:
+            records = list(self._records)
+            self._records.clear()
+            dropped, self.dropped = self.dropped, 0
+        return records, dropped
+
+
+class LogEntry:
+    __slots__ = ('time', 'level', 'message', 'key', 'count')
+
+    def __init__(self, time, level, message, key):
+        self.time = time
+        self.level = level
+        self.message = message
+        self.key = key
+        self.count = 1
+
+
+class LogModel(QAbstractListModel):
+    """Ring buffer of log entries; the oldest rows are dropped past max_entries."""
+
+    def __init__(self, colors, max_entries=LOG_MAX_ENTRIES, parent=None):
+        super().__init__(parent)
+        self.colors = colors
+        self.max_entries = max_entries
+        self.entries = deque()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.entries):
+            return None
+        entry = self.entries[index.row()]
+        if role == Qt.DisplayRole:
+            timestamp = datetime.fromtimestamp(entry.time).strftime("%H:%M:%S")
+            repeat = f"  (\u00d7{entry.count})" if entry.count > 1 else ""
+            return f"{timestamp}  {entry.message}{repeat}"
+        if role == Qt.ForegroundRole:
+            return QColor(self.colors.get(entry.level, "#A1A1AA"))
+        return None
+
+    def add_records(self, records):
+        """
+        Appends (created, level, message) records. A record matching the row
+        right before it (up to numbers) updates that row's text and count
+        instead, so rows stay in time order.
+        """
+        new_entries = []
+        changed_rows = set()
+        # The previous row: (entry, row), row is None for entries not inserted yet
+        last = (self.entries[-1], len(self.entries) - 1) if self.entries else None
+
+        for created, level, message in records:
+            key = (level, _NUMBER.sub('#', message)) if level in COLLAPSE_LEVELS else None
+            if key is not None and last is not None and last[0].key == key:
+                entry, row = last
+                entry.time, entry.message = created, message
+                entry.count += 1
+                if row is not None:
+                    changed_rows.add(row)
+            else:
+                entry = LogEntry(created, level, message, key)
+                new_entries.append(entry)
+                last = (entry, None)
+
+        # Only the newest max_entries of this batch can survive
+        new_entries = new_entries[-self.max_entries:]
+        overflow = len(self.entries) + len(new_entries) - self.max_entries
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self.entries.popleft()
+            self.endRemoveRows()
+            changed_rows = {row - overflow for row in changed_rows if row >= overflow}
+
+        if changed_rows:
+            self.dataChanged.emit(self.index(min(changed_rows)), self.index(max(changed_rows)), [Qt.DisplayRole])
+        if new_entries:
+            first = len(self.entries)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_entries) - 1)
+            self.entries.extend(new_entries)
+            self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.entries.clear()
+        self.endResetModel()
 
 
 class LogPanel(QWidget):
@@ -41,7 +163,7 @@ class LogPanel(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._expanded = False
-        self._max_lines = 500
+        self.model = LogModel(self.LEVEL_COLORS, LOG_MAX_ENTRIES, self)
         
         self.setObjectName("logPanel")
         
@@ -105,11 +227,14 @@ class LogPanel(QWidget):
         content_layout = QVBoxLayout(self.log_content)
         content_layout.setContentsMargins(0, 0, 0, 0)
         
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setObjectName("logText")
-        self.log_text.setStyleSheet("""
-            QTextEdit#logText {
+        self.log_view = QListView()
+        self.log_view.setObjectName("logText")
+        self.log_view.setModel(self.model)
+        self.log_view.setUniformItemSizes(True)
+        self.log_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.log_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.log_view.setStyleSheet("""
+            QListView#logText {
                 background-color: #0D0D0F;
                 color: #A1A1AA;
                 border: none;
@@ -118,7 +243,7 @@ class LogPanel(QWidget):
                 padding: 8px;
             }
         """)
-        content_layout.addWidget(self.log_text)
+        content_layout.addWidget(self.log_view)
         
         layout.addWidget(self.log_content)
         
@@ -138,45 +263,45 @@ class LogPanel(QWidget):
         self._setup_logging()
         
     def _setup_logging(self):
-        """Install our custom handler on the root logger."""
+        """Install our custom handler on the root logger and start the flush timer."""
         self.log_handler = LogHandler()
         self.log_handler.setFormatter(
             logging.Formatter('[%(levelname)s] %(message)s')
         )
-        self.log_handler.log_signal.connect(self._append_log)
-        
-        # Add to root logger and Application360 logger
+
+        # Add to the root logger; Application360 records reach it by propagation
+        # (a second handler there would show each of them twice)
         logging.getLogger().addHandler(self.log_handler)
-        logging.getLogger("Application360").addHandler(self.log_handler)
-        
-    @Slot(str, str)
-    def _append_log(self, message, level):
-        """Append a log message with appropriate color."""
-        color = self.LEVEL_COLORS.get(level, "#A1A1AA")
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        html = f'<span style="color: #52525B;">{timestamp}</span> <span style="color: {color};">{message}</span><br>'
-        
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        cursor.insertHtml(html)
-        
-        # Auto-scroll to bottom
-        self.log_text.setTextCursor(cursor)
-        self.log_text.ensureCursorVisible()
-        
-        # Limit lines
-        doc = self.log_text.document()
-        if doc.blockCount() > self._max_lines:
-            cursor = QTextCursor(doc.firstBlock())
-            cursor.select(QTextCursor.BlockUnderCursor)
-            cursor.removeSelectedText()
-            cursor.deleteChar()  # Remove newline
-            
+        app_logger = logging.getLogger("Application360")
+        if not app_logger.propagate:
+            app_logger.addHandler(self.log_handler)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(LOG_FLUSH_MS)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start()
+
+    def flush(self):
+        """Moves the records buffered since the last flush into the view."""
+        records, dropped = self.log_handler.take()
+        if dropped:
+            records.insert(0, (records[0][0] if records else datetime.now().timestamp(), "WARNING",
+                               f"[WARNING] {dropped} log messages dropped"))
+        if not records:
+            return
+
+        scrollbar = self.log_view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.model.add_records(records)
+
+        # Follow new messages unless the user scrolled up
+        if at_bottom:
+            self.log_view.scrollToBottom()
+
         # Update title with count if collapsed
         if not self._expanded:
-            self.title_label.setText(f"📋 Logs ({doc.blockCount()})")
-    
+            self.title_label.setText(f"📋 Logs ({self.model.rowCount()})")
+
     def toggle_expanded(self):
         """Toggle the expanded state of the log panel."""
         self._expanded = not self._expanded
@@ -193,9 +318,11 @@ class LogPanel(QWidget):
             
     def clear_logs(self):
         """Clear all logs."""
-        self.log_text.clear()
+        self.log_handler.take()
+        self.model.clear()
         self.title_label.setText("📋 Logs")
         
     def log(self, message, level="INFO"):
-        """Manually add a log message."""
-        self._append_log(f"[{level}] {message}", level)
+        """Manually add a log message (shown on the next flush)."""
+        self.log_handler.emit(logging.makeLogRecord({'msg': message, 'levelname': level,
+                                                     'levelno': logging.getLevelName(level)}))
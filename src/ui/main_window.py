@@ -8,7 +8,7 @@ from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QGroupBox, QLabel, QSpinBox,
     QComboBox, QFileDialog, QProgressBar, QMessageBox,
-    QDoubleSpinBox, QListWidget, QListWidgetItem, QAbstractItemView,
+    QDoubleSpinBox,
     QCheckBox, QSplitter, QScrollArea, QMenu, QStackedWidget,
     QLineEdit, QFrame, QSizePolicy
 )
@@ -20,16 +20,19 @@ import platform
 from ui.widgets import DropZone
 from ui.preview_widget import PreviewWidget
 from ui.sidebar import Sidebar
-from ui.video_card import VideoCard
+from ui.job_queue import JobQueueModel, JobQueueView
+from ui.ingest_worker import IngestWorker
 from ui.toggle_switch import ToggleSwitch, ToggleSwitchWithDescription
 from ui.collapsible_section import CollapsibleSection
 from ui.log_panel import LogPanel
 from ui.icons import get_icon
 from core.processor import ProcessingWorker
 from core.analyzer import BlurAnalysisWorker
+from core.progress import STAGE_EXTRACTING, format_eta
 from core.job import Job
 from core.settings_manager import SettingsManager
 from core.version import APP_NAME, VERSION
+from utils.file_manager import FileManager
 
 
 class ScrollBlocker(QObject):
@@ -53,8 +56,12 @@ class MainWindow(QMainWindow):
         self.default_settings = {}
         self.custom_output_dir = ""
         self.is_processing = False
-        self._video_cards = []
-        self._selected_cards = []  # Changed to list for multi-selection
+        self.queue_model = JobQueueModel(self.jobs)
+        self._ingest_runs = []      # (QThread, IngestWorker) since the last time all runs finished
+        self._ingest_active = 0
+        self._ingest_pending = []   # probed jobs held back while processing
+        self._ingest_rejected = []
+        self.last_profile = None    # StageProfiler of the last run, if stage profiling was on
 
         # Scroll Blocker
         self.scroll_blocker = ScrollBlocker(self)
@@ -231,21 +238,13 @@ class MainWindow(QMainWindow):
         self.drop_zone.setMinimumHeight(100)
         layout.addWidget(self.drop_zone)
         
-        # Queue container with scroll
-        queue_scroll = QScrollArea()
-        queue_scroll.setWidgetResizable(True)
-        queue_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        queue_scroll.setStyleSheet("QScrollArea { border: none; background: transparent; }")
-        
-        self.queue_container = QWidget()
-        self.queue_container.setObjectName("queueContainer")
-        self.queue_layout = QVBoxLayout(self.queue_container)
-        self.queue_layout.setContentsMargins(0, 0, 4, 0) # Small right margin for scrollbar
-        self.queue_layout.setSpacing(8)
-        self.queue_layout.addStretch()
-        
-        queue_scroll.setWidget(self.queue_container)
-        layout.addWidget(queue_scroll, 1)
+        # Queue list: only visible rows are painted (Ctrl/Shift+click for multi-selection)
+        self.queue_view = JobQueueView()
+        self.queue_view.setObjectName("queueContainer")
+        self.queue_view.setModel(self.queue_model)
+        self.queue_view.selectionModel().selectionChanged.connect(self.on_queue_selection_changed)
+        self.queue_view.delegate.remove_requested.connect(self.remove_job_rows)
+        layout.addWidget(self.queue_view, 1)
         
         # Queue controls
         controls = QHBoxLayout()
@@ -384,7 +383,7 @@ class MainWindow(QMainWindow):
         interval_row.addWidget(self.interval_spin)
         
         self.interval_unit = QComboBox()
-        self.interval_unit.addItems(["Seconds", "Frames"])
+        self.interval_unit.addItems(["Seconds", "Frames", "Meters"])
         self.interval_unit.setFixedWidth(100)
         self.interval_unit.currentTextChanged.connect(self.on_setting_changed)
         self.interval_unit.installEventFilter(self.scroll_blocker)
@@ -650,6 +649,25 @@ class MainWindow(QMainWindow):
         self.telemetry_toggle.toggled.connect(self.on_setting_changed)
         exp_section.addWidget(self.telemetry_toggle)
         
+        # Pose Priors
+        pose_row = QHBoxLayout()
+        pose_row.addWidget(QLabel("Pose Priors"))
+        pose_row.addStretch()
+        self.pose_priors_combo = QComboBox()
+        self.pose_priors_combo.addItem("None", "none")
+        self.pose_priors_combo.addItem("COLMAP", "colmap")
+        self.pose_priors_combo.addItem("RealityScan XMP", "realityscan")
+        self.pose_priors_combo.setFixedWidth(160)
+        self.pose_priors_combo.currentIndexChanged.connect(self.on_setting_changed)
+        self.pose_priors_combo.installEventFilter(self.scroll_blocker)
+        pose_row.addWidget(self.pose_priors_combo)
+        exp_section.addLayout(pose_row)
+        
+        # Stage Profiling
+        self.profile_toggle = ToggleSwitchWithDescription("Profile Stages", "Time each pipeline stage")
+        self.profile_toggle.toggled.connect(self.on_setting_changed)
+        exp_section.addWidget(self.profile_toggle)
+        
         content_layout.addWidget(exp_section)
         content_layout.addStretch()
         
@@ -751,6 +769,8 @@ class MainWindow(QMainWindow):
             'layout_mode': self.layout_combo.currentData(),
             'pitch_offset': self.pitch_combo.currentData(),
             'export_telemetry': self.telemetry_toggle.isChecked(),
+            'pose_priors': self.pose_priors_combo.currentData(),
+            'profile_stages': self.profile_toggle.isChecked(),
             'ai_mode': self.ai_combo.currentText(),
             'adaptive_mode': self.adaptive_toggle.isChecked(),
             'adaptive_threshold': self.motion_threshold_spin.value(),
@@ -771,7 +791,7 @@ class MainWindow(QMainWindow):
             self.res_spin, self.fov_spin, self.cam_count_spin,
             self.layout_combo, self.pitch_combo, self.ai_combo,
             self.blur_threshold_spin, self.sharpen_slider,
-            self.motion_threshold_spin, self.naming_mode_combo,
+            self.motion_threshold_spin, self.naming_mode_combo, self.pose_priors_combo,
             self.image_pattern_input, self.mask_pattern_input
         ]
         for w in widgets:
@@ -816,6 +836,10 @@ class MainWindow(QMainWindow):
         self.motion_threshold_spin.setEnabled(self.adaptive_toggle.isChecked())
         
         self.telemetry_toggle.setChecked(settings.get('export_telemetry', False))
+        idx = self.pose_priors_combo.findData(settings.get('pose_priors', 'none'))
+        if idx >= 0:
+            self.pose_priors_combo.setCurrentIndex(idx)
+        self.profile_toggle.setChecked(settings.get('profile_stages', False))
         
         naming_mode = settings.get('naming_mode', 'realityscan')
         idx = self.naming_mode_combo.findData(naming_mode)
@@ -838,11 +862,12 @@ class MainWindow(QMainWindow):
             
         current_settings = self.get_settings_from_ui()
         
-        if self._selected_cards:
-            # Apply settings to all selected cards
-            for card in self._selected_cards:
-                card.job.settings = current_settings
-                card.refresh()
+        selected_jobs = self.selected_jobs()
+        if selected_jobs:
+            # Apply settings to all selected jobs
+            for job in selected_jobs:
+                job.settings = current_settings
+                self.queue_model.refresh_job(job)
         else:
             self.default_settings = current_settings
             for key, value in current_settings.items():
@@ -900,16 +925,70 @@ class MainWindow(QMainWindow):
     # =========================================================================
 
     def handle_files_dropped(self, files):
-        valid_extensions = ['.mp4', '.mov', '.mkv', '.avi']
-        valid_files = [f for f in files if os.path.splitext(f)[1].lower() in valid_extensions]
-        
+        # Folders are searched recursively; files are probed in the background before they're queued
+        candidates = []
+        for path in files:
+            candidates.extend(FileManager.find_videos(path) if os.path.isdir(path) else [path])
+        valid_files = [f for f in candidates if f.lower().endswith(FileManager.VIDEO_EXTENSIONS)]
+
         if valid_files:
-            for f in valid_files:
-                self.add_job(f)
-            self.process_btn.setEnabled(True)
+            self.start_ingest(valid_files)
         else:
             QMessageBox.warning(self, "Invalid Files", "Please drop video files (.mp4, .mov, .mkv, .avi)")
 
+    def start_ingest(self, file_paths):
+        thread = QThread()
+        worker = IngestWorker(file_paths)
+        worker.moveToThread(thread)
+        # Owned by _ingest_runs (no deleteLater): stopped and released once every run is done
+        self._ingest_runs.append((thread, worker))
+        self._ingest_active += 1
+        self.status_label.setText(f"Checking {len(file_paths)} video(s)...")
+
+        thread.started.connect(worker.run)
+        worker.accepted.connect(self.on_ingest_accepted)
+        worker.rejected.connect(self.on_ingest_rejected)
+        worker.finished.connect(self.on_ingest_finished)
+
+        thread.start()
+
+    def on_ingest_accepted(self, infos):
+        jobs = [Job(file_path=info.path, settings=copy.deepcopy(self.default_settings), info=info)
+                for info in infos]
+        if self.is_processing:
+            # The running worker iterates self.jobs; queue these once it's done
+            self._ingest_pending.extend(jobs)
+            return
+        self.queue_model.add_jobs(jobs)
+        self.process_btn.setEnabled(True)
+
+    def on_ingest_rejected(self, path, reason):
+        self._ingest_rejected.append(f"{os.path.basename(path)}: {reason}")
+
+    def on_ingest_finished(self, accepted, rejected):
+        self._ingest_active -= 1
+        if self._ingest_active:
+            return
+        for thread, _ in self._ingest_runs:
+            thread.quit()
+            thread.wait()
+        self._ingest_runs = []
+        if not self.is_processing:
+            self.status_label.setText("Ready")
+        if self._ingest_rejected:
+            shown = self._ingest_rejected[:10]
+            more = len(self._ingest_rejected) - len(shown)
+            details = "\n".join(shown) + (f"\n... and {more} more" if more else "")
+            self._ingest_rejected = []
+            QMessageBox.warning(self, "Skipped Files",
+                                f"These files can't be processed and were not queued:\n\n{details}")
+
+    def flush_pending_ingest(self):
+        if self._ingest_pending:
+            self.queue_model.add_jobs(self._ingest_pending)
+            self._ingest_pending = []
+            self.process_btn.setEnabled(True)
+
     def open_file_dialog(self):
         files, _ = QFileDialog.getOpenFileNames(
             self, "Select 360° Videos", "", "Video Files (*.mp4 *.mov *.mkv *.avi)"
@@ -918,85 +997,56 @@ class MainWindow(QMainWindow):
             self.handle_files_dropped(files)
 
     def add_job(self, file_path):
-        job = Job(file_path=file_path, settings=copy.deepcopy(self.default_settings))
-        self.jobs.append(job)
-        
-        # Create video card
-        card = VideoCard(job)
-        card.clicked.connect(lambda c=card: self.on_card_clicked(c))
-        card.ctrl_clicked.connect(lambda c=card: self.on_card_ctrl_clicked(c))
-        card.remove_clicked.connect(lambda c=card: self.remove_job_by_card(c))
-        
-        # Insert before stretch
-        self.queue_layout.insertWidget(self.queue_layout.count() - 1, card)
-        self._video_cards.append(card)
-
-    def on_card_clicked(self, card):
-        """Single click: select only this card, deselect others."""
-        # Deselect all previous
-        for c in self._selected_cards:
-            c.setSelected(False)
-        self._selected_cards.clear()
-        
-        # Select new
-        card.setSelected(True)
-        self._selected_cards.append(card)
-        
-        # Update settings UI from this card
-        self.set_ui_from_settings(card.job.settings)
-        self.update_preview_display()
-        
-    def on_card_ctrl_clicked(self, card):
-        """Ctrl+click: toggle selection without deselecting others."""
-        if card in self._selected_cards:
-            # Deselect this card
-            card.setSelected(False)
-            self._selected_cards.remove(card)
-        else:
-            # Add to selection
-            card.setSelected(True)
-            self._selected_cards.append(card)
-        
-        # Update preview to last selected
-        if self._selected_cards:
-            self.set_ui_from_settings(self._selected_cards[-1].job.settings)
+        self.add_jobs([file_path])
+
+    def add_jobs(self, file_paths):
+        """Queues files as-is, without probing (see start_ingest)."""
+        jobs = [Job(file_path=f, settings=copy.deepcopy(self.default_settings)) for f in file_paths]
+        self.queue_model.add_jobs(jobs)
+
+    def selected_rows(self):
+        return sorted(index.row() for index in self.queue_view.selectionModel().selectedRows())
+
+    def selected_jobs(self):
+        return [self.queue_model.job_at(row) for row in self.selected_rows()]
+
+    def current_job(self):
+        """The most recently selected job (drives the settings UI and preview), or None."""
+        selection = self.queue_view.selectionModel()
+        current = selection.currentIndex()
+        if current.isValid() and selection.isSelected(current):
+            return self.queue_model.job_at(current.row())
+        rows = self.selected_rows()
+        return self.queue_model.job_at(rows[-1]) if rows else None
+
+    def on_queue_selection_changed(self, selected, deselected):
+        job = self.current_job()
+        self.set_ui_from_settings(job.settings if job else self.default_settings)
         self.update_preview_display()
 
-    def remove_job_by_card(self, card):
-        if card in self._video_cards:
-            idx = self._video_cards.index(card)
-            self._video_cards.remove(card)
-            self.jobs.pop(idx)
-            card.deleteLater()
-            
-            if card in self._selected_cards:
-                self._selected_cards.remove(card)
-                if not self._selected_cards:
-                    self.set_ui_from_settings(self.default_settings)
-                self.update_preview_display()
-            
-            if not self.jobs:
-                self.process_btn.setEnabled(False)
+    def remove_job_rows(self, rows):
+        if self.is_processing:
+            return
+        if isinstance(rows, int):
+            rows = [rows]
+        self.queue_model.remove_rows(rows)
+        if not self.jobs:
+            self.process_btn.setEnabled(False)
 
     def remove_selected_jobs(self):
         """Remove all selected jobs."""
-        for card in self._selected_cards[:]:  # Copy list to avoid modification during iteration
-            self.remove_job_by_card(card)
+        self.remove_job_rows(self.selected_rows())
 
     def clear_queue(self):
-        for card in self._video_cards[:]:
-            card.deleteLater()
-        self._video_cards.clear()
-        self.jobs.clear()
-        self._selected_cards.clear()
+        self.queue_model.clear()
         self.process_btn.setEnabled(False)
         self.set_ui_from_settings(self.default_settings)
         self.update_preview_display()
 
     def update_preview_display(self):
-        if self._selected_cards:
-            # Show preview for the last selected card
-            job = self._selected_cards[-1].job
+        job = self.current_job()
+        if job:
+            # Show preview for the last selected job
             self.preview_widget.update_preview(job.file_path, self.get_settings_from_ui())
         else:
             self.preview_widget.update_preview(None, None)
@@ -1013,8 +1063,8 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(0)
         self.status_label.setText("Initializing...")
         
-        for card in self._video_cards:
-            card.update_status("Pending")
+        self.queue_model.reset_status("Pending")
+        self.last_profile = None
         
         self.thread = QThread()
         self.worker = ProcessingWorker(self.jobs)
@@ -1023,9 +1073,10 @@ class MainWindow(QMainWindow):
         self.thread.started.connect(self.worker.run)
         self.worker.job_started.connect(self.on_job_started)
         self.worker.job_finished.connect(self.on_job_finished)
-        self.worker.progress_updated.connect(self.update_progress)
+        self.worker.progress.connect(self.update_progress)
         self.worker.finished.connect(self.processing_finished)
         self.worker.error_occurred.connect(self.processing_error)
+        self.worker.profile_ready.connect(self.on_profile_ready)
         
         self.worker.finished.connect(self.thread.quit)
         self.worker.finished.connect(self.worker.deleteLater)
@@ -1052,29 +1103,39 @@ class MainWindow(QMainWindow):
             self.process_btn.setText("Processing...")
         else:
             self.process_btn.setText("▶  Start Processing")
+            self.flush_pending_ingest()
 
     def on_job_started(self, index):
-        if 0 <= index < len(self._video_cards):
-            self._video_cards[index].update_status("Processing")
+        self.queue_model.set_status(index, "Processing")
 
     def on_job_finished(self, index):
-        if 0 <= index < len(self._video_cards):
-            self._video_cards[index].update_status("Done")
+        self.queue_model.set_status(index, "Done")
 
-    def update_progress(self, value, message):
-        self.progress_bar.setValue(value)
-        self.status_label.setText(message.split(" - ")[0] if " - " in message else message)
-        
-        # Update current job progress
-        for i, card in enumerate(self._video_cards):
-            if card.job.status == "Processing":
-                card.set_progress(value)
+    def update_progress(self, event):
+        """Consumes the worker's ProgressEvents (at most ~10 per second)."""
+        self.progress_bar.setValue(event.percent)
+        if event.stage == STAGE_EXTRACTING:
+            self.status_label.setText(f"{event.filename} - ETA {format_eta(event.eta)}")
+            self.status_label.setToolTip(event.describe() + f" - {event.views_written} views")
+        else:
+            self.status_label.setText(event.describe())
+
+        # Update current job progress (repaints only its row)
+        self.queue_model.set_progress(event.job_index, event.percent)
+
+    def on_profile_ready(self, profiler):
+        self.last_profile = profiler
 
     def processing_finished(self):
         self.toggle_processing_state(False)
         self.progress_bar.setValue(100)
         self.status_label.setText("Complete!")
-        QMessageBox.information(self, "Success", "Batch processing completed successfully.")
+        box = QMessageBox(QMessageBox.Information, "Success", "Batch processing completed successfully.",
+                          QMessageBox.Ok, self)
+        if self.last_profile is not None:
+            # Stage timings under "Show Details..."
+            box.setDetailedText(self.last_profile.format_table())
+        box.exec()
 
     def processing_error(self, message):
         self.toggle_processing_state(False)
@@ -1088,12 +1149,12 @@ class MainWindow(QMainWindow):
     # =========================================================================
 
     def analyze_blur(self):
-        if not self._selected_cards:
+        job = self.current_job()
+        if job is None:
             QMessageBox.warning(self, "Selection Required", "Please select a video to analyze.")
             return
         
-        # Analyze the last selected card
-        job = self._selected_cards[-1].job
+        # Analyze the last selected job
         self.status_label.setText(f"Analyzing {job.filename}...")
         self.btn_analyze.setEnabled(False)
         self.btn_analyze.setText("Analyzing...")
@@ -1140,5 +1201,9 @@ class MainWindow(QMainWindow):
     # =========================================================================
 
     def closeEvent(self, event):
+        for thread, worker in self._ingest_runs:
+            worker.stop()
+            thread.quit()
+            thread.wait()
         self.settings_manager.save_settings()
         super().closeEvent(event)
\ No newline at end of file
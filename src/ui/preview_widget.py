@@ -1,110 +1,177 @@
 import cv2
 import numpy as np
-from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QSizePolicy
-from PySide6.QtCore import Qt, QRunnable, QThreadPool, QObject, Signal, Slot
+from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton, QSlider, QSizePolicy
+from PySide6.QtCore import Qt, QRunnable, QThreadPool, QObject, QTimer, Signal, Slot
 from PySide6.QtGui import QImage, QPixmap
 
+from core.contact_sheet import CONTACT_SHEET_SOURCE_WIDTH, compose_contact_sheet, render_tiles, select_views
 from core.geometry import GeometryProcessor
+from core.preview_cache import PreviewCache, PREVIEW_STAGES
 from utils.image_utils import ImageUtils
 
+# Rapid setting changes (slider drags) are coalesced into one render after this delay
+PREVIEW_DEBOUNCE_MS = 40
+
+def to_qimage(image):
+    """Converts a BGR frame to an RGB QImage that owns its pixels."""
+    # cv2 is BGR, QImage needs RGB
+    rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    h, w, ch = rgb_image.shape
+    qt_image = QImage(rgb_image.data, w, h, ch * w, QImage.Format_RGB888)
+    # Explicit copy to ensure data persists after the numpy buffer is freed
+    return qt_image.copy()
+
+def format_time(seconds):
+    minutes, seconds = divmod(max(0.0, seconds), 60)
+    return f"{int(minutes)}:{seconds:04.1f}"
+
 class WorkerSignals(QObject):
     """
     Defines the signals available from a running worker thread.
+    Every signal carries the generation of the request that produced it.
     """
-    result = Signal(QImage)
-    blur_score = Signal(float)
-    error = Signal(str)
+    result = Signal(int, QImage, bool)  # generation, image, final
+    blur_score = Signal(int, float)
+    error = Signal(int, str)
+    video_info = Signal(int, int, float)  # generation, frame count, fps
+    finished = Signal(int)
 
 class PreviewWorker(QRunnable):
     """
     Worker thread for generating the preview image.
+
+    is_cancelled is polled between the expensive stages; once a newer request
+    has been made the worker stops without emitting a result.
     """
-    def __init__(self, video_path, settings):
+    def __init__(self, video_path, settings, cache, generation=0, is_cancelled=None, grid=False,
+                 frame_index=0, prefetch=()):
         super().__init__()
         self.video_path = video_path
         self.settings = settings
+        self.cache = cache
+        self.grid = grid
+        self.frame_index = frame_index
+        self.prefetch = prefetch
+        self.generation = generation
+        self.is_cancelled = is_cancelled or (lambda: False)
         self.signals = WorkerSignals()
 
     @Slot()
     def run(self):
         try:
-            cap = cv2.VideoCapture(self.video_path)
-            if not cap.isOpened():
-                self.signals.error.emit(f"Could not open video: {self.video_path}")
-                return
+            self.render()
+        except Exception as e:
+            self.signals.error.emit(self.generation, str(e))
+        finally:
+            self.signals.finished.emit(self.generation)
+
+    def render(self):
+        if self.is_cancelled():
+            return
+
+        if not self.render_frame():
+            return
+
+        # Decode the neighbouring timeline positions while the user is scrubbing
+        self.cache.prefetch(self.video_path, self.prefetch, is_cancelled=self.is_cancelled)
+
+    def render_frame(self):
+        """Renders the requested frame. Returns True once the final image was emitted."""
+
+        fov = self.settings.get('fov', 90)
+        pitch_offset = self.settings.get('pitch_offset', 0)
+        cam_count = self.settings.get('camera_count', 6)
+        layout_mode = self.settings.get('layout_mode', 'ring')
+        
+        sharpen_enabled = self.settings.get('sharpening_enabled', False)
+        sharpen_strength = self.settings.get('sharpening_strength', 0.5)
 
-            # Read first frame (or frame at timestamp 0)
-            ret, frame = cap.read()
-            cap.release()
+        views = GeometryProcessor.generate_views(cam_count, pitch_offset, layout_mode)
+        if self.grid:
+            views = select_views(views, self.settings.get('active_cameras'))
+        if not views:
+             self.signals.error.emit(self.generation, "No views generated")
+             return
 
-            if not ret:
-                self.signals.error.emit("Could not read frame from video")
+        seeker = self.cache.seeker_for(self.video_path)
+        if seeker.open():
+            self.signals.video_info.emit(self.generation, seeker.frame_count, seeker.fps)
+
+        if self.grid:
+            return self.render_grid(views, fov, sharpen_strength if sharpen_enabled else None)
+        
+        # Use the first view for preview to show perspective/pitch changes
+        # view format: (name, yaw, pitch, roll)
+        name, yaw, pitch, roll = views[0]
+
+        # Progressive refinement: a coarse pass from a heavily downscaled frame
+        # shows up immediately, then the full-size pass replaces it. The coarse
+        # pass is skipped when the full-size source and maps are already cached.
+        dest_size, source_width = PREVIEW_STAGES[-1]
+        stages = PREVIEW_STAGES
+        cached = self.cache.peek_frame(self.video_path, self.frame_index, source_width)
+        if cached is not None and self.cache.has_maps(*cached.shape[:2], dest_size, dest_size, fov, yaw, pitch, roll):
+            stages = PREVIEW_STAGES[-1:]
+
+        # Decoded, downscaled source frames are cached per video, so a settings
+        # change only costs the remaps below. On a miss the frame is decoded
+        # once and each stage's source is resized straight from it, smallest
+        # first, so the coarse pass doesn't wait for the full-size source.
+        sources = self.cache.iter_frames(self.video_path, self.frame_index,
+                                         [width for _, width in stages])
+
+        for dest_size, _ in stages:
+            if self.is_cancelled():
                 return
+            final = dest_size == PREVIEW_STAGES[-1][0]
 
-            # Downscale source frame for performance if it's very large
-            # We only need enough resolution for a ~512px preview
-            h, w = frame.shape[:2]
-            if w > 2048:
-                new_w = 2048
-                new_h = int(h * (new_w / w))
-                frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
-                h, w = new_h, new_w
-
-            # Preview settings
-            # We generate a fixed size preview map
-            dest_w = 512
-            dest_h = 512
-            fov = self.settings.get('fov', 90)
-            pitch_offset = self.settings.get('pitch_offset', 0)
-            cam_count = self.settings.get('camera_count', 6)
-            
-            sharpen_enabled = self.settings.get('sharpening_enabled', False)
-            sharpen_strength = self.settings.get('sharpening_strength', 0.5)
-
-            # Get the first view configuration
-            views = GeometryProcessor.generate_views(cam_count, pitch_offset)
-            if not views:
-                 self.signals.error.emit("No views generated")
-                 return
-            
-            # Use the first view for preview to show perspective/pitch changes
-            # view format: (name, yaw, pitch, roll)
-            name, yaw, pitch, roll = views[0]
-
-            # Generate maps
-            map_x, map_y = GeometryProcessor.create_rectilinear_map(
-                src_h=h, src_w=w,
-                dest_h=dest_h, dest_w=dest_w,
-                fov_deg=fov,
-                yaw_deg=yaw,
-                pitch_deg=pitch,
-                roll_deg=roll
-            )
+            source = next(sources)
+            if source is None:
+                self.signals.error.emit(self.generation, f"Could not read frame from video: {self.video_path}")
+                return
+            src_h, src_w = source.shape[:2]
+
+            # Maps are cached per view geometry
+            map_x, map_y = self.cache.get_maps(src_h, src_w, dest_size, dest_size, fov, yaw, pitch, roll)
+            if self.is_cancelled():
+                return
 
             # Remap
-            remapped = cv2.remap(frame, map_x, map_y, cv2.INTER_LINEAR)
+            remapped = cv2.remap(source, map_x, map_y, cv2.INTER_LINEAR)
 
             # Apply Sharpening if enabled
             if sharpen_enabled:
-                gaussian = cv2.GaussianBlur(remapped, (0, 0), 2.0)
+                gaussian = cv2.GaussianBlur(remapped, (0, 0), 2.0 * dest_size / PREVIEW_STAGES[-1][0])
                 remapped = cv2.addWeighted(remapped, 1.0 + sharpen_strength, gaussian, -sharpen_strength, 0)
 
-            # Calculate blur score
-            blur_score = ImageUtils.calculate_blur_score(remapped)
-            self.signals.blur_score.emit(blur_score)
+            # Blur score is only meaningful at full size
+            if final:
+                blur_score = ImageUtils.calculate_blur_score(remapped)
+                self.signals.blur_score.emit(self.generation, blur_score)
 
-            # Convert to QImage
-            # cv2 is BGR, QImage needs RGB
-            rgb_image = cv2.cvtColor(remapped, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-            
-            # Explicit copy to ensure data persists after worker finishes
-            self.signals.result.emit(qt_image.copy())
+            self.signals.result.emit(self.generation, to_qimage(remapped), final)
 
-        except Exception as e:
-            self.signals.error.emit(str(e))
+        return True
+
+    def render_grid(self, views, fov, sharpen_strength):
+        """Renders every view of the frame as a tile of one contact sheet."""
+        if self.is_cancelled():
+            return
+        frame = self.cache.get_frame(self.video_path, self.frame_index, CONTACT_SHEET_SOURCE_WIDTH)
+        if frame is None:
+            self.signals.error.emit(self.generation, f"Could not read frame from video: {self.video_path}")
+            return
+        frame_id = self.cache.frame_key(self.video_path, self.frame_index, CONTACT_SHEET_SOURCE_WIDTH)
+
+        tiles = render_tiles(self.cache, frame, frame_id, views, fov,
+                             sharpen_strength=sharpen_strength, is_cancelled=self.is_cancelled)
+        if tiles is None or self.is_cancelled():
+            return
+
+        # Report the weakest view: it decides whether the layout is usable
+        self.signals.blur_score.emit(self.generation, min(score for _, _, score in tiles))
+        self.signals.result.emit(self.generation, to_qimage(compose_contact_sheet(tiles)), True)
+        return True
 
 class PreviewWidget(QWidget):
     def __init__(self, parent=None):
@@ -125,6 +192,21 @@ class PreviewWidget(QWidget):
         self.label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
         
         self.layout.addWidget(self.label)
+
+        # Timeline: frames are read by seeking to the nearest keyframe and
+        # decoding forward; neighbouring positions are prefetched while scrubbing
+        self.timeline = QSlider(Qt.Horizontal)
+        self.timeline.setRange(0, 0)
+        self.timeline.setEnabled(False)
+        self.timeline.valueChanged.connect(self.on_timeline_changed)
+        self.time_label = QLabel(format_time(0.0))
+        self.time_label.setStyleSheet("color: #A1A1AA; font-size: 12px;")
+
+        timeline_row = QHBoxLayout()
+        timeline_row.setContentsMargins(4, 6, 4, 0)
+        timeline_row.addWidget(self.timeline, 1)
+        timeline_row.addWidget(self.time_label)
+        self.layout.addLayout(timeline_row)
         
         self.score_label = QLabel("Blur Score: —")
         self.score_label.setAlignment(Qt.AlignCenter)
@@ -134,33 +216,154 @@ class PreviewWidget(QWidget):
             font-size: 12px;
             padding: 8px;
         """)
-        self.layout.addWidget(self.score_label)
+
+        # Single view / contact sheet of all active views
+        self.grid_button = QPushButton("Grid")
+        self.grid_button.setProperty("secondary", True)
+        self.grid_button.setCheckable(True)
+        self.grid_button.setToolTip("Show every active view as a contact sheet")
+        self.grid_button.toggled.connect(self.set_grid_mode)
+
+        footer = QHBoxLayout()
+        footer.addWidget(self.score_label, 1)
+        footer.addWidget(self.grid_button)
+        self.layout.addLayout(footer)
         
         self.threadpool = QThreadPool()
+        self.cache = PreviewCache()
+        self.current_video = None
+        self.current_settings = None
+        self.grid_mode = False
+        self.image = None
+        self.frame_index = 0
+        self.scrub_step = 0
+        self.fps = 0.0
+
+        # Latest-only rendering: each request bumps the generation (cancelling
+        # older workers), waits out the debounce, and at most one worker runs at
+        # a time. A request made while one is running replaces any queued one.
+        self.generation = 0
+        self.pending_request = None
+        self.worker_running = False
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(PREVIEW_DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.start_pending_request)
         
     def update_preview(self, video_path, settings):
         """
-        Starts a background worker to update the preview image.
+        Schedules a preview update. Rapid calls are coalesced and only the
+        newest request is rendered.
         """
+        self.generation += 1
+
         if not video_path:
+            self.pending_request = None
+            self.debounce_timer.stop()
             self.label.setText("No Video Selected")
             self.label.setPixmap(QPixmap())
+            self.current_video = None
+            self.image = None
+            self.reset_timeline()
             return
             
-        self.label.setText("Loading preview...")
-        
-        # In a real scenario, we might want to cancel pending workers 
-        # if the user slides rapidly, but for now we rely on the thread pool.
-        worker = PreviewWorker(video_path, settings)
+        # Keep the current image while re-rendering the same video; a cache hit
+        # replaces it almost immediately
+        if video_path != self.current_video:
+            self.label.setText("Loading preview...")
+            self.image = None
+            self.reset_timeline()
+        self.current_video = video_path
+        self.current_settings = dict(settings)
+
+        self.pending_request = (self.generation, video_path, self.current_settings, self.grid_mode,
+                                self.frame_index, self.prefetch_positions())
+        self.debounce_timer.start()
+
+    def reset_timeline(self):
+        self.frame_index = 0
+        self.scrub_step = 0
+        self.fps = 0.0
+        self.timeline.blockSignals(True)
+        self.timeline.setRange(0, 0)
+        self.timeline.setValue(0)
+        self.timeline.blockSignals(False)
+        self.timeline.setEnabled(False)
+        self.time_label.setText(format_time(0.0))
+
+    def prefetch_positions(self):
+        """The next two positions in the direction the user is scrubbing."""
+        if not self.scrub_step:
+            return ()
+        last = self.timeline.maximum()
+        positions = (self.frame_index + self.scrub_step, self.frame_index + 2 * self.scrub_step)
+        return tuple(p for p in positions if 0 <= p <= last)
+
+    def on_timeline_changed(self, value):
+        self.scrub_step = value - self.frame_index
+        self.frame_index = value
+        self.time_label.setText(format_time(value / self.fps if self.fps else 0.0))
+        if self.current_video:
+            self.update_preview(self.current_video, self.current_settings)
+
+    def set_video_info(self, generation, frame_count, fps):
+        if self.is_stale(generation):
+            return
+        self.fps = fps
+        self.timeline.blockSignals(True)
+        self.timeline.setRange(0, max(0, frame_count - 1))
+        self.timeline.setPageStep(max(1, int(round(fps))))
+        self.timeline.blockSignals(False)
+        self.timeline.setEnabled(frame_count > 1)
+        self.time_label.setText(format_time(self.frame_index / fps if fps else 0.0))
+
+    def set_grid_mode(self, enabled):
+        """Switches between the first view and the contact sheet, re-rendering the current video."""
+        self.grid_mode = enabled
+        if self.current_video:
+            self.update_preview(self.current_video, self.current_settings)
+
+    def is_stale(self, generation):
+        return generation != self.generation
+
+    def start_pending_request(self):
+        if self.worker_running or self.pending_request is None:
+            return
+
+        generation, video_path, settings, grid, frame_index, prefetch = self.pending_request
+        self.pending_request = None
+
+        worker = PreviewWorker(video_path, settings, self.cache, generation,
+                               is_cancelled=lambda: self.is_stale(generation), grid=grid,
+                               frame_index=frame_index, prefetch=prefetch)
         worker.signals.result.connect(self.display_image)
+        worker.signals.video_info.connect(self.set_video_info)
         worker.signals.blur_score.connect(self.display_blur_score)
         worker.signals.error.connect(self.display_error)
+        worker.signals.finished.connect(self.on_worker_finished)
+        self.worker_running = True
         self.threadpool.start(worker)
+
+    def on_worker_finished(self, generation):
+        self.worker_running = False
+        if not self.debounce_timer.isActive():
+            self.start_pending_request()
         
-    def display_blur_score(self, score):
-        self.score_label.setText(f"Blur Score: {score:.1f}")
+    def display_blur_score(self, generation, score):
+        if self.is_stale(generation):
+            return
+        prefix = "Lowest Blur Score" if self.grid_mode else "Blur Score"
+        self.score_label.setText(f"{prefix}: {score:.1f}")
 
-    def display_image(self, image):
+    def display_image(self, generation, image, final=True):
+        if self.is_stale(generation):
+            return
+        # Keep the unscaled image so resizes can rescale it without a new worker.
+        # The coarse pass is kept only until the full-size one arrives.
+        self.image = image
+        self.show_image(image)
+
+    def show_image(self, image):
         # Scale pixmap to fit label while keeping aspect ratio
         pixmap = QPixmap.fromImage(image)
         # We scale to the label's current size
@@ -171,16 +374,15 @@ class PreviewWidget(QWidget):
              self.label.setPixmap(QPixmap())
         self.label.setText("")
 
-    def display_error(self, error):
+    def display_error(self, generation, error):
+        if self.is_stale(generation):
+            return
+        self.image = None
         self.label.setText(f"Preview Error:\n{error}")
         self.label.setPixmap(QPixmap())
         
     def resizeEvent(self, event):
-        # If the label has a pixmap, we should re-scale it to fit the new size
-        if self.label.pixmap() and not self.label.pixmap().isNull():
-             # Note: This is a simplification. For best results, we should store the original high-res QImage
-             # and re-scale that. But here we rely on the worker to send a new image or just let it scale.
-             # Ideally, we would trigger a re-display of the cached original image if we had it.
-             # For now, just ensuring layout updates.
-             pass
-        super().resizeEvent(event)
\ No newline at end of file
+        super().resizeEvent(event)
+        # Re-scale the stored unscaled image to the new label size
+        if self.image is not None:
+            self.show_image(self.image)
\ No newline at end of file
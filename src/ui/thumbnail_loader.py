@@ -0,0 +1,131 @@
+"""
+Shared background loader for video thumbnails.
+"""
+import logging
+from collections import OrderedDict
+
+import cv2
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage
+
+from core.thumbnail_cache import ThumbnailCache, THUMBNAIL_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Decoding the first frame of an 8K video is heavy; a couple at a time keeps the UI responsive
+THUMBNAIL_WORKERS = 2
+
+PRIORITY_VISIBLE = 1
+PRIORITY_BACKGROUND = 0
+
+# Loaded thumbnails kept in memory (80x80 RGB, ~19 KB each); older ones reload from the disk cache
+MAX_IMAGES = 500
+
+
+class ThumbnailSignals(QObject):
+    finished = Signal(str, QImage)  # video path, thumbnail (null on failure)
+
+
+class ThumbnailTask(QRunnable):
+    """Loads one thumbnail from the disk cache, or decodes and caches it."""
+
+    def __init__(self, video_path, cache, size, signals):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.video_path = video_path
+        self.cache = cache
+        self.size = size
+        self.signals = signals
+
+    def run(self):
+        image = QImage()
+        try:
+            thumbnail = self.cache.get(self.video_path, self.size)
+            if thumbnail is not None:
+                rgb = cv2.cvtColor(thumbnail, cv2.COLOR_BGR2RGB)
+                h, w, ch = rgb.shape
+                image = QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888).copy()
+        except Exception as e:
+            logger.warning(f"Thumbnail error for {self.video_path}: {e}")
+        self.signals.finished.emit(self.video_path, image)
+
+
+class ThumbnailLoader(QObject):
+    """
+    Loads thumbnails on one small, shared thread pool instead of a thread per card.
+
+    Requests are queued with a priority: views ask for PRIORITY_VISIBLE once a
+    card is actually painted, which moves a queued background request ahead.
+    Finished thumbnails are broadcast via thumbnail_ready and the most recently
+    used max_images of them are kept in memory.
+    """
+    thumbnail_ready = Signal(str, QImage)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, cache=None, size=THUMBNAIL_SIZE, max_images=MAX_IMAGES, parent=None):
+        super().__init__(parent)
+        self.cache = cache if cache is not None else ThumbnailCache()
+        self.size = size
+        self.max_images = max_images
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(THUMBNAIL_WORKERS)
+        self.signals = ThumbnailSignals()
+        self.signals.finished.connect(self._on_finished)
+        self.images = OrderedDict()  # video path -> QImage, least recently used first
+        self.queued = {}  # video path -> (task, priority)
+
+    def thumbnail(self, video_path):
+        """Returns the loaded thumbnail, or None if it isn't available (yet or any more)."""
+        image = self.images.get(video_path)
+        if image is not None:
+            self.images.move_to_end(video_path)
+        return image
+
+    def request(self, video_path, priority=PRIORITY_BACKGROUND):
+        """
+        Queues a thumbnail load. Re-requesting a queued path with a higher
+        priority moves it ahead; loaded thumbnails are re-emitted immediately.
+        """
+        image = self.thumbnail(video_path)
+        if image is not None:
+            self.thumbnail_ready.emit(video_path, image)
+            return
+
+        queued = self.queued.get(video_path)
+        if queued is not None:
+            task, queued_priority = queued
+            # Already running (or higher priority): nothing to do
+            if priority <= queued_priority or not self.pool.tryTake(task):
+                return
+        else:
+            task = ThumbnailTask(video_path, self.cache, self.size, self.signals)
+
+        self.queued[video_path] = (task, priority)
+        self.pool.start(task, priority)
+
+    def cancel(self, video_path):
+        """Drops a queued request (a running one finishes)."""
+        queued = self.queued.get(video_path)
+        if queued is not None and self.pool.tryTake(queued[0]):
+            del self.queued[video_path]
+
+    def release(self, video_path):
+        """Cancels a queued request and drops the loaded thumbnail, once nothing shows the video."""
+        self.cancel(video_path)
+        self.images.pop(video_path, None)
+
+    def _on_finished(self, video_path, image):
+        self.queued.pop(video_path, None)
+        if not image.isNull():
+            self.images[video_path] = image
+            self.images.move_to_end(video_path)
+            while len(self.images) > self.max_images:
+                self.images.popitem(last=False)
+        self.thumbnail_ready.emit(video_path, image)
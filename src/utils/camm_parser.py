@@ -1,121 +1,229 @@
-import struct
 import logging
-from typing import List, Dict, Optional
+import numpy as np
+from typing import List, Dict
+
+from .telemetry_track import TelemetryTrack
 
 logger = logging.getLogger(__name__)
 
+# CAMM packet payload sizes (bytes) per type, from the Camera Motion Metadata spec.
+# Each packet is: reserved (uint16), type (uint16), payload.
+PACKET_SIZES = {
+    0: 12,  # angle_axis: float[3]
+    1: 8,   # pixel_exposure_time, rolling_shutter_skew_time: int32[2]
+    2: 12,  # gyro: float[3] (rad/s)
+    3: 12,  # acceleration: float[3] (m/s^2)
+    4: 12,  # position: float[3]
+    5: 24,  # latitude, longitude, altitude: double[3]
+    6: 56,  # GPS: time_gps_epoch, fix, lat, lon, alt, accuracies, velocities
+    7: 12,  # magnetic_field: float[3]
+}
+
+MAX_TYPE = max(PACKET_SIZES) + 1
+
+# Lookup table: packet type -> payload size (-1 for unknown types)
+_SIZE_LUT = np.full(MAX_TYPE + 1, -1, dtype=np.int64)
+for _type, _size in PACKET_SIZES.items():
+    _SIZE_LUT[_type] = _size
+
+# Payload dtypes per size class. Packets sharing a payload size share a record layout,
+# so interleaved gyro/accel streams decode as one fixed-stride run.
+_PAYLOAD_DTYPES = {
+    8: np.dtype([('values', '<i4', (2,))]),
+    12: np.dtype([('values', '<f4', (3,))]),
+    24: np.dtype([('values', '<f8', (3,))]),
+    56: np.dtype([
+        ('time_gps_epoch', '<f8'), ('gps_fix_type', '<i4'),
+        ('lat', '<f8'), ('lon', '<f8'), ('alt', '<f4'),
+        ('horizontal_accuracy', '<f4'), ('vertical_accuracy', '<f4'),
+        ('velocity_east', '<f4'), ('velocity_north', '<f4'), ('velocity_up', '<f4'),
+        ('speed_accuracy', '<f4'),
+    ]),
+}
+
+_RECORD_DTYPES = {
+    size: np.dtype([('reserved', '<u2'), ('type', '<u2'), ('payload', payload)])
+    for size, payload in _PAYLOAD_DTYPES.items()
+}
+
+# Bounds on the number of packets inspected per vectorized run. The window adapts
+# per size class to the observed run length so short runs stay cheap.
+MIN_RUN_WINDOW = 16
+MAX_RUN_WINDOW = 65536
+
+# Window (bytes) scanned per step when resynchronizing on a corrupt stream
+RESYNC_WINDOW = 1 << 16
+
+IMU_TYPES = {2: 'GYRO', 3: 'ACCL'}
+
+
+def _find_next_header(buf: np.ndarray, start: int) -> int:
+    """
+    Returns the offset of the next plausible packet header at or after `start`, or -1.
+
+    A candidate needs reserved == 0, a known type, a payload that fits, and a valid
+    header (or end of stream) right after its payload. Candidates are found with a
+    vectorized search over fixed windows, so resynchronization stays linear.
+    """
+    length = len(buf)
+    window_start = start
+    while window_start + 4 <= length:
+        # Extend the window so the follow-up header of any candidate is visible
+        window_end = min(length, window_start + RESYNC_WINDOW + 4 + max(PACKET_SIZES.values()) + 4)
+        window = buf[window_start:window_end]
+        if len(window) < 4:
+            break
+
+        types = window[2:].astype(np.int64)[:len(window) - 3]
+        candidate = (window[:-3] == 0) & (window[1:-2] == 0) & (window[3:] == 0) & (types < MAX_TYPE)
+        idx = np.flatnonzero(candidate[:RESYNC_WINDOW])
+
+        for i in idx.tolist():
+            pos = window_start + i
+            next_pos = pos + 4 + int(_SIZE_LUT[buf[pos + 2]])
+            if next_pos > length:
+                continue
+            if next_pos + 4 > length:
+                if next_pos == length:
+                    return pos
+                continue
+            if buf[next_pos] == 0 and buf[next_pos + 1] == 0 and buf[next_pos + 3] == 0 and buf[next_pos + 2] < MAX_TYPE:
+                return pos
+
+        window_start += RESYNC_WINDOW
+    return -1
+
+
+def _decode_packets(raw_data: bytes) -> Dict[int, np.ndarray]:
+    """
+    Splits the stream into runs of equally sized packets and decodes each run with a
+    structured dtype. Returns type -> payload array.
+    """
+    buf = np.frombuffer(raw_data, dtype=np.uint8)
+    length = len(buf)
+    # Byte spans of validated runs, per size class
+    runs: Dict[int, List[bytes]] = {size: [] for size in _RECORD_DTYPES}
+    windows = {size: MIN_RUN_WINDOW for size in _RECORD_DTYPES}
+    offset = 0
+    resyncs = 0
+
+    while offset + 4 <= length:
+        reserved = raw_data[offset] | raw_data[offset + 1]
+        packet_type = raw_data[offset + 2] | (raw_data[offset + 3] << 8)
+        size = int(_SIZE_LUT[packet_type]) if reserved == 0 and packet_type < MAX_TYPE else -1
+
+        if size < 0:
+            # Unknown type or corrupt header. Search for the next plausible packet.
+            resyncs += 1
+            offset = _find_next_header(buf, offset + 1)
+            if offset < 0:
+                break  # Can't recover
+            continue
+
+        stride = 4 + size
+        count = min((length - offset) // stride, windows[size])
+        if count == 0:
+            break
+
+        # Headers as a (count, stride/2) uint16 view: column 0 is reserved, column 1 the type
+        words = np.frombuffer(raw_data, dtype='<u2', count=count * stride // 2, offset=offset).reshape(count, -1)
+        valid = (words[:, 0] == 0) & (_SIZE_LUT[np.minimum(words[:, 1], MAX_TYPE)] == size)
+        run = count if valid.all() else int(valid.argmin())
+        if run == count:
+            windows[size] = min(count * 2, MAX_RUN_WINDOW)
+        else:
+            windows[size] = max(MIN_RUN_WINDOW, run * 2)
+
+        runs[size].append(raw_data[offset:offset + run * stride])
+        offset += run * stride
+
+    if resyncs:
+        logger.debug(f"CAMM stream needed {resyncs} resynchronizations.")
+
+    # Split each size class by packet type in a single pass
+    payloads: Dict[int, np.ndarray] = {}
+    for size, size_runs in runs.items():
+        if not size_runs:
+            continue
+        records = np.frombuffer(b''.join(size_runs), dtype=_RECORD_DTYPES[size])
+        for packet_type in np.unique(records['type']).tolist():
+            payloads[packet_type] = records['payload'][records['type'] == packet_type]
+
+    return payloads
+
+
+def _even_timestamps(count: int, duration: float, default_rate: float) -> np.ndarray:
+    """Spreads `count` samples evenly over `duration` (or at `default_rate` Hz if unknown)."""
+    if duration > 0:
+        return np.arange(count) / count * duration
+    return np.arange(count) / default_rate
+
+
+def parse_camm_track(raw_data: bytes, duration: float = 0.0) -> TelemetryTrack:
+    """
+    Parses raw CAMM data stream (Insta360 format) into an array-backed TelemetryTrack.
+
+    GPS comes from type 6 packets (or type 5 if no type 6 is present). Gyro (type 2)
+    and accelerometer (type 3) samples are exposed through TelemetryTrack.imu as
+    'GYRO' and 'ACCL'.
+
+    Args:
+        raw_data: Binary data from the CAMM stream.
+        duration: Total duration of the video in seconds (used for timestamp estimation).
+    """
+    if not raw_data:
+        return TelemetryTrack()
+
+    payloads = _decode_packets(raw_data)
+    track = TelemetryTrack()
+
+    if 6 in payloads:
+        gps = payloads[6]
+        lat = gps['lat']
+        lon = gps['lon']
+        alt = gps['alt'].astype(np.float64)
+        epoch = gps['time_gps_epoch']
+        fix_ok = gps['gps_fix_type'] != 0
+        if len(epoch) > 0 and epoch[0] > 0 and np.all(np.diff(epoch) >= 0):
+            times = epoch - epoch[0]
+        else:
+            times = _even_timestamps(len(gps), duration, 5.0)
+    elif 5 in payloads:
+        gps = payloads[5]['values']
+        lat, lon, alt = gps[:, 0], gps[:, 1], gps[:, 2]
+        fix_ok = np.ones(len(gps), dtype=bool)
+        times = _even_timestamps(len(gps), duration, 5.0)
+    else:
+        lat = lon = alt = times = np.empty(0)
+        fix_ok = np.empty(0, dtype=bool)
+
+    if len(times):
+        if duration <= 0 and 6 not in payloads:
+            # If no duration, we can't do much. Default to 5Hz (0.2s).
+            logger.warning("CAMM data found but no duration provided. Assuming 5Hz.")
+        # Basic validation (ignore 0,0 island unless valid)
+        keep = (fix_ok & (lat >= -90) & (lat <= 90) & (lon >= -180) & (lon <= 180)
+                & ((np.abs(lat) > 0.0001) | (np.abs(lon) > 0.0001)))
+        track = TelemetryTrack(times[keep], lat[keep], lon[keep], alt[keep])
+
+    for packet_type, key in IMU_TYPES.items():
+        if packet_type in payloads:
+            values = payloads[packet_type]['values'].astype(np.float64)
+            track.imu[key] = (_even_timestamps(len(values), duration, 200.0), values)
+
+    logger.info(f"Parsed {len(track)} CAMM GPS samples.")
+    return track
+
+
 def parse_camm_data(raw_data: bytes, duration: float = 0.0) -> List[Dict[str, float]]:
     """
     Parses raw CAMM data stream (Insta360 format).
-    
+
     Args:
         raw_data: Binary data from the CAMM stream.
         duration: Total duration of the video in seconds (used for timestamp estimation).
-        
+
     Returns:
         List of dictionaries containing 'timestamp', 'lat', 'lon', 'alt'.
     """
-    offset = 0
-    length = len(raw_data)
-    samples = []
-    
-    # Iterate through the binary stream
-    # Each packet: reserved (2 bytes), type (2 bytes), data (variable)
-    
-    while offset < length:
-        # Check if we have enough bytes for header
-        if offset + 4 > length:
-            break
-            
-        try:
-            # Little-endian: reserved (H), type (H)
-            reserved, packet_type = struct.unpack_from('<HH', raw_data, offset)
-        except struct.error:
-            break
-            
-        current_header_offset = offset
-        offset += 4
-        
-        payload_size = 0
-        is_gps = False
-        
-        # Determine payload size based on type
-        # Type 6: GPS (lat, lon, alt) -> double, double, float -> 8+8+4 = 20 bytes
-        if packet_type == 6:
-            payload_size = 20
-            is_gps = True
-        elif packet_type == 2: # Gyro: 3 floats -> 12 bytes
-            payload_size = 12
-        elif packet_type == 3: # Accel: 3 floats -> 12 bytes
-            payload_size = 12
-        elif packet_type == 1: # Exposure/Time: 8 bytes? (Educated guess for Insta360)
-             # If we don't handle this, we might desync.
-             # However, without exact spec, assume 8 bytes or risk desync.
-             payload_size = 8
-        elif packet_type == 0: # Reserved/Empty
-             payload_size = 0
-        else:
-             # Unknown type. 
-             payload_size = -1
-             
-        if payload_size >= 0:
-            if offset + payload_size > length:
-                break
-                
-            if is_gps:
-                try:
-                    lat, lon, alt = struct.unpack_from('<ddf', raw_data, offset)
-                    # Basic validation (ignore 0,0 island unless valid)
-                    if -90 <= lat <= 90 and -180 <= lon <= 180 and (abs(lat) > 0.0001 or abs(lon) > 0.0001):
-                         samples.append({
-                            'lat': lat,
-                            'lon': lon,
-                            'alt': float(alt)
-                        })
-                except struct.error:
-                    pass
-            
-            offset += payload_size
-        else:
-            # Unknown type or size. Scan for next likely header.
-            # Look for 0x0000 (reserved) aligned to ... actually just scan bytes.
-            # logger.debug(f"Unknown CAMM type {packet_type} at {current_header_offset}. Scanning for next packet.")
-            
-            scan_ptr = current_header_offset + 1
-            found = False
-            while scan_ptr < length - 4:
-                # Check for 0x0000
-                try:
-                    possible_reserved = struct.unpack_from('<H', raw_data, scan_ptr)[0]
-                    if possible_reserved == 0:
-                        # Check next 2 bytes for plausible type (1, 2, 3, 6)
-                        possible_type = struct.unpack_from('<H', raw_data, scan_ptr + 2)[0]
-                        if possible_type in [1, 2, 3, 6]:
-                            offset = scan_ptr
-                            found = True
-                            break
-                except struct.error:
-                    break
-                scan_ptr += 1
-            
-            if not found:
-                break # Can't recover
-                
-    # Assign timestamps
-    # If we have duration, we distribute samples evenly.
-    # Insta360 GPS is typically 5Hz or 10Hz.
-    if samples:
-        num_samples = len(samples)
-        if duration > 0:
-            for i, sample in enumerate(samples):
-                sample['timestamp'] = (i / num_samples) * duration
-        else:
-            # If no duration, we can't do much. 
-            # Default to 5Hz (0.2s) just to have something?
-            # Or log warning.
-            logger.warning("CAMM data found but no duration provided. Assuming 5Hz.")
-            for i, sample in enumerate(samples):
-                sample['timestamp'] = i * 0.2
-
-    logger.info(f"Parsed {len(samples)} CAMM GPS samples.")
-    return samples
+    return parse_camm_track(raw_data, duration).to_samples()
@@ -6,6 +6,21 @@ logger = logging.getLogger(__name__)
 
 
 class FileManager:
+    VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+    @staticmethod
+    def find_videos(path) -> list:
+        """Returns the video files at path (a file, or a directory searched recursively), sorted."""
+        if not os.path.isdir(path):
+            return [path]
+
+        videos = []
+        for root, dirs, files in os.walk(path):
+            for f in files:
+                if f.lower().endswith(FileManager.VIDEO_EXTENSIONS):
+                    videos.append(os.path.join(root, f))
+        return sorted(videos)
+
     @staticmethod
     def ensure_directory(path) -> bool:
         """Ensures the directory exists. Returns True on success."""
@@ -1,237 +1,249 @@
-import struct
 import logging
-from typing import List, Dict, Any, Optional
+import numpy as np
+from typing import List, Dict, Optional, Tuple
+
+from .telemetry_track import TelemetryTrack
 
 logger = logging.getLogger(__name__)
 
+# GPMF type characters mapped to big-endian NumPy dtypes
+GPMF_DTYPES = {
+    'b': 'i1',   # int8
+    'B': 'u1',   # uint8
+    's': '>i2',  # int16
+    'S': '>u2',  # uint16
+    'l': '>i4',  # int32
+    'L': '>u4',  # uint32
+    'f': '>f4',  # float
+    'd': '>f8',  # double
+    'j': '>i8',  # int64
+    'J': '>u8',  # uint64
+}
+
+CONTAINER_KEYS = (b'DEVC', b'STRM')
+
+# Sensor streams we decode, with their nominal rate (Hz) used when no STMP timing is present
+SENSOR_RATES = {
+    'GPS5': 18.0,
+    'GPS9': 10.0,
+    'ACCL': 200.0,
+    'GYRO': 200.0,
+    'CORI': 30.0,
+}
+
+IMU_KEYS = ('ACCL', 'GYRO', 'CORI')
+
+
+class _StreamState:
+    """Per-STRM metadata that applies to the sensor payload that follows it."""
+    __slots__ = ('scal', 'type_desc', 'stmp', 'tsmp')
+
+    def __init__(self):
+        self.scal: Optional[np.ndarray] = None
+        self.type_desc: Optional[str] = None
+        self.stmp: Optional[int] = None
+        self.tsmp: Optional[int] = None
+
+
 class GPMFParser:
     """
-    Parses GoPro Metadata Format (GPMF) binary data to extract GPS information.
+    Parses GoPro Metadata Format (GPMF) binary data to extract GPS and IMU information.
+
+    The parser walks the KLV tree iteratively over a memoryview, so nested
+    DEVC/STRM payloads are never copied, and decodes sensor payloads with
+    np.frombuffer.
     """
-    
+
     def __init__(self):
-        self.scales: Dict[str, List[float]] = {}
-        self.gps_data: List[Dict[str, float]] = []
-        self.current_timestamp = 0.0
-        # Assuming ~18Hz for GPS as default, but this is rough estimation
-        # Real implementation would look for TSMP (Total Samples) or TICK to map time accurately
-        self.sample_duration = 1.0 / 18.0 
-        
-    def parse(self, data: bytes) -> List[Dict[str, float]]:
+        # Nominal GPS5 rate, used when the stream carries no STMP timing
+        self.sample_duration = 1.0 / SENSOR_RATES['GPS5']
+        # key -> list of (values, stmp, tsmp) chunks, one per STRM payload
+        self._chunks: Dict[str, List[Tuple[np.ndarray, Optional[int], Optional[int]]]] = {}
+
+    def parse(self, data: bytes, duration: float = 0.0) -> List[Dict[str, float]]:
         """
         Parses raw GPMF binary data.
-        
+
         Args:
             data: Raw binary bytes extracted from the GPMF stream.
-            
+            duration: Video duration in seconds, used for timing when STMP is absent.
+
         Returns:
-            List of dictionaries containing {timestamp, lat, lon, alt, ...}
+            List of dictionaries containing {timestamp, lat, lon, alt}
         """
-        self.gps_data = []
-        self.scales = {} # Reset scales? Or keep them? GPMF usually repeats SCAL in each stream chunk.
-        self.current_timestamp = 0.0
-        
+        return self.parse_track(data, duration).to_samples()
+
+    def parse_track(self, data: bytes, duration: float = 0.0) -> TelemetryTrack:
+        """
+        Parses raw GPMF binary data into an array-backed TelemetryTrack.
+
+        GPS comes from GPS9 when present, otherwise GPS5. ACCL, GYRO and CORI
+        streams are exposed through TelemetryTrack.imu.
+        """
+        self._chunks = {}
+
         if not data:
-            return []
-            
-        self._parse_recursive(data)
-        
-        # Sort by timestamp just in case
-        self.gps_data.sort(key=lambda x: x['timestamp'])
-        
-        return self.gps_data
-
-    def _parse_recursive(self, data: bytes):
-        offset = 0
-        length = len(data)
-        
-        while offset + 8 <= length:
-            # 1. Read Header
-            # Key: 4 bytes
-            key_bytes = data[offset:offset+4]
-            key = key_bytes.decode('utf-8', errors='replace')
-            
-            # Type: 1 byte
-            type_char = chr(data[offset+4])
-            
-            # Size: 1 byte (Structure Size)
-            structure_size = data[offset+5]
-            
-            # Count: 2 bytes (Repeat Count) - Big Endian
-            repeat_count = struct.unpack('>H', data[offset+6:offset+8])[0]
-            
-            offset += 8
-            
-            # Calculate Data Size
+            return TelemetryTrack()
+
+        self._walk(memoryview(data))
+
+        streams = self._resolve_timing(duration)
+
+        track = TelemetryTrack()
+        gps_key = 'GPS9' if 'GPS9' in streams else 'GPS5'
+        if gps_key in streams:
+            times, values = streams[gps_key]
+            if values.shape[1] >= 3:
+                track = TelemetryTrack(times, values[:, 0], values[:, 1], values[:, 2])
+
+        track.imu = {key: streams[key] for key in IMU_KEYS if key in streams}
+        return track
+
+    def _walk(self, view: memoryview):
+        """Iterative depth-first walk over the KLV tree."""
+        # Each frame is [offset, end] into the shared view
+        stack = [[0, len(view)]]
+        stream = _StreamState()
+
+        while stack:
+            frame = stack[-1]
+            offset, end = frame
+
+            if offset + 8 > end:
+                stack.pop()
+                continue
+
+            # Header: Key (4), Type (1), Structure Size (1), Repeat Count (2, big-endian)
+            key = view[offset:offset+4].tobytes()
+            type_char = chr(view[offset+4])
+            structure_size = view[offset+5]
+            repeat_count = (view[offset+6] << 8) | view[offset+7]
+
+            data_start = offset + 8
             total_data_size = structure_size * repeat_count
-            
-            # Calculate Padded Size (4-byte alignment)
-            padded_size = (total_data_size + 3) & ~3
-            
-            if offset + total_data_size > length:
-                logger.warning(f"Incomplete GPMF tag: {key}. Expected {total_data_size} bytes, got {length - offset}")
-                break
-                
-            payload = data[offset:offset+total_data_size]
-            
-            # 2. Process Tag
-            if key in ['DEVC', 'STRM']:
-                # Container: Recurse
-                # Note: DEVC/STRM payload contains other tags.
-                # We assume the container payload is also a sequence of KLV tags.
-                self._parse_recursive(payload)
-                
-            elif key == 'SCAL':
-                self._handle_scal(payload, type_char, structure_size, repeat_count)
-                
-            elif key == 'GPS5':
-                self._handle_gps5(payload, type_char, structure_size, repeat_count)
-            
-            # 3. Advance Offset (skip padding)
-            # The next tag starts at offset + padded_size (relative to data start before header read)
-            # Wait, my logic: offset was incremented by 8. 
-            # Now I need to increment by padded_size.
-            # But the padding is calculated on the data size.
-            # Example: data size 5. padded size 8.
-            # We read 5 bytes. We need to skip 3 more bytes.
-            # So increment by padded_size.
-            
-            # However, if I recurse, the recursion handles the internal structure.
-            # If I am at top level, I jump over the container's payload.
-            # Yes, standard GPMF: Containers have size/count too.
-            # If DEVC has size S and count C, total size is S*C.
-            # We recurse into that S*C bytes.
-            
-            offset += padded_size
-
-    def _unpack_values(self, data: bytes, type_char: str, structure_size: int, repeat_count: int) -> List[Any]:
-        values = []
-        item_size = structure_size
-        
-        # Mapping for struct format
-        # Big-endian is standard for GPMF
-        fmt_map = {
-            'b': 'b', # int8
-            'B': 'B', # uint8
-            's': '>h', # int16
-            'S': '>H', # uint16
-            'l': '>i', # int32
-            'L': '>I', # uint32
-            'f': '>f', # float
-            'd': '>d', # double
-            'J': '>Q', # uint64
-        }
-        
-        fmt_char = fmt_map.get(type_char)
-        if not fmt_char:
-            return []
-            
-        # We have 'repeat_count' items.
-        # But wait, structure_size might contain multiple values if it's a complex type?
-        # Usually structure_size is the size of ONE element (e.g. 4 for int32).
-        # repeat_count is how many elements.
-        # However, for GPS5, structure_size is usually 20 (5 * 4 bytes).
-        # And repeat_count is the number of samples.
-        # So we treat each 'sample' as a list of values?
-        # Let's handle generic unpacking:
-        
-        # If structure_size matches the type size, it's a simple array.
-        # If structure_size is a multiple of type size, it's an array of arrays (e.g. vec3).
-        
-        type_size = struct.calcsize(fmt_char)
-        elements_per_item = item_size // type_size
-        
-        if elements_per_item * type_size != item_size:
-             # Structure size not aligned with type size?
-             # Just try to unpack as stream of types
-             pass
-             
-        total_elements = repeat_count * elements_per_item
-        
-        # Safety check
-        if len(data) < total_elements * type_size:
-            return []
-            
-        try:
-            # Unpack all at once
-            full_fmt = '>' + (fmt_map[type_char][1] * total_elements) # e.g. '>iiiii...'
-            unpacked = struct.unpack(full_fmt, data[:total_elements * type_size])
-            
-            # Group by structure_size
-            if elements_per_item > 1:
-                # List of lists
-                result = []
-                for i in range(repeat_count):
-                    chunk = unpacked[i*elements_per_item : (i+1)*elements_per_item]
-                    result.append(list(chunk))
-                return result
-            else:
-                return list(unpacked)
-                
-        except struct.error:
-            return []
-
-    def _handle_scal(self, payload: bytes, type_char: str, structure_size: int, repeat_count: int):
-        # SCAL usually provides scaling factors for the associated stream.
-        # It's usually a set of integers or floats.
-        values = self._unpack_values(payload, type_char, structure_size, repeat_count)
-        
-        # For GPS5, SCAL usually has same dim as GPS5 (5 values).
-        # If multiple samples of SCAL? Usually SCAL is count 1 (one set of scales).
-        # But if it's count > 1, it might be changing scales? Uncommon.
-        
-        # Flatten if it came out as [[1,2,3,4,5]] due to structure logic
-        if values and isinstance(values[0], list):
-            # Take the last one? Or first? usually it's just one set.
-            self.scales['GPS5'] = values[-1] # Assume latest applies
-        else:
-            self.scales['GPS5'] = values
-
-    def _handle_gps5(self, payload: bytes, type_char: str, structure_size: int, repeat_count: int):
-        values = self._unpack_values(payload, type_char, structure_size, repeat_count)
-        
-        # GPS5 usually: Lat, Lon, Alt, 2D Speed, 3D Speed.
-        # Values are usually int32 ('l').
-        # Need SCAL to convert.
-        
-        scales = self.scales.get('GPS5')
-        if not scales:
-            # Default scaling if missing? Or skip?
-            # GoPro Lat/Lon are usually scaled by 10,000,000.
-            scales = [10000000, 10000000, 1000, 1000, 1000] # Educated guess fallback
-        
-        # Make sure scales match dimensions
-        # values is a list of lists (samples)
-        
-        for sample in values:
-            if not isinstance(sample, list):
-                # Should be list of 5 ints
+
+            if data_start + total_data_size > end:
+                logger.warning(f"Incomplete GPMF tag: {key!r}. Expected {total_data_size} bytes, got {end - data_start}")
+                stack.pop()
                 continue
-                
-            if len(sample) < 5:
+
+            # Next sibling starts after the payload padded to 4 bytes
+            frame[0] = data_start + ((total_data_size + 3) & ~3)
+
+            if key in CONTAINER_KEYS:
+                if key == b'STRM':
+                    stream = _StreamState()
+                stack.append([data_start, data_start + total_data_size])
                 continue
-                
-            # Apply scaling
-            # lat = sample[0] / scales[0]
-            # lon = sample[1] / scales[1]
-            # alt = sample[2] / scales[2]
-            
-            try:
-                lat = float(sample[0]) / float(scales[0]) if len(scales) > 0 else sample[0]
-                lon = float(sample[1]) / float(scales[1]) if len(scales) > 1 else sample[1]
-                alt = float(sample[2]) / float(scales[2]) if len(scales) > 2 else sample[2]
-                
-                # Append data
-                self.gps_data.append({
-                    'timestamp': self.current_timestamp,
-                    'lat': lat,
-                    'lon': lon,
-                    'alt': alt
-                })
-                
-                # Increment timestamp
-                self.current_timestamp += self.sample_duration
-                
-            except (ValueError, IndexError, ZeroDivisionError):
+
+            if total_data_size == 0:
                 continue
 
+            if key == b'SCAL':
+                values = self._decode(view, data_start, type_char, structure_size, repeat_count)
+                if values is not None:
+                    stream.scal = values.reshape(-1).astype(np.float64)
+            elif key == b'TYPE':
+                stream.type_desc = view[data_start:data_start + total_data_size].tobytes().decode('ascii', errors='ignore').rstrip('\x00')
+            elif key == b'STMP':
+                values = self._decode(view, data_start, type_char, structure_size, repeat_count)
+                if values is not None:
+                    stream.stmp = int(values.reshape(-1)[0])
+            elif key == b'TSMP':
+                values = self._decode(view, data_start, type_char, structure_size, repeat_count)
+                if values is not None:
+                    stream.tsmp = int(values.reshape(-1)[0])
+            else:
+                name = key.decode('ascii', errors='replace')
+                if name in SENSOR_RATES:
+                    self._handle_sensor(name, view, data_start, type_char, structure_size, repeat_count, stream)
+
+    def _decode(self, view: memoryview, offset: int, type_char: str, structure_size: int,
+                repeat_count: int, type_desc: Optional[str] = None) -> Optional[np.ndarray]:
+        """
+        Decodes a payload into a (repeat_count, elements) float64 array without copying
+        the source buffer. Complex ('?') payloads are described by the stream TYPE tag.
+        """
+        if type_char == '?':
+            if not type_desc:
+                return None
+            try:
+                dtype = np.dtype([(f'f{i}', GPMF_DTYPES[c]) for i, c in enumerate(type_desc)])
+            except KeyError:
+                return None
+            if dtype.itemsize != structure_size:
+                return None
+            records = np.frombuffer(view, dtype=dtype, count=repeat_count, offset=offset)
+            return np.column_stack([records[name].astype(np.float64) for name in dtype.names])
+
+        dtype_str = GPMF_DTYPES.get(type_char)
+        if dtype_str is None:
+            return None
+        dtype = np.dtype(dtype_str)
+        elements_per_item = structure_size // dtype.itemsize
+        if elements_per_item == 0 or elements_per_item * dtype.itemsize != structure_size:
+            return None
+
+        values = np.frombuffer(view, dtype=dtype, count=repeat_count * elements_per_item, offset=offset)
+        return values.reshape(repeat_count, elements_per_item)
+
+    def _handle_sensor(self, name: str, view: memoryview, offset: int, type_char: str,
+                       structure_size: int, repeat_count: int, stream: _StreamState):
+        values = self._decode(view, offset, type_char, structure_size, repeat_count, stream.type_desc)
+        if values is None:
+            return
+        values = values.astype(np.float64)
+
+        scales = stream.scal
+        if scales is None and name == 'GPS5':
+            # GoPro Lat/Lon are usually scaled by 10,000,000.
+            scales = np.array([10000000, 10000000, 1000, 1000, 1000], dtype=np.float64)
+
+        if scales is not None and len(scales) > 0:
+            if len(scales) == 1:
+                values = values / scales[0] if scales[0] != 0 else values
+            else:
+                n = min(len(scales), values.shape[1])
+                safe = np.where(scales[:n] == 0, 1.0, scales[:n])
+                values[:, :n] = values[:, :n] / safe
+
+        self._chunks.setdefault(name, []).append((values, stream.stmp, stream.tsmp))
+
+    def _resolve_timing(self, duration: float) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Assigns a timestamp (seconds) to every sample of every stream.
+
+        STMP (microseconds) gives the start time of each payload; the sample rate
+        within a payload is derived from the next payload's STMP. Without STMP the
+        rate is derived from the total sample count (TSMP) and the video duration,
+        falling back to the sensor's nominal rate.
+        """
+        stmps = [stmp for chunks in self._chunks.values() for _, stmp, _ in chunks if stmp is not None]
+        origin = min(stmps) if stmps else 0
+
+        streams = {}
+        for name, chunks in self._chunks.items():
+            values = np.concatenate([c[0] for c in chunks])
+            counts = np.array([len(c[0]) for c in chunks])
+            default_dt = 1.0 / SENSOR_RATES[name]
+
+            if all(stmp is not None for _, stmp, _ in chunks):
+                starts = (np.array([stmp for _, stmp, _ in chunks], dtype=np.float64) - origin) / 1e6
+                dts = np.full(len(chunks), default_dt)
+                if len(chunks) > 1:
+                    spans = np.diff(starts) / np.maximum(counts[:-1], 1)
+                    dts[:-1] = np.where(spans > 0, spans, default_dt)
+                    dts[-1] = dts[-2]
+                offsets = np.arange(len(values)) - np.repeat(np.cumsum(counts) - counts, counts)
+                times = np.repeat(starts, counts) + offsets * np.repeat(dts, counts)
+            else:
+                total = len(values)
+                last_tsmp = chunks[-1][2]
+                if last_tsmp is not None and last_tsmp > total:
+                    total = last_tsmp
+                dt = duration / total if duration > 0 and total > 0 else default_dt
+                times = np.arange(len(values)) * dt
+
+            streams[name] = (times, values)
+
+        return streams
@@ -1,9 +1,104 @@
+import io
+import os
 import xml.etree.ElementTree as ET
 from datetime import datetime
 import logging
+from typing import IO, Iterator, Tuple, Union
+
+from .telemetry_track import TelemetryTrack, TrackBuilder
 
 logger = logging.getLogger(__name__)
 
+
+def _local_name(tag: str) -> str:
+    """Strips the XML namespace, so GPX 1.0, 1.1 and un-namespaced files look alike."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _parse_time(text: str) -> float:
+    # Parse ISO format (e.g., 2023-10-27T10:00:00Z)
+    # Python 3.7+ fromisoformat handles simple Z, but let's be safe
+    return datetime.fromisoformat(text.strip().replace('Z', '+00:00')).timestamp()
+
+
+def iter_gpx_points(source: Union[str, IO]) -> Iterator[Tuple[float, float, float, float]]:
+    """
+    Streams a GPX file and yields (epoch, lat, lon, alt) for each timed track point.
+
+    Uses ET.iterparse and detaches every processed <trkpt> from its parent, so
+    memory stays flat for day-long logs.
+
+    Args:
+        source: Path to a GPX file or a binary/text file object.
+    """
+    # Stack of open elements, so a finished trkpt can be removed from its parent
+    open_elements = []
+
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            open_elements.append(elem)
+            continue
+
+        open_elements.pop()
+        if _local_name(elem.tag) != 'trkpt':
+            continue
+
+        try:
+            lat = float(elem.get('lat'))
+            lon = float(elem.get('lon'))
+            alt = 0.0
+            epoch = None
+
+            for child in elem:
+                name = _local_name(child.tag)
+                if name == 'ele' and child.text:
+                    alt = float(child.text)
+                elif name == 'time' and child.text:
+                    epoch = _parse_time(child.text)
+
+            if epoch is not None:
+                yield (epoch, lat, lon, alt)
+        except (ValueError, TypeError):
+            pass
+        finally:
+            elem.clear()
+            if open_elements and len(open_elements[-1]) and open_elements[-1][-1] is elem:
+                del open_elements[-1][-1]
+
+
+def parse_gpx_track(source: Union[str, IO]) -> TelemetryTrack:
+    """
+    Parses a GPX file straight into an array-backed TelemetryTrack.
+
+    Timestamps are relative to the first timed point; its absolute UNIX time is
+    stored in TelemetryTrack.start_time. A truncated file yields the points read
+    before the error.
+
+    Args:
+        source: Path to a GPX file or a binary/text file object.
+    """
+    builder = TrackBuilder()
+    start_time = None
+
+    try:
+        for epoch, lat, lon, alt in iter_gpx_points(source):
+            if start_time is None:
+                start_time = epoch
+            builder.append(epoch - start_time, lat, lon, alt)
+    except ET.ParseError as e:
+        logger.error(f"XML Parse Error in GPX: {e}")
+    except OSError as e:
+        logger.error(f"Could not read GPX data: {e}")
+
+    if len(builder) == 0:
+        logger.warning("No track points found in GPX data.")
+    else:
+        name = os.path.basename(source) if isinstance(source, str) else "stream"
+        logger.info(f"Successfully parsed {len(builder)} GPX points from {name}.")
+
+    return builder.build(start_time=start_time)
+
+
 def parse_gpx_data(gpx_content: str) -> list[dict]:
     """
     Parses GPX XML content and returns a list of dictionaries with:
@@ -14,74 +109,6 @@ def parse_gpx_data(gpx_content: str) -> list[dict]:
         'alt': float
     }
     """
-    try:
-        root = ET.fromstring(gpx_content)
-        
-        # Define namespaces often found in GPX
-        namespaces = {
-            'gpx': 'http://www.topografix.com/GPX/1/1',
-            'gpx10': 'http://www.topografix.com/GPX/1/0'
-        }
-        
-        # Try to find trkpts with or without namespace
-        points = []
-        
-        # Helper to find elements
-        def find_all_points(element):
-            # Try namespaced first (GPX 1.1)
-            pts = element.findall('.//gpx:trkpt', namespaces)
-            if not pts:
-                # Try GPX 1.0 or no namespace
-                pts = element.findall('.//trkpt')
-            return pts
-
-        trkpts = find_all_points(root)
-        
-        if not trkpts:
-            logger.warning("No track points found in GPX data.")
-            return []
-
-        parsed_points = []
-        start_time = None
-
-        for pt in trkpts:
-            try:
-                lat = float(pt.get('lat'))
-                lon = float(pt.get('lon'))
-                
-                # Elevation
-                ele_elem = pt.find('gpx:ele', namespaces) if pt.find('gpx:ele', namespaces) is not None else pt.find('ele')
-                alt = float(ele_elem.text) if ele_elem is not None else 0.0
-                
-                # Time
-                time_elem = pt.find('gpx:time', namespaces) if pt.find('gpx:time', namespaces) is not None else pt.find('time')
-                if time_elem is not None and time_elem.text:
-                    # Parse ISO format (e.g., 2023-10-27T10:00:00Z)
-                    # Python 3.7+ fromisoformat handles simple Z, but let's be safe
-                    t_str = time_elem.text.replace('Z', '+00:00')
-                    dt = datetime.fromisoformat(t_str)
-                    epoch = dt.timestamp()
-                    
-                    if start_time is None:
-                        start_time = epoch
-                    
-                    rel_time = epoch - start_time
-                    
-                    parsed_points.append({
-                        'timestamp': rel_time,
-                        'lat': lat,
-                        'lon': lon,
-                        'alt': alt
-                    })
-            except (ValueError, TypeError) as e:
-                continue
-
-        logger.info(f"Successfully parsed {len(parsed_points)} GPX points.")
-        return parsed_points
-
-    except ET.ParseError as e:
-        logger.error(f"XML Parse Error in GPX: {e}")
-        return []
-    except Exception as e:
-        logger.error(f"Unexpected error parsing GPX: {e}")
-        return []
+    if isinstance(gpx_content, str):
+        gpx_content = gpx_content.encode('utf-8')
+    return parse_gpx_track(io.BytesIO(gpx_content)).to_samples()
@@ -1,21 +1,120 @@
 import re
 import logging
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from .telemetry_track import TelemetryTrack, TrackBuilder
 
 logger = logging.getLogger(__name__)
 
+# One compiled pattern for every token we care about in a DJI SRT stream:
+# - the cue start time: HH:MM:SS,mmm --> ...
+# - [latitude: 12.345] / [longitude: ...] / [altitude: ...] (optional spaces)
+# - the alternative GPS(lat, lon, alt) form
+SRT_TOKEN_PATTERN = re.compile(
+    r'(?P<h>\d+):(?P<m>\d+):(?P<s>\d+)[,.](?P<ms>\d+)\s*-->'
+    r'|\[\s*(?P<key>latitude|longitude|altitude)\s*:\s*(?P<val>[-\d.]+)\s*\]'
+    r'|GPS\s*\(\s*(?P<glat>[-\d.]+)\s*,\s*(?P<glon>[-\d.]+)\s*,\s*(?P<galt>[-\d.]+)\s*\)',
+    re.IGNORECASE
+)
+
+
+class _Cue:
+    """Values collected for the current subtitle cue."""
+    __slots__ = ('timestamp', 'lat', 'lon', 'alt', 'gps')
+
+    def __init__(self, timestamp: float):
+        self.timestamp = timestamp
+        self.lat: Optional[str] = None
+        self.lon: Optional[str] = None
+        self.alt: Optional[str] = None
+        self.gps: Optional[Tuple[str, str, str]] = None
+
+    def sample(self) -> Optional[Tuple[float, float, float, float]]:
+        try:
+            if self.lat is not None and self.lon is not None:
+                alt = float(self.alt) if self.alt is not None else 0.0
+                return (self.timestamp, float(self.lat), float(self.lon), alt)
+            if self.gps is not None:
+                # Fallback GPS(lat, lon, alt) pattern
+                return (self.timestamp, float(self.gps[0]), float(self.gps[1]), float(self.gps[2]))
+        except ValueError:
+            pass
+        return None
+
+
+def iter_srt_samples(lines: Iterable[str]) -> Iterator[Tuple[float, float, float, float]]:
+    """
+    Scans SRT text line by line and yields (timestamp, lat, lon, alt) per cue.
+
+    Works on any iterable of lines (a file, a subprocess pipe, str.splitlines()),
+    so memory stays flat regardless of the stream length.
+    """
+    cue: Optional[_Cue] = None
+
+    for line in lines:
+        for match in SRT_TOKEN_PATTERN.finditer(line):
+            if match.group('h') is not None:
+                if cue is not None:
+                    sample = cue.sample()
+                    if sample is not None:
+                        yield sample
+                timestamp = (int(match.group('h')) * 3600 + int(match.group('m')) * 60
+                             + int(match.group('s')) + int(match.group('ms')) / 1000.0)
+                cue = _Cue(timestamp)
+            elif cue is None:
+                continue
+            elif match.group('key') is not None:
+                key = match.group('key').lower()
+                # First occurrence in a cue wins
+                if key == 'latitude' and cue.lat is None:
+                    cue.lat = match.group('val')
+                elif key == 'longitude' and cue.lon is None:
+                    cue.lon = match.group('val')
+                elif key == 'altitude' and cue.alt is None:
+                    cue.alt = match.group('val')
+            elif cue.gps is None:
+                cue.gps = (match.group('glat'), match.group('glon'), match.group('galt'))
+
+    if cue is not None:
+        sample = cue.sample()
+        if sample is not None:
+            yield sample
+
+
+def _decode_lines(raw_data: Union[bytes, str]) -> List[str]:
+    if isinstance(raw_data, bytes):
+        raw_data = raw_data.decode('utf-8', errors='ignore')
+    return raw_data.splitlines()
+
+
+def parse_srt_track(source: Union[bytes, str, Iterable[str]]) -> TelemetryTrack:
+    """
+    Parses SRT subtitle telemetry straight into an array-backed TelemetryTrack.
+
+    Args:
+        source: Raw bytes/str of the SRT stream, or an iterable of text lines
+                (e.g. a text-mode subprocess pipe) for streaming.
+    """
+    if isinstance(source, (bytes, str)):
+        source = _decode_lines(source)
+
+    builder = TrackBuilder()
+    builder.extend(iter_srt_samples(source))
+    return builder.build()
+
+
 def parse_srt_data(raw_data: bytes) -> List[Dict[str, float]]:
     """
     Parses SRT subtitle data to extract GPS telemetry.
-    
+
     Expected format (DJI style):
     1
     00:00:00,000 --> 00:00:00,032
     [time: 123456] [latitude: 12.34567] [longitude: 123.45678] [altitude: 50.5] ...
-    
+
     Args:
         raw_data: Raw bytes of the SRT file/stream
-        
+
     Returns:
         List of dictionaries containing:
         - timestamp: float (seconds)
@@ -24,99 +123,12 @@ def parse_srt_data(raw_data: bytes) -> List[Dict[str, float]]:
         - alt: float
     """
     try:
-        text_data = raw_data.decode('utf-8', errors='ignore')
+        lines = _decode_lines(raw_data)
     except Exception as e:
         logger.error(f"Error decoding SRT data: {e}")
         return []
 
-    samples = []
-    
-    # Split by double newlines to get blocks
-    # Normalize line endings first
-    text_data = text_data.replace('\r\n', '\n')
-    blocks = text_data.strip().split('\n\n')
-    
-    # Regex patterns
-    # Matches: [latitude: 12.345] or [latitude : 12.345]
-    lat_pattern = re.compile(r'\[\s*latitude\s*:\s*([-\d.]+)\s*\]', re.IGNORECASE)
-    lon_pattern = re.compile(r'\[\s*longitude\s*:\s*([-\d.]+)\s*\]', re.IGNORECASE)
-    alt_pattern = re.compile(r'\[\s*altitude\s*:\s*([-\d.]+)\s*\]', re.IGNORECASE)
-    
-    # Alternative: GPS(lat, lon, alt)
-    gps_pattern = re.compile(r'GPS\s*\(\s*([-\d.]+)\s*,\s*([-\d.]+)\s*,\s*([-\d.]+)\s*\)', re.IGNORECASE)
-
-    for block in blocks:
-        lines = block.split('\n')
-        # We need at least index, time, and text
-        if len(lines) < 3:
-            continue
-            
-        time_line = lines[1]
-        
-        # Combine all subsequent lines as text content
-        content = " ".join(lines[2:])
-        
-        # Parse Timestamp
-        # Format: HH:MM:SS,mmm --> HH:MM:SS,mmm
-        try:
-            if '-->' not in time_line:
-                continue
-                
-            start_str = time_line.split('-->')[0].strip()
-            # Parse HH:MM:SS,mmm
-            parts = start_str.split(':')
-            if len(parts) != 3:
-                continue
-                
-            h = int(parts[0])
-            m = int(parts[1])
-            s_parts = parts[2].split(',')
-            
-            if len(s_parts) != 2:
-                continue
-                
-            s = int(s_parts[0])
-            ms = int(s_parts[1])
-            
-            timestamp = h * 3600 + m * 60 + s + ms / 1000.0
-            
-        except (ValueError, IndexError):
-            continue
-
-        # Extract Coordinates
-        lat = None
-        lon = None
-        alt = 0.0
-        
-        lat_match = lat_pattern.search(content)
-        lon_match = lon_pattern.search(content)
-        alt_match = alt_pattern.search(content)
-        
-        if lat_match and lon_match:
-            try:
-                lat = float(lat_match.group(1))
-                lon = float(lon_match.group(1))
-                if alt_match:
-                    alt = float(alt_match.group(1))
-            except ValueError:
-                continue
-        else:
-            # Try fallback GPS pattern
-            gps_match = gps_pattern.search(content)
-            if gps_match:
-                try:
-                    lat = float(gps_match.group(1))
-                    lon = float(gps_match.group(2))
-                    alt = float(gps_match.group(3))
-                except ValueError:
-                    continue
-
-        if lat is not None and lon is not None:
-            samples.append({
-                'timestamp': timestamp,
-                'lat': lat,
-                'lon': lon,
-                'alt': alt
-            })
-
-    return samples
+    return [
+        {'timestamp': t, 'lat': lat, 'lon': lon, 'alt': alt}
+        for t, lat, lon, alt in iter_srt_samples(lines)
+    ]
@@ -0,0 +1,183 @@
+import numpy as np
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+EARTH_RADIUS_M = 6371008.8
+
+
+class TelemetryTrack:
+    """
+    Array-backed GPS track with optional IMU streams.
+
+    GPS samples are stored column-wise (timestamps, lat, lon, alt) as float64
+    arrays sorted by timestamp. IMU streams (e.g. GYRO, ACCL, CORI) are stored
+    as (times, values) pairs where values has one row per sample.
+
+    start_time is the absolute UNIX time of timestamp 0, when the source provides
+    one (e.g. GPX logs).
+    """
+
+    def __init__(self, timestamps=None, lat=None, lon=None, alt=None,
+                 imu: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None,
+                 start_time: Optional[float] = None):
+        self.timestamps = np.asarray(timestamps if timestamps is not None else [], dtype=np.float64)
+        self.lat = np.asarray(lat if lat is not None else [], dtype=np.float64)
+        self.lon = np.asarray(lon if lon is not None else [], dtype=np.float64)
+        self.alt = np.asarray(alt if alt is not None else np.zeros_like(self.timestamps), dtype=np.float64)
+        self.imu: Dict[str, Tuple[np.ndarray, np.ndarray]] = imu or {}
+        self.start_time = start_time
+
+        if len(self.timestamps) > 1 and np.any(np.diff(self.timestamps) < 0):
+            order = np.argsort(self.timestamps, kind='stable')
+            self.timestamps = self.timestamps[order]
+            self.lat = self.lat[order]
+            self.lon = self.lon[order]
+            self.alt = self.alt[order]
+
+    @classmethod
+    def from_samples(cls, samples: List[Dict[str, float]]) -> 'TelemetryTrack':
+        """Builds a track from the legacy list-of-dicts sample format."""
+        return cls(
+            [s['timestamp'] for s in samples],
+            [s['lat'] for s in samples],
+            [s['lon'] for s in samples],
+            [s.get('alt', 0.0) for s in samples]
+        )
+
+    def to_samples(self) -> List[Dict[str, float]]:
+        """Returns the GPS samples in the legacy list-of-dicts format."""
+        return [
+            {'timestamp': t, 'lat': la, 'lon': lo, 'alt': al}
+            for t, la, lo, al in zip(self.timestamps.tolist(), self.lat.tolist(),
+                                     self.lon.tolist(), self.alt.tolist())
+        ]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def has_gps(self) -> bool:
+        return len(self.timestamps) > 0
+
+    def interpolate(self, times) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Linearly interpolates (lat, lon, alt) at the given times (seconds).
+        Times outside the track are clamped to the first/last sample.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        return (
+            np.interp(times, self.timestamps, self.lat),
+            np.interp(times, self.timestamps, self.lon),
+            np.interp(times, self.timestamps, self.alt)
+        )
+
+    def position_at(self, timestamp: float) -> Optional[Tuple[float, float, float]]:
+        """Returns (lat, lon, alt) at a single timestamp, or None if the track is empty."""
+        if not self.has_gps:
+            return None
+        lat, lon, alt = self.interpolate(timestamp)
+        return (float(lat), float(lon), float(alt))
+
+    def courses_at(self, times, span: float = 1.0, min_distance: float = 0.5) -> np.ndarray:
+        """
+        Course over ground (degrees clockwise from north) at each time, from the
+        positions span/2 seconds before and after. NaN where the camera moved less
+        than min_distance meters (heading undefined) or without GPS.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if len(self.timestamps) < 2:
+            return np.full(times.shape, np.nan)
+
+        lat1, lon1, _ = self.interpolate(times - span / 2)
+        lat2, lon2, _ = self.interpolate(times + span / 2)
+        lat1, lat2 = np.radians(lat1), np.radians(lat2)
+        dlon = np.radians(lon2 - lon1)
+        east = np.cos(lat2) * np.sin(dlon)
+        north = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+        course = np.degrees(np.arctan2(east, north)) % 360.0
+        # Small-distance approximation is fine for the movement check
+        return np.where(np.hypot(east, north) * EARTH_RADIUS_M < min_distance, np.nan, course)
+
+    def course_at(self, timestamp: float, span: float = 1.0, min_distance: float = 0.5) -> Optional[float]:
+        """Course over ground at a single timestamp, or None if undefined (see courses_at)."""
+        course = float(self.courses_at([timestamp], span, min_distance)[0])
+        return None if np.isnan(course) else course
+
+    def cumulative_distance(self) -> np.ndarray:
+        """
+        Cumulative ground distance (meters) at each sample, using the haversine
+        distance between consecutive samples.
+        """
+        if len(self.timestamps) < 2:
+            return np.zeros(len(self.timestamps))
+
+        lat = np.radians(self.lat)
+        lon = np.radians(self.lon)
+        a = (np.sin(np.diff(lat) / 2) ** 2
+             + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(np.diff(lon) / 2) ** 2)
+        steps = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+        return np.concatenate(([0.0], np.cumsum(steps)))
+
+    def distance_step_times(self, step: float, start: float = 0.0, end: Optional[float] = None) -> np.ndarray:
+        """
+        Returns the times (seconds) within [start, end] at which the ground distance
+        travelled since `start` crosses 0, step, 2*step, ... meters.
+
+        Crossing times are interpolated linearly between GPS samples. While
+        stationary, no new times are produced.
+        """
+        if not self.has_gps or step <= 0:
+            return np.empty(0)
+        if end is None:
+            end = float(self.timestamps[-1])
+
+        dist = self.cumulative_distance()
+        d_start = np.interp(start, self.timestamps, dist)
+        d_end = np.interp(end, self.timestamps, dist)
+        targets = d_start + np.arange(int(np.floor((d_end - d_start) / step)) + 1) * step
+
+        if len(dist) < 2:
+            return np.full(len(targets), float(start))
+
+        # First sample reaching each target, then interpolate from the previous one
+        idx = np.clip(np.searchsorted(dist, targets, side='left'), 1, len(dist) - 1)
+        d_lo = dist[idx - 1]
+        span = dist[idx] - d_lo
+        frac = np.divide(targets - d_lo, span, out=np.zeros_like(targets), where=span > 0)
+        times = self.timestamps[idx - 1] + np.clip(frac, 0.0, 1.0) * (self.timestamps[idx] - self.timestamps[idx - 1])
+        return np.clip(times, start, end)
+
+
+class TrackBuilder:
+    """
+    Accumulates GPS samples into compact typed arrays, so streaming parsers can
+    build a TelemetryTrack without holding one dict per sample.
+    """
+
+    def __init__(self):
+        self._timestamps = array('d')
+        self._lat = array('d')
+        self._lon = array('d')
+        self._alt = array('d')
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def append(self, timestamp: float, lat: float, lon: float, alt: float = 0.0):
+        self._timestamps.append(timestamp)
+        self._lat.append(lat)
+        self._lon.append(lon)
+        self._alt.append(alt)
+
+    def extend(self, samples: Iterable[Tuple[float, float, float, float]]):
+        for timestamp, lat, lon, alt in samples:
+            self.append(timestamp, lat, lon, alt)
+
+    def build(self, start_time: Optional[float] = None) -> TelemetryTrack:
+        return TelemetryTrack(
+            np.frombuffer(self._timestamps, dtype=np.float64),
+            np.frombuffer(self._lat, dtype=np.float64),
+            np.frombuffer(self._lon, dtype=np.float64),
+            np.frombuffer(self._alt, dtype=np.float64),
+            start_time=start_time
+        )
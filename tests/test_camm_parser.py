@@ -0,0 +1,71 @@
+import unittest
+import struct
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.camm_parser import parse_camm_data, parse_camm_track
+
+
+def gps_packet(epoch, lat, lon, alt, fix=3):
+    payload = struct.pack('<diddf6f', epoch, fix, lat, lon, alt, 1.0, 1.0, 0.0, 0.0, 0.0, 0.5)
+    return struct.pack('<HH', 0, 6) + payload
+
+
+def vec_packet(packet_type, x, y, z):
+    return struct.pack('<HH3f', 0, packet_type, x, y, z)
+
+
+class TestCAMMParser(unittest.TestCase):
+    def test_gps_uses_packet_epoch(self):
+        data = gps_packet(1000.0, 48.0, 2.0, 35.0) + gps_packet(1000.5, 48.1, 2.1, 36.0)
+
+        samples = parse_camm_data(data, duration=10.0)
+
+        self.assertEqual(len(samples), 2)
+        self.assertAlmostEqual(samples[0]['lat'], 48.0)
+        self.assertAlmostEqual(samples[1]['lon'], 2.1)
+        self.assertAlmostEqual(samples[1]['alt'], 36.0, places=4)
+        self.assertAlmostEqual(samples[1]['timestamp'], 0.5)
+
+    def test_gyro_and_accel_are_kept(self):
+        data = b''
+        for i in range(4):
+            data += vec_packet(2, i, 0.0, 0.0) + vec_packet(3, 0.0, 9.8, 0.0)
+        data += gps_packet(1000.0, 48.0, 2.0, 35.0)
+
+        track = parse_camm_track(data, duration=2.0)
+
+        self.assertEqual(len(track), 1)
+        gyro_times, gyro = track.imu['GYRO']
+        accel_times, accel = track.imu['ACCL']
+        self.assertEqual(gyro.shape, (4, 3))
+        self.assertEqual(accel.shape, (4, 3))
+        self.assertAlmostEqual(gyro[3, 0], 3.0)
+        self.assertAlmostEqual(accel[0, 1], 9.8, places=5)
+        self.assertAlmostEqual(gyro_times[2], 1.0)
+
+    def test_resync_after_garbage(self):
+        garbage = b'\xff\x13\x37\x42\x99' * 7
+        data = gps_packet(1000.0, 48.0, 2.0, 35.0) + garbage + gps_packet(1001.0, 48.1, 2.1, 36.0)
+
+        samples = parse_camm_data(data, duration=2.0)
+
+        self.assertEqual(len(samples), 2)
+        self.assertAlmostEqual(samples[1]['lat'], 48.1)
+
+    def test_no_fix_samples_are_dropped(self):
+        data = gps_packet(1000.0, 0.0, 0.0, 0.0, fix=0) + gps_packet(1000.2, 48.0, 2.0, 35.0)
+
+        samples = parse_camm_data(data, duration=1.0)
+
+        self.assertEqual(len(samples), 1)
+
+    def test_empty_stream(self):
+        self.assertEqual(parse_camm_data(b''), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
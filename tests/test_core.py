@@ -12,7 +12,20 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from core.geometry import GeometryProcessor
 from utils.image_utils import ImageUtils
-from utils.gpx_parser import parse_gpx_data
+from utils.gpx_parser import parse_gpx_data, parse_gpx_track
+from utils.srt_parser import parse_srt_data, parse_srt_track
+from utils.telemetry_track import TelemetryTrack
+from core.telemetry_cache import TelemetryCache
+from core.thumbnail_cache import ThumbnailCache
+from core.ingest import VideoInfo, probe_video, probe_videos
+from core.events import EventCounters, VIEW_BLURRY, VIEW_SAVED, FRAME_STATIC
+from core.progress import ProgressTracker, STAGE_DONE, STAGE_EXTRACTING, STAGE_MAPS
+from core.profiling import StageProfiler, NULL_PROFILER, STAGE_DECODE, STAGE_ENCODE, STAGE_REMAP
+from core.tracing import TraceRecorder, CAT_FRAME, CAT_JOB
+from core.gpx_index import GPXIndex, parse_creation_time
+from core.spatial_index import SpatialIndex
+from core.telemetry_export import extract_tracks, write_csv, write_geojson, format_from_path
+from utils.file_manager import FileManager
 
 
 class TestGeometryProcessor(unittest.TestCase):
@@ -182,6 +195,879 @@ class TestGPXParser(unittest.TestCase):
         
         self.assertEqual(len(samples), 1)
 
+    def test_parse_gpx_track_start_time(self):
+        """Test streaming GPX parsing keeps the absolute start time."""
+        import io
+        gpx_content = b'''<?xml version="1.0" encoding="UTF-8"?>
+        <gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">
+            <trk><trkseg>
+                <trkpt lat="1.0" lon="2.0"><time>2024-01-01T00:00:10Z</time></trkpt>
+                <trkpt lat="1.5" lon="2.5"><ele>4.0</ele><time>2024-01-01T00:00:12Z</time></trkpt>
+                <trkpt lat="9.9" lon="9.9"><ele>4.0</ele></trkpt>
+            </trkseg></trk>
+        </gpx>'''
+
+        track = parse_gpx_track(io.BytesIO(gpx_content))
+
+        self.assertEqual(len(track), 2)
+        self.assertEqual(track.start_time, 1704067210.0)
+        self.assertEqual(track.timestamps.tolist(), [0.0, 2.0])
+        self.assertEqual(track.alt.tolist(), [0.0, 4.0])
+
+
+class TestSRTParser(unittest.TestCase):
+    """Tests for the DJI SRT parser."""
+
+    SRT_CONTENT = (
+        "1\n"
+        "00:00:00,000 --> 00:00:00,033\n"
+        "<font size=\"28\">FrameCnt: 1</font>\n"
+        "[iso: 100] [latitude: 48.8566] [longitude: 2.3522] [altitude: 35.5]\n"
+        "\n"
+        "2\n"
+        "00:00:01,500 --> 00:00:01,533\n"
+        "GPS(48.8570, 2.3530, 36.0)\n"
+        "\n"
+        "3\n"
+        "00:00:02,000 --> 00:00:02,033\n"
+        "no telemetry here\n"
+    )
+
+    def test_parse_srt_blocks(self):
+        """Test bracket and GPS(...) forms, skipping cues without coordinates."""
+        samples = parse_srt_data(self.SRT_CONTENT.encode('utf-8'))
+
+        self.assertEqual(len(samples), 2)
+        self.assertAlmostEqual(samples[0]['lat'], 48.8566)
+        self.assertAlmostEqual(samples[0]['alt'], 35.5)
+        self.assertAlmostEqual(samples[1]['timestamp'], 1.5)
+        self.assertAlmostEqual(samples[1]['lon'], 2.3530)
+
+    def test_parse_srt_track_from_lines(self):
+        """Test streaming from an iterable of lines (e.g. a subprocess pipe)."""
+        track = parse_srt_track(iter(self.SRT_CONTENT.splitlines(keepends=True)))
+
+        self.assertEqual(len(track), 2)
+        self.assertAlmostEqual(track.timestamps[1], 1.5)
+
+    def test_parse_srt_crlf(self):
+        """Test Windows line endings."""
+        samples = parse_srt_data(self.SRT_CONTENT.replace("\n", "\r\n").encode('utf-8'))
+
+        self.assertEqual(len(samples), 2)
+
+
+class TestTelemetryTrackDistance(unittest.TestCase):
+    """Tests for distance-based sampling on a telemetry track."""
+
+    def setUp(self):
+        # Due north along a meridian: 0.001 deg latitude ~ 111.2 m per second,
+        # then stationary from t=5 to t=10.
+        lat = np.concatenate([np.arange(6) * 0.001, np.full(5, 0.005)])
+        self.track = TelemetryTrack(np.arange(11.0), lat, np.zeros(11))
+        self.meters_per_step = np.radians(0.001) * 6371008.8
+
+    def test_cumulative_distance(self):
+        """Test haversine cumulative distance."""
+        dist = self.track.cumulative_distance()
+
+        self.assertAlmostEqual(dist[5], 5 * self.meters_per_step, places=3)
+        self.assertEqual(dist[5], dist[-1])
+
+    def test_distance_step_times(self):
+        """Test crossing times are interpolated and absent while stationary."""
+        times = self.track.distance_step_times(self.meters_per_step / 2)
+
+        np.testing.assert_allclose(times, np.arange(11) * 0.5, atol=1e-6)
+
+    def test_distance_step_times_window(self):
+        """Test distance is measured from the window start."""
+        times = self.track.distance_step_times(self.meters_per_step, start=1.5, end=4.0)
+
+        np.testing.assert_allclose(times, [1.5, 2.5, 3.5], atol=1e-6)
+
+    def test_course_at(self):
+        """Test course over ground while moving north, and None when stationary."""
+        self.assertAlmostEqual(self.track.course_at(2.0), 0.0, places=3)
+        self.assertIsNone(self.track.course_at(8.0))
+
+    def test_distance_step_times_without_gps(self):
+        """Test an empty track yields no times."""
+        self.assertEqual(len(TelemetryTrack().distance_step_times(10.0)), 0)
+
+
+class TestSpatialIndex(unittest.TestCase):
+    """Tests for the batch-wide viewpoint deduplication index."""
+
+    # ~1 m of latitude in degrees
+    METER = 1.0 / 111195.0
+
+    def test_position_radius(self):
+        """Test viewpoints within the radius are duplicates, farther ones are not."""
+        index = SpatialIndex(radius_m=2.0)
+
+        self.assertFalse(index.check_and_add(45.0, 6.0, 90.0))
+        self.assertTrue(index.check_and_add(45.0 + 1.5 * self.METER, 6.0, 90.0))
+        self.assertFalse(index.check_and_add(45.0 + 3.0 * self.METER, 6.0, 90.0))
+        self.assertEqual(len(index), 2)
+
+    def test_heading_tolerance(self):
+        """Test the same spot with an opposite heading is kept, wraparound is handled."""
+        index = SpatialIndex(radius_m=2.0, heading_tolerance_deg=30.0)
+        index.add(45.0, 6.0, 350.0)
+
+        self.assertTrue(index.is_duplicate(45.0, 6.0, 10.0))
+        self.assertFalse(index.is_duplicate(45.0, 6.0, 170.0))
+        self.assertTrue(index.is_duplicate(45.0, 6.0, None))
+
+    def test_neighbouring_cell(self):
+        """Test matches across a grid cell boundary."""
+        index = SpatialIndex(radius_m=2.0)
+        index.add(45.0, 6.0)
+
+        self.assertTrue(index.is_duplicate(45.0 - 1.0 * self.METER, 6.0))
+
+
+class TestTelemetryCache(unittest.TestCase):
+    """Tests for the on-disk parsed telemetry cache."""
+
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "clip.mp4")
+        with open(self.video, "wb") as f:
+            f.write(b"\0" * 64)
+        self.cache = TelemetryCache(os.path.join(self.tmp.name, "cache"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        """Test a stored track is returned unchanged, including IMU and start time."""
+        track = TelemetryTrack([0.0, 1.0], [1.0, 2.0], [3.0, 4.0], [5.0, 6.0],
+                               imu={'GYRO': (np.arange(3.0), np.ones((3, 3)))},
+                               start_time=1700000000.0)
+        self.cache.store(self.video, True, track)
+
+        has_gps, loaded = self.cache.load(self.video)
+
+        self.assertTrue(has_gps)
+        self.assertEqual(loaded.lat.tolist(), [1.0, 2.0])
+        self.assertEqual(loaded.start_time, 1700000000.0)
+        self.assertEqual(loaded.imu['GYRO'][1].shape, (3, 3))
+
+    def test_negative_result_cached(self):
+        """Test videos without telemetry are cached too."""
+        self.cache.store(self.video, False, TelemetryTrack())
+
+        has_gps, loaded = self.cache.load(self.video)
+
+        self.assertFalse(has_gps)
+        self.assertEqual(len(loaded), 0)
+        self.assertIsNone(loaded.start_time)
+
+    def test_invalidated_by_file_change(self):
+        """Test modifying the video or adding a sidecar GPX misses the cache."""
+        self.cache.store(self.video, False, TelemetryTrack())
+
+        with open(os.path.join(self.tmp.name, "clip.gpx"), "w") as f:
+            f.write("<gpx/>")
+        self.assertIsNone(self.cache.load(self.video))
+
+        self.cache.store(self.video, False, TelemetryTrack())
+        with open(self.video, "ab") as f:
+            f.write(b"more")
+        self.assertIsNone(self.cache.load(self.video))
+
+    def test_lru_eviction(self):
+        """Test the least recently used entries are evicted past the size cap."""
+        other = os.path.join(self.tmp.name, "other.mp4")
+        with open(other, "wb") as f:
+            f.write(b"\1" * 64)
+        track = TelemetryTrack(np.arange(1000.0), np.zeros(1000), np.zeros(1000))
+
+        self.cache.store(self.video, True, track)
+        entry_size = sum(e.stat().st_size for e in os.scandir(self.cache.cache_dir))
+        self.cache.max_bytes = int(entry_size * 1.5)
+        self.cache.store(other, True, track)
+
+        self.assertIsNone(self.cache.load(self.video))
+        self.assertIsNotNone(self.cache.load(other))
+
+
+class TestThumbnailCache(unittest.TestCase):
+    """Tests for the on-disk thumbnail cache."""
+
+    def setUp(self):
+        import tempfile
+        import cv2
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "clip.mp4")
+        writer = cv2.VideoWriter(self.video, cv2.VideoWriter_fourcc(*'mp4v'), 10, (128, 64))
+        for _ in range(3):
+            writer.write(np.full((64, 128, 3), 120, np.uint8))
+        writer.release()
+        self.cache = ThumbnailCache(os.path.join(self.tmp.name, "thumbs"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_generated_once(self):
+        """Test a thumbnail is decoded on the first request and read from disk afterwards."""
+        from unittest import mock
+
+        first = self.cache.get(self.video, size=32)
+        with mock.patch.object(ThumbnailCache, 'generate') as generate:
+            second = self.cache.get(self.video, size=32)
+
+        generate.assert_not_called()
+        self.assertEqual(first.shape, (32, 32, 3))
+        self.assertEqual(second.shape, (32, 32, 3))
+
+    def test_invalidated_by_file_change(self):
+        """Test modifying the video misses the cache."""
+        self.cache.get(self.video, size=32)
+        with open(self.video, "ab") as f:
+            f.write(b"more")
+        self.assertIsNone(self.cache.load(self.video, size=32))
+
+    def test_eviction(self):
+        """Test the cache keeps at most max_entries thumbnails."""
+        self.cache.max_entries = 1
+        self.cache.store(self.video, np.zeros((8, 8, 3), np.uint8), size=8)
+        self.cache.store(self.video, np.zeros((16, 16, 3), np.uint8), size=16)
+
+        self.assertEqual(len(os.listdir(self.cache.cache_dir)), 1)
+
+    def thumbnail_path(self, size):
+        return self.cache.cache_dir / f"{self.cache.key_for(self.video, size)}.jpg"
+
+    def test_eviction_least_recently_used(self):
+        """Test a cache hit refreshes the entry, so eviction drops the least recently used one."""
+        import time
+
+        self.cache.max_entries = 2
+        for age, size in ((200, 8), (100, 16)):
+            self.cache.store(self.video, np.zeros((size, size, 3), np.uint8), size=size)
+            old = time.time() - age
+            os.utime(self.thumbnail_path(size), (old, old))
+
+        self.assertIsNotNone(self.cache.load(self.video, size=8))
+        self.cache.store(self.video, np.zeros((24, 24, 3), np.uint8), size=24)
+
+        self.assertTrue(self.thumbnail_path(8).exists())
+        self.assertFalse(self.thumbnail_path(16).exists())
+        self.assertTrue(self.thumbnail_path(24).exists())
+
+    def test_eviction_skips_vanished_entries(self):
+        """Test an entry removed by another process during the scan doesn't fail the store."""
+        from pathlib import Path
+        from unittest import mock
+
+        self.cache.max_entries = 1
+        self.cache.store(self.video, np.zeros((8, 8, 3), np.uint8), size=8)
+        vanished = self.thumbnail_path(8)
+        real_stat = Path.stat
+
+        def stat(path, *args, **kwargs):
+            if path == vanished:
+                raise FileNotFoundError(path)
+            return real_stat(path, *args, **kwargs)
+
+        with mock.patch.object(Path, 'stat', stat):
+            self.cache.store(self.video, np.zeros((16, 16, 3), np.uint8), size=16)
+        self.assertTrue(self.thumbnail_path(16).exists())
+
+    def test_eviction_scans_only_when_full(self):
+        """Test stores below the limit don't rescan the cache directory."""
+        from pathlib import Path
+        from unittest import mock
+
+        self.cache.max_entries = 10
+        with mock.patch.object(Path, 'glob', wraps=self.cache.cache_dir.glob) as glob:
+            for size in range(8, 14):
+                self.cache.store(self.video, np.zeros((size, size, 3), np.uint8), size=size)
+        self.assertEqual(glob.call_count, 1)
+
+
+class TestIngest(unittest.TestCase):
+    """Tests for probing dropped/found files before they are queued."""
+
+    FFPROBE_OUTPUT = {
+        'streams': [
+            {'codec_type': 'video', 'codec_name': 'h264', 'width': 5760, 'height': 2880,
+             'avg_frame_rate': '30000/1001', 'nb_frames': '900', 'disposition': {'attached_pic': 0}},
+            {'codec_type': 'audio'},
+            {'codec_type': 'data', 'codec_tag_string': 'gpmd'},
+            {'codec_type': 'video', 'width': 320, 'height': 320, 'disposition': {'attached_pic': 1}},
+        ],
+        'format': {'duration': '30.03'}
+    }
+
+    def setUp(self):
+        import tempfile
+        import cv2
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "clip.mp4")
+        writer = cv2.VideoWriter(self.video, cv2.VideoWriter_fourcc(*'mp4v'), 10, (128, 64))
+        for _ in range(5):
+            writer.write(np.full((64, 128, 3), 120, np.uint8))
+        writer.release()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_ffprobe_streams(self):
+        """Test resolution, frame rate, duration and telemetry are read from ffprobe's JSON."""
+        import json
+        from unittest import mock
+
+        result = mock.Mock(stdout=json.dumps(self.FFPROBE_OUTPUT))
+        with mock.patch('core.ingest.subprocess.run', return_value=result):
+            info = probe_video(self.video)
+
+        self.assertEqual((info.width, info.height, info.frame_count), (5760, 2880, 900))
+        self.assertAlmostEqual(info.fps, 29.97, places=2)
+        self.assertAlmostEqual(info.duration, 30.03)
+        self.assertEqual(info.telemetry, ['GPMF'])
+        self.assertIsNone(info.problem)
+
+    def test_opencv_fallback(self):
+        """Test files are still probed through OpenCV when ffprobe is not installed."""
+        from unittest import mock
+
+        with mock.patch('core.ingest.subprocess.run', side_effect=FileNotFoundError):
+            info = probe_video(self.video)
+
+        self.assertEqual((info.width, info.height, info.frame_count), (128, 64, 5))
+        self.assertIsNone(info.problem)
+
+    def test_problems(self):
+        """Test unreadable, missing and non-2:1 files are rejected with a reason."""
+        from unittest import mock
+
+        broken = os.path.join(self.tmp.name, "broken.mp4")
+        with open(broken, "wb") as f:
+            f.write(b"not a video")
+
+        with mock.patch('core.ingest.subprocess.run', side_effect=FileNotFoundError):
+            self.assertIn("unreadable", probe_video(broken).problem)
+        self.assertEqual(probe_video(os.path.join(self.tmp.name, "missing.mp4")).problem, "file not found")
+        self.assertIn("not equirectangular", VideoInfo("a.mp4", width=1920, height=1080).problem)
+
+    def test_probe_videos_keeps_order(self):
+        """Test concurrent probing yields results in input order."""
+        from unittest import mock
+
+        paths = [self.video, os.path.join(self.tmp.name, "missing.mp4"), self.video]
+        with mock.patch('core.ingest.subprocess.run', side_effect=FileNotFoundError):
+            infos = list(probe_videos(paths, workers=3))
+
+        self.assertEqual([info.path for info in infos], paths)
+        self.assertEqual([info.problem is None for info in infos], [True, False, True])
+
+    def test_estimate_images(self):
+        """Test the cost estimate follows the interval and the active cameras."""
+        info = VideoInfo("a.mp4", width=3840, height=1920, fps=30.0, frame_count=300)
+
+        self.assertEqual(info.estimate_images({'interval_value': 1.0, 'camera_count': 6, 'layout_mode': 'ring'}), 60)
+        self.assertEqual(info.estimate_images({'interval_value': 7, 'interval_unit': 'Frames', 'camera_count': 6,
+                                               'layout_mode': 'ring', 'active_cameras': [0, 2]}), 86)
+
+
+class TestEventCounters(unittest.TestCase):
+    """Tests for the extraction event counters."""
+
+    def test_counts_per_view(self):
+        """Test totals and per-view counts are kept separately."""
+        counters = EventCounters()
+        for view in ("View_0", "View_0", "View_3"):
+            counters.record(VIEW_BLURRY, view)
+        counters.record(FRAME_STATIC)
+
+        self.assertEqual(counters.count(VIEW_BLURRY), 3)
+        self.assertEqual(counters.count(VIEW_BLURRY, "View_0"), 2)
+        self.assertEqual(counters.by_view(VIEW_BLURRY), {"View_0": 2, "View_3": 1})
+        self.assertEqual(counters.count(FRAME_STATIC), 1)
+
+    def test_summary(self):
+        """Test the summary lists non-zero counts with a per-view breakdown of blurry views."""
+        counters = EventCounters()
+        counters.record(VIEW_SAVED, "View_1", count=4)
+        counters.record(VIEW_BLURRY, "View_3", count=2)
+        counters.record(VIEW_BLURRY, "View_0")
+
+        self.assertEqual(counters.summary(),
+                         "4 views saved, 3 blurry views skipped (View_3: 2, View_0: 1)")
+        self.assertEqual(EventCounters().summary(), "nothing extracted")
+
+    def test_merge(self):
+        """Test job counters add up into batch totals."""
+        batch = EventCounters()
+        for _ in range(2):
+            job = EventCounters()
+            job.record(VIEW_SAVED, "View_0")
+            batch.merge(job)
+        self.assertEqual(batch.count(VIEW_SAVED, "View_0"), 2)
+
+    def test_summary_due(self):
+        """Test periodic summaries are due once per interval."""
+        counters = EventCounters(summary_interval=10.0)
+        start = counters._last_summary
+        self.assertFalse(counters.summary_due(start + 5))
+        self.assertTrue(counters.summary_due(start + 11))
+        self.assertFalse(counters.summary_due(start + 12))
+
+
+class TestProgressTracker(unittest.TestCase):
+    """Tests for rate-limited progress events."""
+
+    def setUp(self):
+        self.now = 0.0
+        self.events = []
+        self.tracker = ProgressTracker(1, 4, "clip.mp4", 1000, self.events.append, rate=10.0,
+                                       smoothing=0.5, clock=lambda: self.now)
+
+    def test_rate_limited(self):
+        """Test updates closer than 1/rate seconds apart are dropped."""
+        self.tracker.min_interval = 0.125
+        self.tracker.start()
+        for frame in range(1, 129):
+            self.now = frame / 64
+            self.tracker.update(frame, 0)
+
+        # One event per 0.125 s after the map stage at t = 0
+        self.assertEqual(self.events[0].stage, STAGE_MAPS)
+        self.assertEqual([e.frames_done for e in self.events[1:]], list(range(8, 129, 8)))
+
+    def test_smoothed_eta(self):
+        """Test the ETA follows an exponentially smoothed frame rate."""
+        self.tracker.start()
+        self.now = 1.0
+        self.tracker.update(100, 600)    # 100 fps
+        self.now = 2.0
+        self.tracker.update(300, 1800)   # 200 fps -> smoothed 150
+
+        event = self.events[-1]
+        self.assertAlmostEqual(event.fps, 150.0)
+        self.assertAlmostEqual(event.views_per_second, 900.0)
+        self.assertAlmostEqual(event.eta, 700 / 150.0)
+        self.assertEqual(event.percent, 30)
+        self.assertAlmostEqual(event.overall_percent, 32.5)
+
+    def test_finish(self):
+        """Test finishing always emits a complete event."""
+        self.tracker.update(10, 0)
+        self.tracker.finish(990, 60)
+
+        event = self.events[-1]
+        self.assertEqual(event.stage, STAGE_DONE)
+        self.assertEqual(event.percent, 100)
+        self.assertEqual(event.eta, 0.0)
+
+
+class TestStageProfiler(unittest.TestCase):
+    """Tests for per-stage timing."""
+
+    def setUp(self):
+        self.now = 0.0
+        self.profiler = StageProfiler(clock=lambda: self.now)
+
+    def test_percentiles(self):
+        """Test counts, totals and nearest-rank p50/p95 per stage."""
+        self.profiler.start()
+        for ms in range(1, 21):
+            with self.profiler.stage(STAGE_REMAP):
+                self.now += ms / 1000
+        self.profiler.add_bytes(STAGE_ENCODE, 2048)
+        self.profiler.stop()
+
+        report = self.profiler.report()
+        remap = report['stages'][STAGE_REMAP]
+        self.assertEqual(remap['count'], 20)
+        self.assertAlmostEqual(remap['total'], 0.210)
+        self.assertAlmostEqual(remap['p50'], 0.010)
+        self.assertAlmostEqual(remap['p95'], 0.019)
+        self.assertAlmostEqual(remap['max'], 0.020)
+        self.assertEqual(report['stages'][STAGE_ENCODE]['bytes'], 2048)
+        self.assertAlmostEqual(report['wall_time'], 0.210)
+        self.assertIn("remap", self.profiler.format_table())
+
+    def test_null_profiler(self):
+        """Test the disabled profiler records nothing."""
+        with NULL_PROFILER.stage(STAGE_REMAP):
+            pass
+        NULL_PROFILER.add_bytes(STAGE_ENCODE, 10)
+        self.assertFalse(NULL_PROFILER.enabled)
+        self.assertFalse(hasattr(NULL_PROFILER, 'report'))
+
+
+class TestTraceRecorder(unittest.TestCase):
+    """Tests for Chrome trace-event export."""
+
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "trace.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def load(self):
+        import json
+        with open(self.path) as f:
+            return json.load(f)['traceEvents']
+
+    def test_events(self):
+        """Test spans, stages and counters from several threads become trace events."""
+        import threading
+        tracer = TraceRecorder(self.path)
+        with tracer.span("clip.mp4", CAT_JOB, {'index': 0}):
+            with tracer.stage(STAGE_REMAP):
+                pass
+            tracer.counter('queues', {'pending_exif': 3})
+        worker = threading.Thread(target=lambda: tracer.add(STAGE_ENCODE, 0.5), name="telemetry_0")
+        worker.start()
+        worker.join()
+        tracer.close()
+
+        events = self.load()
+        names = {e['args']['name'] for e in events if e['name'] == 'thread_name'}
+        self.assertEqual(names, {threading.current_thread().name, "telemetry_0"})
+        job = next(e for e in events if e.get('cat') == CAT_JOB)
+        remap = next(e for e in events if e['name'] == STAGE_REMAP)
+        self.assertEqual((job['ph'], job['args']), ('X', {'index': 0}))
+        self.assertLessEqual(job['ts'], remap['ts'])
+        self.assertEqual(next(e for e in events if e['ph'] == 'C')['args'], {'pending_exif': 3})
+        self.assertEqual(next(e for e in events if e['name'] == STAGE_ENCODE)['dur'], 500000.0)
+
+    def test_flush_batches(self):
+        """Test events are written in batches and the file stays valid JSON."""
+        tracer = TraceRecorder(self.path, flush_events=10)
+        for _ in range(25):
+            with tracer.stage(STAGE_REMAP):
+                pass
+        self.assertLess(len(tracer._events), 10)
+        tracer.close()
+
+        events = self.load()
+        self.assertEqual(sum(1 for e in events if e['name'] == STAGE_REMAP), 25)
+        self.assertTrue(any(e['name'] == 'trace_flush' for e in events))
+
+
+class TestExtractionEngine(unittest.TestCase):
+    """Tests for the Qt-free extraction engine."""
+
+    def setUp(self):
+        import tempfile
+        import cv2
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "clip.mp4")
+        writer = cv2.VideoWriter(self.video, cv2.VideoWriter_fourcc(*'mp4v'), 10, (128, 64))
+        for i in range(6):
+            writer.write(np.full((64, 128, 3), 40 * i, np.uint8))
+        writer.release()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_does_not_load_ai_stack(self):
+        """Test importing the engine doesn't import torch or PySide6."""
+        import subprocess
+        code = ("import sys; sys.path.insert(0, %r); import core.engine; "
+                "print('torch' in sys.modules, 'ultralytics' in sys.modules, 'PySide6' in sys.modules)"
+                % os.path.join(os.path.dirname(__file__), '..', 'src'))
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.split(), ['False', 'False', 'False'])
+
+    def test_runs_without_pyside(self):
+        """Test the engine imports and runs a job through its callbacks with PySide6 blocked."""
+        import json
+        import subprocess
+        out_dir = os.path.join(self.tmp.name, "out")
+        os.makedirs(out_dir)
+        code = """
+import json, sys
+sys.path.insert(0, %r)
+sys.modules['PySide6'] = None  # any Qt import now raises ImportError
+from core.engine import ExtractionEngine
+from core.job import Job
+job = Job(file_path=%r, settings={
+    'interval_value': 2, 'interval_unit': 'Frames', 'camera_count': 2, 'layout_mode': 'ring',
+    'resolution': 16, 'custom_output_dir': %r, 'ai_mode': 'None'
+})
+calls = []
+ExtractionEngine(
+    [job],
+    on_progress=lambda event: calls.append(['progress', event.percent]),
+    on_job_started=lambda i: calls.append(['started', i]),
+    on_job_finished=lambda i: calls.append(['finished', i]),
+    on_error=lambda message: calls.append(['error', message]),
+    on_finished=lambda: calls.append(['done']),
+).run()
+print(json.dumps(calls))
+""" % (os.path.join(os.path.dirname(__file__), '..', 'src'), self.video, out_dir)
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        calls = json.loads(result.stdout.strip().splitlines()[-1])
+        lifecycle = [call for call in calls if call[0] != 'progress']
+        self.assertEqual(lifecycle, [['started', 0], ['finished', 0], ['done']])
+        self.assertEqual(calls[-3], ['progress', 100])
+        self.assertEqual(len(os.listdir(os.path.join(out_dir, "clip_processed"))), 6)
+
+    def test_callbacks(self):
+        """Test a run reports through plain callbacks and writes one image per view and extracted frame."""
+        from core.engine import ExtractionEngine
+        from core.job import Job
+
+        out_dir = os.path.join(self.tmp.name, "out")
+        os.makedirs(out_dir)
+        job = Job(file_path=self.video, settings={
+            'interval_value': 2, 'interval_unit': 'Frames', 'camera_count': 2, 'layout_mode': 'ring',
+            'resolution': 16, 'custom_output_dir': out_dir, 'ai_mode': 'None'
+        })
+        calls = []
+        events = []
+        engine = ExtractionEngine(
+            [job],
+            on_progress=events.append,
+            on_job_started=lambda i: calls.append(('started', i)),
+            on_job_finished=lambda i: calls.append(('finished', i)),
+            on_error=lambda message: calls.append(('error', message)),
+            on_finished=lambda: calls.append(('done',)),
+        )
+        engine.run()
+
+        self.assertEqual(calls, [('started', 0), ('finished', 0), ('done',)])
+        self.assertEqual(events[-1].percent, 100)
+        self.assertEqual(events[-1].views_written, 6)
+        self.assertEqual(len(os.listdir(os.path.join(out_dir, "clip_processed"))), 6)
+        self.assertEqual(engine.counters.count(VIEW_SAVED), 6)
+        self.assertFalse(engine.profiler.enabled)
+
+    def test_dedup_registers_saved_frames_only(self):
+        """Test frames whose views are all filtered out don't block later passes as duplicates."""
+        from core.engine import ExtractionEngine
+        from core.job import Job
+        from core.telemetry import TelemetryHandler
+        from core.events import FRAME_DUPLICATE
+
+        out_dir = os.path.join(self.tmp.name, "out")
+        os.makedirs(out_dir)
+        settings = {
+            'interval_value': 2, 'interval_unit': 'Frames', 'camera_count': 2, 'layout_mode': 'ring',
+            'resolution': 16, 'custom_output_dir': out_dir, 'ai_mode': 'None',
+            'spatial_dedup_enabled': True, 'spatial_dedup_radius': 5.0,
+        }
+        # Standing still: every planned frame is at the same viewpoint
+        handler = TelemetryHandler()
+        handler.track = TelemetryTrack(np.arange(10.0), np.full(10, 48.0), np.full(10, 11.0))
+
+        def run(job_settings):
+            engine = ExtractionEngine([Job(file_path=self.video, settings=job_settings)])
+            engine._extract_telemetry = lambda path: handler
+            engine.run()
+            return engine
+
+        # Flat frames are all blurry: nothing saved, so nothing may be registered
+        engine = run(dict(settings, blur_filter_enabled=True, blur_threshold=100.0))
+        self.assertEqual(engine.counters.count(VIEW_SAVED), 0)
+        self.assertEqual(engine.counters.count(FRAME_DUPLICATE), 0)
+        self.assertEqual(len(engine.spatial_index), 0)
+
+        engine = run(settings)
+        self.assertEqual(engine.counters.count(VIEW_SAVED), 2)
+        self.assertEqual(engine.counters.count(FRAME_DUPLICATE), 3)  # planned frames 2, 4 and 6 (end)
+        self.assertEqual(len(engine.spatial_index), 1)
+
+    def test_failed_job_drops_telemetry(self):
+        """Test a job that fails doesn't leave its telemetry future behind."""
+        import threading
+        from core.engine import ExtractionEngine
+        from core.job import Job
+        from core.telemetry import TelemetryHandler
+
+        settings = {'interval_value': 2, 'interval_unit': 'Frames', 'ai_mode': 'None',
+                    'spatial_dedup_enabled': True}
+        jobs = [Job(file_path=os.path.join(self.tmp.name, f"missing{i}.mp4"), settings=settings) for i in range(2)]
+        errors = []
+        release = threading.Event()
+        engine = ExtractionEngine(jobs, on_error=errors.append)
+        engine._extract_telemetry = lambda path: release.wait(5) and TelemetryHandler()
+        engine.run()
+        release.set()
+
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(engine.telemetry_futures, {})
+
+    def test_profile_stages(self):
+        """Test the profile_stages setting times each stage and reports it before finishing."""
+        from core.engine import ExtractionEngine
+        from core.job import Job
+
+        out_dir = os.path.join(self.tmp.name, "out")
+        os.makedirs(out_dir)
+        job = Job(file_path=self.video, settings={
+            'interval_value': 2, 'interval_unit': 'Frames', 'camera_count': 2, 'layout_mode': 'ring',
+            'resolution': 16, 'custom_output_dir': out_dir, 'ai_mode': 'None', 'profile_stages': True
+        })
+        calls = []
+        engine = ExtractionEngine([job], on_profile=lambda p: calls.append(p.report()),
+                                  on_finished=lambda: calls.append('done'))
+        engine.run()
+
+        report, done = calls
+        self.assertEqual(done, 'done')
+        self.assertEqual(report['stages'][STAGE_DECODE]['count'], 4)  # frames 0, 2, 4 and the read at the end
+        self.assertEqual(report['stages'][STAGE_REMAP]['count'], 6)
+        self.assertEqual(report['stages'][STAGE_ENCODE]['count'], 6)
+        self.assertGreater(report['stages'][STAGE_ENCODE]['bytes'], 0)
+
+    def test_trace(self):
+        """Test a tracer records the job, each extracted frame and its stages."""
+        import json
+        from core.engine import ExtractionEngine
+        from core.job import Job
+
+        out_dir = os.path.join(self.tmp.name, "out")
+        os.makedirs(out_dir)
+        job = Job(file_path=self.video, settings={
+            'interval_value': 2, 'interval_unit': 'Frames', 'camera_count': 2, 'layout_mode': 'ring',
+            'resolution': 16, 'custom_output_dir': out_dir, 'ai_mode': 'None'
+        })
+        trace_path = os.path.join(self.tmp.name, "trace.json")
+        tracer = TraceRecorder(trace_path)
+        ExtractionEngine([job], tracer=tracer).run()
+        tracer.close()
+
+        with open(trace_path) as f:
+            events = json.load(f)['traceEvents']
+        categories = [e.get('cat') for e in events]
+        self.assertEqual(categories.count(CAT_JOB), 1)
+        self.assertEqual(categories.count(CAT_FRAME), 3)
+        self.assertEqual(sum(1 for e in events if e['name'] == STAGE_REMAP), 6)
+        self.assertEqual(sum(1 for e in events if e['name'] == 'queues'), 3)
+
+
+class TestCapabilities(unittest.TestCase):
+    """Tests for capability checks that avoid heavy imports."""
+
+    def test_module_available(self):
+        """Test modules are found without being imported."""
+        from core.capabilities import module_available
+
+        self.assertTrue(module_available('json'))
+        self.assertFalse(module_available('no_such_module_360'))
+
+    def test_probe_device_info(self):
+        """Test the device probe has the AIService.get_device_info() format."""
+        from core.capabilities import probe_device_info
+
+        info = probe_device_info()
+        self.assertEqual(set(info), {'device', 'device_name', 'is_accelerated'})
+        self.assertIn(info['device'], ('cpu', 'mps', 'cuda'))
+
+
+class TestGPXIndex(unittest.TestCase):
+    """Tests for shared GPX log matching by recording time."""
+
+    def setUp(self):
+        # Two logs: 1000..1009 and 2000..2009 (UNIX time), one point per second
+        self.index = GPXIndex([
+            TelemetryTrack(np.arange(10.0), np.arange(10.0), np.zeros(10), start_time=1000.0),
+            TelemetryTrack(np.arange(10.0), np.arange(10.0) + 100, np.zeros(10), start_time=2000.0),
+        ])
+
+    def test_window_slice(self):
+        """Test a video window returns relative timestamps with edge samples."""
+        track = self.index.track_for(1002.5, 3.0)
+
+        self.assertEqual(track.timestamps[0], -0.5)
+        self.assertEqual(track.timestamps[-1], 3.5)
+        self.assertAlmostEqual(track.position_at(0.0)[0], 2.5)
+        self.assertEqual(track.start_time, 1002.5)
+
+    def test_second_log_and_offset(self):
+        """Test matching in a later log, with a camera clock offset."""
+        self.index.time_offset = 3600.0
+        track = self.index.track_for(2003.0 - 3600.0, 1.0)
+
+        self.assertAlmostEqual(track.position_at(0.0)[0], 103.0)
+
+    def test_window_outside_logs(self):
+        """Test a window with no overlap yields no GPS."""
+        self.assertFalse(self.index.track_for(5000.0, 10.0).has_gps)
+        self.assertFalse(GPXIndex([]).track_for(1000.0, 1.0).has_gps)
+
+    def test_parse_creation_time(self):
+        """Test container creation_time parsing, with stream-tag fallback."""
+        probe = {'format': {'tags': {}}, 'streams': [{'tags': {'creation_time': '2024-01-01T00:00:10.000000Z'}}]}
+        self.assertEqual(parse_creation_time(probe), 1704067210.0)
+        self.assertIsNone(parse_creation_time({'format': {}}))
+
+
+class TestTelemetryExport(unittest.TestCase):
+    """Tests for the telemetry-only batch export."""
+
+    GPX = '''<gpx><trk><trkseg>
+        <trkpt lat="1.0" lon="2.0"><ele>3.0</ele><time>2024-01-01T00:00:00Z</time></trkpt>
+        <trkpt lat="1.5" lon="2.5"><ele>4.0</ele><time>2024-01-01T00:00:01Z</time></trkpt>
+    </trkseg></trk></gpx>'''
+
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.tmp.name, "day1"))
+        self.videos = []
+        for name in ("day1/b.mp4", "a.MOV"):
+            path = os.path.join(self.tmp.name, name)
+            open(path, "wb").close()
+            self.videos.append(path)
+        open(os.path.join(self.tmp.name, "notes.txt"), "w").close()
+        with open(os.path.join(self.tmp.name, "a.gpx"), "w") as f:
+            f.write(self.GPX)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_find_videos(self):
+        """Test recursive, case-insensitive, sorted video discovery."""
+        found = FileManager.find_videos(self.tmp.name)
+
+        self.assertEqual(found, sorted(self.videos))
+        self.assertEqual(FileManager.find_videos(self.videos[0]), [self.videos[0]])
+
+    def test_extract_and_write(self):
+        """Test parallel extraction (GPX sidecar) and CSV/GeoJSON output."""
+        import csv
+        import json
+        sidecar_video = os.path.join(self.tmp.name, "a.MOV")
+        tracks = extract_tracks([sidecar_video], workers=2)
+
+        self.assertEqual(len(tracks[0][1]), 2)
+
+        csv_path = os.path.join(self.tmp.name, "out.csv")
+        write_csv(csv_path, tracks)
+        with open(csv_path) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]['clip'], "a.MOV")
+        self.assertEqual(float(rows[1]['utc']), 1704067201.0)
+
+        geojson_path = os.path.join(self.tmp.name, "out.geojson")
+        write_geojson(geojson_path, tracks + [("empty.mp4", TelemetryTrack())])
+        with open(geojson_path) as f:
+            features = json.load(f)['features']
+        self.assertEqual(len(features), 1)
+        self.assertEqual(features[0]['geometry']['coordinates'][0], [2.0, 1.0, 3.0])
+
+    def test_format_from_path(self):
+        """Test output format detection."""
+        self.assertEqual(format_from_path("tracks.GeoJSON"), 'geojson')
+        self.assertEqual(format_from_path("tracks.parquet"), 'parquet')
+        self.assertIsNone(format_from_path("tracks.txt"))
+
 
 class TestJobModel(unittest.TestCase):
     """Tests for Job dataclass."""
@@ -228,6 +1114,136 @@ class TestJobModel(unittest.TestCase):
         self.assertIn("8", summary)
 
 
+class TestJobQueueModel(unittest.TestCase):
+    """Tests for the virtualized job queue model (no widgets needed)."""
+
+    def setUp(self):
+        from unittest import mock
+        from core.job import Job
+        from ui.job_queue import JobQueueModel, ProgressRole
+        from ui.thumbnail_loader import ThumbnailLoader
+
+        self.ProgressRole = ProgressRole
+        # Paths don't exist; keep the loader from queueing thumbnail work
+        self.patches = [mock.patch.object(ThumbnailLoader, name) for name in ('request', 'release')]
+        self.request, self.release = [patch.start() for patch in self.patches]
+
+        self.jobs = [Job(file_path=f"/videos/clip{i}.mp4") for i in range(6)]
+        self.model = JobQueueModel()
+        self.model.add_jobs(list(self.jobs))
+
+        self.removed = []
+        self.changed = []
+        self.model.rowsRemoved.connect(lambda parent, first, last: self.removed.append((first, last)))
+        self.model.dataChanged.connect(lambda a, b, roles: self.changed.append((a.row(), b.row(), list(roles))))
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+    def test_remove_rows_merges_runs(self):
+        """Test adjacent rows are removed together, from the bottom up."""
+        self.model.remove_rows([4, 1, 2, 2, 9])
+
+        self.assertEqual(self.removed, [(4, 4), (1, 2)])
+        self.assertEqual(self.model.jobs, [self.jobs[i] for i in (0, 3, 5)])
+        self.assertEqual(self.release.call_count, 3)
+
+    def test_row_lookup_after_removal(self):
+        """Test jobs map to their new rows after removals and removed jobs are gone."""
+        self.model.remove_rows([0, 2])
+
+        self.assertEqual(self.model.row_of(self.jobs[3]), 1)
+        self.assertEqual(self.model.row_of(self.jobs[5]), 3)
+        self.assertEqual(self.model.row_of(self.jobs[0]), -1)
+        self.assertIs(self.model.job_at(2), self.jobs[4])
+
+    def test_progress_repaints_one_row(self):
+        """Test progress changes emit dataChanged for their row only, and only when the value changes."""
+        self.model.set_progress(3, 40)
+        self.model.set_progress(3, 40)
+        self.model.set_progress(-1, 10)
+
+        self.assertEqual(self.changed, [(3, 3, [self.ProgressRole])])
+        self.assertEqual(self.model.data(self.model.index(3), self.ProgressRole), 40)
+
+        self.model.set_status(3, "Done")
+        self.assertEqual(self.changed[-1], (3, 3, []))
+        self.assertEqual(self.model.data(self.model.index(3), self.ProgressRole), 0)
+
+    def test_reset_status(self):
+        """Test resetting every status repaints all rows at once."""
+        self.model.set_status(1, "Error")
+        self.changed.clear()
+
+        self.model.reset_status("Pending")
+
+        self.assertEqual(self.changed, [(0, 5, [])])
+        self.assertTrue(all(job.status == "Pending" for job in self.model.jobs))
+
+    def test_duplicate_path_keeps_thumbnail(self):
+        """Test removing one of two rows with the same file doesn't release its thumbnail."""
+        from core.job import Job
+        self.model.add_jobs([Job(file_path=self.jobs[0].file_path)])
+        released = []
+        self.model.thumbnail_released.connect(released.append)
+
+        self.model.remove_rows([0])
+        self.release.assert_not_called()
+        self.assertEqual(self.model.row_of(self.model.jobs[-1]), 5)
+
+        self.model.remove_rows([5])
+        self.release.assert_called_once_with(self.jobs[0].file_path)
+        self.assertEqual(released, [self.jobs[0].file_path])
+
+    def test_remove_duplicates_together(self):
+        """Test removing every row of a file in one call releases its thumbnail once."""
+        from core.job import Job
+        self.model.add_jobs([Job(file_path=self.jobs[0].file_path)])
+
+        self.model.remove_rows([0, 6])
+
+        self.release.assert_called_once_with(self.jobs[0].file_path)
+
+    def test_clear_releases_thumbnails(self):
+        """Test clearing the queue releases every thumbnail."""
+        released = []
+        self.model.thumbnail_released.connect(released.append)
+
+        self.model.clear()
+
+        self.assertEqual(sorted(released), sorted(job.file_path for job in self.jobs))
+        self.assertEqual(self.release.call_count, 6)
+
+
+class TestThumbnailLoader(unittest.TestCase):
+    """Tests for the shared thumbnail loader's in-memory images."""
+
+    def setUp(self):
+        from unittest import mock
+        from PySide6.QtGui import QImage
+        from ui.thumbnail_loader import ThumbnailLoader
+
+        self.loader = ThumbnailLoader(cache=mock.Mock(spec=ThumbnailCache), max_images=2)
+        self.image = QImage(8, 8, QImage.Format_RGB888)
+
+    def test_least_recently_used_dropped(self):
+        """Test only the max_images most recently used thumbnails stay in memory."""
+        self.loader._on_finished("a.mp4", self.image)
+        self.loader._on_finished("b.mp4", self.image)
+        self.assertIsNotNone(self.loader.thumbnail("a.mp4"))
+        self.loader._on_finished("c.mp4", self.image)
+
+        self.assertEqual(list(self.loader.images), ["a.mp4", "c.mp4"])
+        self.assertIsNone(self.loader.thumbnail("b.mp4"))
+
+    def test_release_drops_image(self):
+        """Test releasing a path forgets its thumbnail."""
+        self.loader._on_finished("a.mp4", self.image)
+        self.loader.release("a.mp4")
+        self.assertIsNone(self.loader.thumbnail("a.mp4"))
+
+
 class TestSettingsManager(unittest.TestCase):
     """Tests for SettingsManager singleton."""
     
@@ -90,5 +90,61 @@ class TestGPMFParser(unittest.TestCase):
         self.assertEqual(result[0]['timestamp'], 0.0)
         self.assertAlmostEqual(result[1]['timestamp'], 1.0/18.0)
 
+    def test_parser_gps9_complex_type(self):
+        # GPS9 uses a complex type described by the TYPE tag: 7 int32 + 2 uint16
+        type_block = self.pack_klv('TYPE', 'c', 1, 9, b'lllllllSS')
+        scal_values = [10000000, 10000000, 1000, 1000, 100, 1, 1000, 100, 1]
+        scal_block = self.pack_klv('SCAL', 'l', 4, 9, struct.pack('>9i', *scal_values))
+        gps_data = struct.pack('>7i2H', 488566000, 23522000, 35000, 0, 0, 9000, 43200000, 150, 3)
+        gps_block = self.pack_klv('GPS9', '?', 32, 1, gps_data)
+
+        strm_payload = type_block + scal_block + gps_block
+        strm_block = self.pack_klv('STRM', '\0', 1, len(strm_payload), strm_payload)
+        devc_block = self.pack_klv('DEVC', '\0', 1, len(strm_block), strm_block)
+
+        result = GPMFParser().parse(devc_block)
+
+        self.assertEqual(len(result), 1)
+        self.assertAlmostEqual(result[0]['lat'], 48.8566)
+        self.assertAlmostEqual(result[0]['lon'], 2.3522)
+        self.assertAlmostEqual(result[0]['alt'], 35.0)
+
+    def test_parser_stmp_timing(self):
+        # Two payloads of 2 samples each, 1 second apart -> 0.5s per sample
+        scal_block = self.pack_klv('SCAL', 'l', 4, 1, struct.pack('>i', 1))
+        devc = b''
+        for chunk, stmp in enumerate([5_000_000, 6_000_000]):
+            stmp_block = self.pack_klv('STMP', 'J', 8, 1, struct.pack('>Q', stmp))
+            gps_data = struct.pack('>10i', *([chunk * 2, 0, 0, 0, 0] + [chunk * 2 + 1, 0, 0, 0, 0]))
+            gps_block = self.pack_klv('GPS5', 'l', 20, 2, gps_data)
+            strm_payload = stmp_block + scal_block + gps_block
+            strm_block = self.pack_klv('STRM', '\0', 1, len(strm_payload), strm_payload)
+            devc += self.pack_klv('DEVC', '\0', 1, len(strm_block), strm_block)
+
+        result = GPMFParser().parse(devc)
+
+        self.assertEqual([s['lat'] for s in result], [0.0, 1.0, 2.0, 3.0])
+        for sample, expected in zip(result, [0.0, 0.5, 1.0, 1.5]):
+            self.assertAlmostEqual(sample['timestamp'], expected)
+
+    def test_parser_imu_streams(self):
+        # GYRO: 3 int16 axes with a single scale factor, timed from the video duration
+        scal_block = self.pack_klv('SCAL', 's', 2, 1, struct.pack('>h', 100))
+        gyro_data = struct.pack('>12h', *range(12))
+        gyro_block = self.pack_klv('GYRO', 's', 6, 4, gyro_data)
+        strm_payload = scal_block + gyro_block
+        strm_block = self.pack_klv('STRM', '\0', 1, len(strm_payload), strm_payload)
+        devc_block = self.pack_klv('DEVC', '\0', 1, len(strm_block), strm_block)
+
+        track = GPMFParser().parse_track(devc_block, duration=2.0)
+
+        self.assertEqual(len(track), 0)
+        self.assertIn('GYRO', track.imu)
+        times, values = track.imu['GYRO']
+        self.assertEqual(values.shape, (4, 3))
+        self.assertAlmostEqual(values[1, 0], 0.03)
+        self.assertAlmostEqual(times[1], 0.5)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,90 @@
+"""
+Unit tests for the log panel's ring buffer model.
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ui.log_panel import LogModel, LogPanel
+
+
+class TestLogModel(unittest.TestCase):
+
+    def setUp(self):
+        self.model = LogModel(LogPanel.LEVEL_COLORS, max_entries=5)
+        self.removed = []
+        self.inserted = []
+        self.changed = []
+        self.model.rowsRemoved.connect(lambda parent, first, last: self.removed.append((first, last)))
+        self.model.rowsInserted.connect(lambda parent, first, last: self.inserted.append((first, last)))
+        self.model.dataChanged.connect(lambda a, b, roles: self.changed.append((a.row(), b.row())))
+
+    def messages(self):
+        return [(entry.message, entry.count) for entry in self.model.entries]
+
+    def test_consecutive_repeats_collapsed(self):
+        """Test a repeat of the previous row (up to numbers) updates it with a count."""
+        self.model.add_records([(1.0, "INFO", "Frame 1/10"), (2.0, "INFO", "Frame 2/10")])
+        self.model.add_records([(3.0, "INFO", "Frame 3/10")])
+
+        self.assertEqual(self.messages(), [("Frame 3/10", 3)])
+        self.assertEqual(self.model.entries[0].time, 3.0)
+        self.assertEqual(self.changed, [(0, 0)])
+        self.assertIn("(×3)", self.model.data(self.model.index(0)))
+
+    def test_interleaved_messages_keep_order(self):
+        """Test a message only collapses into the row right before it, never an older one."""
+        self.model.add_records([
+            (1.0, "INFO", "Processing video 1/10"),
+            (2.0, "INFO", "Saved 6 views"),
+            (3.0, "INFO", "Processing video 2/10"),
+        ])
+        self.assertEqual(self.messages(), [("Processing video 1/10", 1), ("Saved 6 views", 1),
+                                           ("Processing video 2/10", 1)])
+
+    def test_errors_not_collapsed(self):
+        """Test numbered warnings and errors each keep their own row."""
+        self.model.add_records([(1.0, "ERROR", "Error processing 1"), (2.0, "ERROR", "Error processing 2")])
+        self.assertEqual(self.messages(), [("Error processing 1", 1), ("Error processing 2", 1)])
+
+    def test_overflow_drops_oldest(self):
+        """Test the ring buffer removes the oldest rows past max_entries."""
+        self.model.add_records([(float(i), "INFO", f"message {chr(97 + i)}") for i in range(4)])
+        self.model.add_records([(float(i), "INFO", f"message {chr(97 + i)}") for i in range(4, 7)])
+
+        self.assertEqual([m for m, _ in self.messages()], [f"message {c}" for c in "cdefg"])
+        self.assertEqual(self.removed, [(0, 1)])
+        self.assertEqual(self.inserted, [(0, 3), (2, 4)])
+
+    def test_overflow_larger_than_capacity(self):
+        """Test a batch bigger than the buffer keeps only its newest rows."""
+        self.model.add_records([(0.0, "INFO", "old")])
+        self.model.add_records([(float(i), "WARNING", f"w{chr(97 + i)}") for i in range(8)])
+
+        self.assertEqual([m for m, _ in self.messages()], [f"w{c}" for c in "defgh"])
+        self.assertEqual(self.removed, [(0, 0)])
+
+    def test_changed_row_remapped_after_removal(self):
+        """Test the collapsed row is reported at its index after older rows were removed."""
+        self.model.add_records([(float(i), "INFO", f"message {chr(97 + i)}") for i in range(4)])
+        self.model.add_records([(4.0, "INFO", "Frame 1")])
+        self.changed.clear()
+
+        # Collapses into row 4, then two new rows push out rows 0 and 1
+        self.model.add_records([(5.0, "INFO", "Frame 2"), (6.0, "INFO", "x"), (7.0, "INFO", "y")])
+
+        self.assertEqual(self.removed, [(0, 1)])
+        self.assertEqual(self.changed, [(2, 2)])
+        self.assertEqual(self.messages()[2], ("Frame 2", 2))
+
+    def test_clear(self):
+        """Test clearing empties the model."""
+        self.model.add_records([(1.0, "INFO", "a")])
+        self.model.clear()
+        self.assertEqual(self.model.rowCount(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Unit tests for camera pose prior computation and export.
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.geometry import GeometryProcessor
+from core.pose_priors import (
+    quat_to_matrix, matrix_to_quat, integrate_gyro, rig_to_world,
+    compute_pose_priors, write_colmap, write_realityscan_xmp
+)
+from utils.telemetry_track import TelemetryTrack
+
+FORWARD = np.array([0.0, 0.0, 1.0])
+
+
+def straight_track(heading_deg, seconds=10, imu=None):
+    """Track moving ~10 m/s at a constant heading from (45, 6)."""
+    t = np.arange(seconds + 1, dtype=np.float64)
+    step = 10.0 / 111195.0
+    lat = 45.0 + t * step * np.cos(np.radians(heading_deg))
+    lon = 6.0 + t * step * np.sin(np.radians(heading_deg)) / np.cos(np.radians(45.0))
+    return TelemetryTrack(t, lat, lon, np.zeros_like(t), imu=imu)
+
+
+class TestQuaternions(unittest.TestCase):
+
+    def test_matrix_roundtrip(self):
+        """Test quaternion -> matrix -> quaternion on random rotations, including 180 deg ones."""
+        rng = np.random.default_rng(0)
+        q = rng.normal(size=(200, 4))
+        q = np.concatenate([q, [[0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 0.0, 1.0]]])
+        q /= np.linalg.norm(q, axis=1, keepdims=True)
+        q[q[:, 0] < 0] *= -1
+
+        back = matrix_to_quat(quat_to_matrix(q))
+
+        np.testing.assert_allclose(np.abs(np.sum(back * q, axis=1)), 1.0, atol=1e-9)
+
+    def test_integrate_gyro_constant_rate(self):
+        """Test the prefix-scan integration of a constant rate about one axis."""
+        times = np.linspace(0.0, 1.0, 1001)
+        rates = np.tile([0.0, np.pi / 2, 0.0], (len(times), 1))
+
+        rot = quat_to_matrix(integrate_gyro(times, rates)[-1])
+
+        np.testing.assert_allclose(rot, GeometryProcessor.get_rotation_matrix(90, 0, 0), atol=1e-6)
+
+
+class TestRigOrientation(unittest.TestCase):
+
+    def test_forward_follows_course_without_imu(self):
+        """Test the rig faces the direction of travel when there is no IMU."""
+        for heading, expected in ((0, [0, 1, 0]), (90, [1, 0, 0])):
+            rot = rig_to_world(straight_track(heading), np.array([5.0]))
+            np.testing.assert_allclose(rot[0] @ FORWARD, expected, atol=1e-6)
+
+    def test_gyro_yaw_aligned_to_course(self):
+        """Test a static gyro stream is yaw-aligned to the GPS course and kept level."""
+        gyro_t = np.linspace(0.0, 10.0, 2001)
+        imu = {'GYRO': (gyro_t, np.zeros((len(gyro_t), 3)))}
+
+        rot = rig_to_world(straight_track(90, imu=imu), np.array([2.0, 8.0]))
+
+        np.testing.assert_allclose(rot[:, :, 2], [[1, 0, 0], [1, 0, 0]], atol=1e-6)
+        # Rig down (+Y) is world down
+        np.testing.assert_allclose(rot[:, :, 1], [[0, 0, -1], [0, 0, -1]], atol=1e-6)
+
+    def test_view_rotation_composed(self):
+        """Test a view yawed 90 deg looks right of the direction of travel."""
+        views = {'View_1': GeometryProcessor.get_rotation_matrix(90, 0, 0)}
+
+        _, rotations, centers, origin = compute_pose_priors(straight_track(0), [("a.jpg", 5.0, 'View_1')], views)
+
+        np.testing.assert_allclose(rotations[0] @ FORWARD, [1, 0, 0], atol=1e-6)
+        self.assertAlmostEqual(centers[0][1], 0.0)
+        self.assertAlmostEqual(origin[0], 45.0 + 50.0 / 111195.0)
+
+
+class TestPosePriorWriters(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        views = {'View_0': np.eye(3), 'View_1': GeometryProcessor.get_rotation_matrix(90, 0, 0)}
+        records = [("f0_View_0.jpg", 2.0, 'View_0'), ("f0_View_1.jpg", 2.0, 'View_1'), ("f1_View_0.jpg", 6.0, 'View_0')]
+        self.names, self.rotations, self.centers, self.origin = compute_pose_priors(straight_track(30), records, views)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_colmap_model(self):
+        """Test images.txt poses reproduce the camera centers."""
+        write_colmap(self.tmp.name, self.names, self.rotations, self.centers, self.origin, 1024, 1024, 90)
+
+        with open(os.path.join(self.tmp.name, "colmap", "cameras.txt")) as f:
+            camera = [l for l in f if not l.startswith('#')][0].split()
+        self.assertEqual(camera[:4], ['1', 'PINHOLE', '1024', '1024'])
+        self.assertAlmostEqual(float(camera[4]), 512.0, places=4)
+
+        with open(os.path.join(self.tmp.name, "colmap", "images.txt")) as f:
+            entries = [l.split() for l in f if l.strip() and not l.startswith('#')]
+        self.assertEqual(len(entries), 3)
+        for entry, center in zip(entries, self.centers):
+            q = np.array([float(v) for v in entry[1:5]])
+            t = np.array([float(v) for v in entry[5:8]])
+            r_cw = quat_to_matrix(q)
+            np.testing.assert_allclose(-r_cw.T @ t, center, atol=1e-4)
+            self.assertEqual(entry[9], self.names[entries.index(entry)])
+
+    def test_realityscan_xmp(self):
+        """Test one XMP sidecar per image with rotation and position relative to the recorded origin."""
+        write_realityscan_xmp(self.tmp.name, self.names, self.rotations, self.centers, self.origin, 1024, 90)
+
+        with open(os.path.join(self.tmp.name, "f1_View_0.xmp")) as f:
+            xmp = f.read()
+        self.assertIn("xcr:PosePrior=\"initial\"", xmp)
+        self.assertIn("xcr:Coordinates=\"relative\"", xmp)
+        self.assertNotIn("absolute", xmp)
+        self.assertIn(f"origin lat={self.origin[0]:.8f} lon={self.origin[1]:.8f}", xmp)
+        position = xmp.split("<xcr:Position>")[1].split("<")[0].split()
+        np.testing.assert_allclose([float(v) for v in position], self.centers[2], atol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
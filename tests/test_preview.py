@@ -0,0 +1,261 @@
+"""
+Unit tests for the preview caches and helpers.
+"""
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.contact_sheet import compose_contact_sheet, render_tiles, select_views
+from core.geometry import GeometryProcessor
+from core.keyframe_index import FrameSeeker, KeyframeIndex, KeyframeIndexCache
+from core.preview_cache import PreviewCache
+
+
+def write_test_video(path, frames=5, size=(64, 32)):
+    """Writes a tiny video whose frame i is filled with the gray level i * 40."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 10, size)
+    for i in range(frames):
+        writer.write(np.full((size[1], size[0], 3), i * 40, np.uint8))
+    writer.release()
+
+
+class TestPreviewCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "clip.mp4")
+        write_test_video(self.video)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_frame_decoded_once(self):
+        """Test repeated lookups of the same frame don't reopen the video."""
+        cache = PreviewCache()
+        with mock.patch.object(PreviewCache, 'decode_frame', wraps=PreviewCache.decode_frame) as decode:
+            first = cache.get_frame(self.video)
+            second = cache.get_frame(self.video)
+
+        self.assertEqual(decode.call_count, 1)
+        self.assertIs(first, second)
+        self.assertFalse(first.flags.writeable)
+
+    def test_frame_downscaled(self):
+        """Test source frames are limited to max_width."""
+        frame = PreviewCache().get_frame(self.video, max_width=32)
+        self.assertEqual(frame.shape[:2], (16, 32))
+
+    def test_coarse_frame_derived_from_source(self):
+        """Test lower-resolution frames are resized from the cached source frame, not decoded again."""
+        cache = PreviewCache()
+        with mock.patch.object(PreviewCache, 'decode_frame', wraps=PreviewCache.decode_frame) as decode:
+            full = cache.get_frame(self.video)
+            coarse = cache.get_frame(self.video, max_width=16)
+
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(full.shape[:2], (32, 64))
+        self.assertEqual(coarse.shape[:2], (8, 16))
+
+    def test_coarse_frame_before_source(self):
+        """Test a cold progressive read yields the coarse frame before building the larger one, decoding once."""
+        cache = PreviewCache()
+        with mock.patch.object(PreviewCache, 'decode_frame', wraps=PreviewCache.decode_frame) as decode:
+            frames = cache.iter_frames(self.video, 0, (16, 32))
+            coarse = next(frames)
+            self.assertIsNone(cache.peek_frame(self.video, 0, 32))
+            source = next(frames)
+
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(coarse.shape[:2], (8, 16))
+        self.assertEqual(source.shape[:2], (16, 32))
+        self.assertIs(cache.peek_frame(self.video, 0, 32), source)
+
+    def test_lru_eviction(self):
+        """Test the least recently used frame is evicted first."""
+        cache = PreviewCache(max_frames=2, index_cache=KeyframeIndexCache(self.tmp.name))
+        cache.get_frame(self.video, 0)
+        cache.get_frame(self.video, 1)
+        cache.get_frame(self.video, 0)
+        cache.get_frame(self.video, 2)
+
+        indices = sorted(key[2] for key in cache.frames)
+        self.assertEqual(indices, [0, 2])
+
+    def test_maps_cached_per_geometry(self):
+        """Test maps are reused for identical views and regenerated when the FOV changes."""
+        cache = PreviewCache()
+        with mock.patch.object(GeometryProcessor, 'create_rectilinear_map',
+                               wraps=GeometryProcessor.create_rectilinear_map) as create:
+            a = cache.get_maps(32, 64, 16, 16, 90, 0, 0, 0)
+            b = cache.get_maps(32, 64, 16, 16, 90, 0, 0, 0)
+            cache.get_maps(32, 64, 16, 16, 100, 0, 0, 0)
+
+        self.assertIs(a, b)
+        self.assertEqual(create.call_count, 2)
+
+    def test_invalidate_video(self):
+        """Test invalidating a video drops its frames but keeps the maps."""
+        cache = PreviewCache()
+        cache.get_frame(self.video)
+        cache.get_maps(32, 64, 16, 16, 90, 0, 0, 0)
+
+        cache.invalidate(self.video)
+
+        self.assertEqual(len(cache.frames), 0)
+        self.assertEqual(len(cache.maps), 1)
+
+
+class TestKeyframeIndex(unittest.TestCase):
+
+    # B-frames: packets arrive in decode order, frames are numbered in pts order
+    PACKETS = ["0.000000,K__", "0.100000,___", "0.033333,___", "0.066667,___",
+               "N/A,___", "0.133333,K__", "0.166667,___"]
+
+    def test_from_packets(self):
+        """Test packets are sorted by pts and keyframes numbered in presentation order."""
+        index = KeyframeIndex.from_packets(self.PACKETS)
+
+        self.assertEqual(index.frame_count, 6)
+        self.assertEqual(index.keyframes.tolist(), [0, 4])
+        self.assertAlmostEqual(index.time_of(3), 0.1)
+
+    def test_keyframe_for(self):
+        """Test the nearest keyframe at or before a frame is returned."""
+        index = KeyframeIndex.from_packets(self.PACKETS)
+        self.assertEqual([index.keyframe_for(i) for i in range(6)], [0, 0, 0, 0, 4, 4])
+
+    def test_disk_cache(self):
+        """Test an index is probed once and then served from disk."""
+        with tempfile.TemporaryDirectory() as tmp:
+            video = os.path.join(tmp, "clip.mp4")
+            write_test_video(video)
+            cache = KeyframeIndexCache(os.path.join(tmp, "index"))
+            index = KeyframeIndex.from_packets(self.PACKETS)
+
+            with mock.patch.object(KeyframeIndex, 'probe', return_value=index) as probe:
+                cache.get(video)
+                cached = cache.get(video)
+
+            self.assertEqual(probe.call_count, 1)
+            self.assertEqual(cached.keyframes.tolist(), [0, 4])
+
+    def test_eviction_skips_vanished_entries(self):
+        """Test an index removed by another process during eviction doesn't fail the store."""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = KeyframeIndexCache(os.path.join(tmp, "index"), max_entries=1)
+            index = KeyframeIndex.from_packets(self.PACKETS)
+            first, second = (os.path.join(tmp, name) for name in ("a.mp4", "b.mp4"))
+            for video in (first, second):
+                write_test_video(video)
+            with mock.patch.object(KeyframeIndex, 'probe', return_value=index):
+                cache.get(first)
+            vanished = cache.cache_dir / f"{cache.key_for(first)}.npz"
+            real_stat = Path.stat
+
+            def stat(path, *args, **kwargs):
+                if path == vanished:
+                    raise FileNotFoundError(path)
+                return real_stat(path, *args, **kwargs)
+
+            with mock.patch.object(KeyframeIndex, 'probe', return_value=index), \
+                    mock.patch.object(Path, 'stat', stat):
+                cache.get(second)
+            self.assertTrue((cache.cache_dir / f"{cache.key_for(second)}.npz").exists())
+
+
+class TestFrameSeeker(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, "clip.mp4")
+        write_test_video(self.video)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def seeker(self, keyframes):
+        seeker = FrameSeeker(self.video)
+        seeker.index = KeyframeIndex(np.arange(5) / 10.0, keyframes)
+        seeker._index_loaded = True
+        return seeker
+
+    def test_reads_target_frame(self):
+        """Test random reads (backwards too) return the requested frame."""
+        seeker = self.seeker([0])
+        for i in (3, 1, 4, 0):
+            self.assertAlmostEqual(seeker.read(i).mean(), i * 40, delta=8)
+        self.assertIsNone(seeker.read(5))
+        seeker.release()
+
+    def test_forward_read_within_gop_does_not_seek(self):
+        """Test reading ahead of the current position decodes forward instead of seeking."""
+        seeker = self.seeker([0, 3])
+        seeker.read(0)
+        cap = seeker.cap
+        seeker.cap = mock.Mock(wraps=cap)
+
+        self.assertAlmostEqual(seeker.read(1).mean(), 40, delta=8)
+        seeker.cap.set.assert_not_called()
+
+        # Past the next keyframe: jump to it
+        self.assertAlmostEqual(seeker.read(4).mean(), 160, delta=8)
+        seeker.cap.set.assert_called_once_with(cv2.CAP_PROP_POS_FRAMES, 3)
+        cap.release()
+
+
+class TestContactSheet(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = np.random.default_rng(0).integers(0, 255, (64, 128, 3), dtype=np.uint8)
+        self.views = GeometryProcessor.generate_views(6)
+
+    def test_select_views(self):
+        """Test active_cameras filters views by index and None keeps all."""
+        self.assertEqual(len(select_views(self.views, None)), 6)
+        self.assertEqual([v[0] for v in select_views(self.views, [0, 4])], ['View_0', 'View_4'])
+
+    def test_tiles_in_view_order(self):
+        """Test one tile per view, in order, each with a blur score."""
+        tiles = render_tiles(PreviewCache(), self.frame, 'frame', self.views, 90, tile_size=32, workers=3)
+
+        self.assertEqual([name for name, _, _ in tiles], [v[0] for v in self.views])
+        self.assertTrue(all(tile.shape == (32, 32, 3) for _, tile, _ in tiles))
+        self.assertTrue(all(score > 0 for _, _, score in tiles))
+
+    def test_toggling_views_reuses_tiles(self):
+        """Test re-rendering a subset of views doesn't remap again."""
+        cache = PreviewCache()
+        render_tiles(cache, self.frame, 'frame', self.views, 90, tile_size=32)
+
+        with mock.patch('core.contact_sheet.cv2.remap') as remap:
+            tiles = render_tiles(cache, self.frame, 'frame', select_views(self.views, [1, 3]), 90, tile_size=32)
+
+        remap.assert_not_called()
+        self.assertEqual([name for name, _, _ in tiles], ['View_1', 'View_3'])
+
+    def test_cancelled(self):
+        """Test a cancelled render returns None."""
+        tiles = render_tiles(PreviewCache(), self.frame, 'frame', self.views, 90, tile_size=32,
+                             is_cancelled=lambda: True)
+        self.assertIsNone(tiles)
+
+    def test_compose_grid(self):
+        """Test tiles are laid out on a near-square grid."""
+        tiles = render_tiles(PreviewCache(), self.frame, 'frame', self.views, 90, tile_size=32)
+
+        sheet = compose_contact_sheet(tiles, padding=2)
+
+        # 6 tiles -> 3 columns x 2 rows
+        self.assertEqual(sheet.shape, (2 * 34 + 2, 3 * 34 + 2, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()